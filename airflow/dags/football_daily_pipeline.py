@@ -4,8 +4,9 @@ import json
 import os
 
 from airflow import DAG
+from airflow.decorators import task_group
 from airflow.operators.bash import BashOperator
-from airflow.operators.python import PythonOperator
+from airflow.operators.python import PythonOperator, ShortCircuitOperator
 from airflow.utils.trigger_rule import TriggerRule
 
 import snowflake.connector
@@ -18,21 +19,166 @@ DEFAULT_ARGS = {
 
 local_tz = pendulum.timezone("Asia/Kathmandu")
 
+# Airflow pools (created by airflow-init in infra/docker-compose.yml): concurrent per-competition
+# ingest tasks share the football-data.org quota, loaders share Snowflake sessions
+API_POOL = "football_data_api"
+LOADER_POOL = "snowflake_loader"
+
+INGEST_TASK_ID = "competition.ingest_matches_incremental_to_minio"
+LOAD_TASK_ID = "competition.load_incremental_minio_to_snowflake"
+
+DBT_CD = "export DBT_PROFILES_DIR=/opt/airflow/repo/dbt && cd /opt/airflow/repo/dbt/football_dbt"
+
+# Selective dbt run: only models downstream of sources that got fresher data (source_status:fresher+) or whose
+# code changed (state:modified+) since the last successful run, whose artifacts are kept in state/.
+# Without saved state (first run, or source freshness failed) every model runs.
+DBT_RUN_SELECTIVE = DBT_CD + """
+set -e
+rm -f target/sources.json target/run_results.json
+mkdir -p state run_state
+rm -f run_state/run_results.json
+dbt source freshness || echo "dbt source freshness failed; running every model"
+rc=0
+if [ -f state/manifest.json ] && [ -f state/sources.json ] && [ -f target/sources.json ]; then
+  dbt run --select "source_status:fresher+ state:modified+" --state state || rc=$?
+else
+  dbt run || rc=$?
+fi
+# This run's artifacts, failed or not: profile_dbt_run reads them, dbt_test selects result:success from them
+cp target/manifest.json target/run_results.json run_state/ 2>/dev/null || true
+[ "$rc" -eq 0 ] || exit "$rc"
+# Saved only after a successful run, so a failed run's models are picked up again next time
+cp target/manifest.json state/
+if [ -f target/sources.json ]; then cp target/sources.json state/; fi
+"""
+
+# Tests only for the models this run built
+DBT_TEST_BUILT = DBT_CD + ' && dbt test --select "result:success" --state run_state'
+
+
+def _stage_value(metrics: dict, stages: tuple, field: str):
+    """
+    Sum one field of the "stage_metrics" block printed by an ingestion entrypoint (None if absent).
+    Stage seconds are summed over calls (and threads), so they can exceed the task's wall time.
+    """
+    recorded = (metrics.get("stage_metrics") or {}).get("stages") or {}
+    values = [recorded[s][field] for s in stages if s in recorded]
+    return sum(values) if values else None
+
+
+def target_competitions() -> list[str]:
+    """
+    TARGET_COMPETITION_CODES (from ../.env via docker-compose env_file), one mapped ingest + load per code.
+    """
+    codes = [c.strip() for c in os.environ.get("TARGET_COMPETITION_CODES", "").split(",") if c.strip()]
+    if not codes:
+        raise RuntimeError("Missing TARGET_COMPETITION_CODES (e.g., TARGET_COMPETITION_CODES=PL,SA)")
+    return codes
+
+
+def _pull_json_lines(ti, task_id: str) -> list[dict]:
+    """
+    Final JSON lines pushed by a (mapped) BashOperator; failed map indexes push nothing and are left out.
+    """
+    raw = ti.xcom_pull(task_ids=task_id)
+    if raw is None:
+        return []
+    values = [raw] if isinstance(raw, str) else list(raw)
+    lines = []
+    for value in values:
+        try:
+            lines.append(json.loads(value))
+        except (TypeError, ValueError):
+            continue
+    return lines
+
+
+def _merge_stage_metrics(blocks: list[dict]) -> dict:
+    stages: dict = {}
+    api: dict = {}
+    for block in blocks:
+        for stage, values in (block.get("stages") or {}).items():
+            merged = stages.setdefault(stage, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0})
+            merged["calls"] += values.get("calls", 0)
+            merged["seconds"] = round(merged["seconds"] + values.get("seconds", 0.0), 3)
+            merged["max_seconds"] = max(merged["max_seconds"], values.get("max_seconds", 0.0))
+            merged["bytes"] += values.get("bytes", 0)
+        for name, value in (block.get("api") or {}).items():
+            api[name] = round(api.get(name, 0) + value, 3)
+    return {"stages": stages, "api": api}
+
+
+def merge_task_metrics(lines: list[dict]) -> dict:
+    """
+    One metrics dict for all competitions: counts summed, stage_metrics merged stage by stage,
+    skip_rate recomputed from the totals.
+    """
+    merged: dict = {}
+    for line in lines:
+        for name, value in line.items():
+            if name in ("stage_metrics", "competition", "competitions") or isinstance(value, bool):
+                continue
+            if isinstance(value, (int, float)):
+                merged[name] = merged.get(name, 0) + value
+            else:
+                merged.setdefault(name, value)
+
+    if merged.get("windows_fetched"):
+        merged["skip_rate"] = round(merged.get("windows_unchanged", 0) / merged["windows_fetched"], 4)
+    blocks = [line["stage_metrics"] for line in lines if line.get("stage_metrics")]
+    if blocks:
+        merged["stage_metrics"] = _merge_stage_metrics(blocks)
+    return merged
+
+
+def has_new_data(**context) -> bool:
+    """
+    Gate for dbt: False (skip dbt_run / profile_dbt_run / dbt_test) only when at least one loader reported
+    and every report has data_files_loaded == 0. Competitions whose load failed push nothing, so no report
+    at all (every load failed, or XCom was lost) runs dbt rather than silently skipping it, and so does a
+    loader without a parseable count.
+    """
+    lines = _pull_json_lines(context["ti"], LOAD_TASK_ID)
+    if not lines or any("data_files_loaded" not in line for line in lines):
+        return True
+    return sum(line["data_files_loaded"] for line in lines) > 0
+
 
 def write_metrics_to_snowflake(**context):
     """
     Writes one row per DAG run into FOOTBALL_DB.OPS.PIPELINE_RUN_METRICS.
 
-    Expects the loader task (load_incremental_minio_to_snowflake) to print a final JSON line like:
-    {"prefix": "...", "files_discovered": ..., "files_to_load": ..., "data_files_loaded": ..., "manifests_loaded": ...}
+    Expects each mapped loader task (competition.load_incremental_minio_to_snowflake) to print a final JSON line like:
+    {"prefix": "...", "competition": "PL", "files_discovered": ..., "files_to_load": ..., "data_files_loaded": ..., ...}
     and have do_xcom_push=True so Airflow captures it.
+
+    Each mapped ingest task (competition.ingest_matches_incremental_to_minio) prints a similar line with
+    change-detection counts: {"windows_fetched": ..., "windows_written": ..., "windows_unchanged": ..., "skip_rate": ...}
+
+    Counts are summed over competitions (merge_task_metrics); COMPETITIONS_FAILED lists the codes whose
+    load did not succeed.
+
+    Both lines also carry "stage_metrics" (ingestion/src/metrics.py): per-stage call counts, seconds and
+    bytes, plus API retries and 429 sleep time. The headline numbers get their own columns; the full
+    blocks are kept as VARIANT.
+
+    Per-model dbt timings live in FOOTBALL_DB.OPS.DBT_MODEL_RUN_METRICS (profile_dbt_run task);
+    DBT_INVOCATION_ID joins the two.
     """
     dag_run = context["dag_run"]
     ti = context["ti"]
 
-    # Loader metrics from XCom (last stdout line)
-    loader_metrics_raw = ti.xcom_pull(task_ids="load_incremental_minio_to_snowflake")
-    loader_metrics = json.loads(loader_metrics_raw) if loader_metrics_raw else {}
+    # Loader / ingest metrics from XCom (last stdout line of every mapped task)
+    loader_lines = _pull_json_lines(ti, LOAD_TASK_ID)
+    loader_metrics = merge_task_metrics(loader_lines)
+    ingest_metrics = merge_task_metrics(_pull_json_lines(ti, INGEST_TASK_ID))
+
+    targets = ti.xcom_pull(task_ids="list_target_competitions") or []
+    loaded = {line.get("competition") for line in loader_lines}
+    competitions_failed = [code for code in targets if code not in loaded]
+
+    profile_raw = ti.xcom_pull(task_ids="profile_dbt_run")
+    dbt_invocation_id = json.loads(profile_raw).get("invocation_id") if profile_raw else None
 
     # Durations + state from Airflow task instances
     dbt_run_ti = dag_run.get_task_instance("dbt_run")
@@ -75,15 +221,70 @@ def write_metrics_to_snowflake(**context):
             )
             """
         )
+        # Columns added after the table was first created
+        cur.execute(
+            """
+            ALTER TABLE FOOTBALL_DB.OPS.PIPELINE_RUN_METRICS ADD COLUMN IF NOT EXISTS
+              INGEST_WINDOWS_FETCHED NUMBER,
+              INGEST_WINDOWS_UNCHANGED NUMBER,
+              INGEST_SKIP_RATE FLOAT
+            """
+        )
+        cur.execute(
+            """
+            ALTER TABLE FOOTBALL_DB.OPS.PIPELINE_RUN_METRICS ADD COLUMN IF NOT EXISTS
+              INGEST_API_REQUESTS NUMBER,
+              INGEST_API_RETRIES NUMBER,
+              INGEST_API_RATE_LIMIT_SLEEP_SEC FLOAT,
+              INGEST_API_SEC FLOAT,
+              INGEST_MINIO_PUT_SEC FLOAT,
+              INGEST_MINIO_BYTES_WRITTEN NUMBER,
+              LOADER_MINIO_GET_SEC FLOAT,
+              LOADER_MINIO_BYTES_READ NUMBER,
+              LOADER_SNOWFLAKE_WRITE_SEC FLOAT,
+              LOADER_SNOWFLAKE_BYTES_WRITTEN NUMBER,
+              INGEST_STAGE_METRICS VARIANT,
+              LOADER_STAGE_METRICS VARIANT
+            """
+        )
+        cur.execute(
+            """
+            ALTER TABLE FOOTBALL_DB.OPS.PIPELINE_RUN_METRICS ADD COLUMN IF NOT EXISTS
+              DBT_INVOCATION_ID STRING
+            """
+        )
+        cur.execute(
+            """
+            ALTER TABLE FOOTBALL_DB.OPS.PIPELINE_RUN_METRICS ADD COLUMN IF NOT EXISTS
+              COMPETITIONS NUMBER,
+              COMPETITIONS_FAILED VARIANT
+            """
+        )
+
+        ingest_api = (ingest_metrics.get("stage_metrics") or {}).get("api") or {}
+        loader_stage_metrics = loader_metrics.get("stage_metrics")
+        ingest_stage_metrics = ingest_metrics.get("stage_metrics")
 
         cur.execute(
             """
             INSERT INTO FOOTBALL_DB.OPS.PIPELINE_RUN_METRICS (
               DAG_ID, RUN_ID, EXECUTION_DATE,
               LOADER_PREFIX, FILES_DISCOVERED, FILES_TO_LOAD, DATA_FILES_LOADED, MANIFESTS_LOADED,
-              DBT_RUN_DURATION_SEC, DBT_TEST_DURATION_SEC, DBT_TEST_STATE
+              DBT_RUN_DURATION_SEC, DBT_TEST_DURATION_SEC, DBT_TEST_STATE,
+              INGEST_WINDOWS_FETCHED, INGEST_WINDOWS_UNCHANGED, INGEST_SKIP_RATE,
+              INGEST_API_REQUESTS, INGEST_API_RETRIES, INGEST_API_RATE_LIMIT_SLEEP_SEC, INGEST_API_SEC,
+              INGEST_MINIO_PUT_SEC, INGEST_MINIO_BYTES_WRITTEN,
+              LOADER_MINIO_GET_SEC, LOADER_MINIO_BYTES_READ,
+              LOADER_SNOWFLAKE_WRITE_SEC, LOADER_SNOWFLAKE_BYTES_WRITTEN,
+              INGEST_STAGE_METRICS, LOADER_STAGE_METRICS,
+              DBT_INVOCATION_ID,
+              COMPETITIONS, COMPETITIONS_FAILED
             )
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            SELECT %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,
+                   %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,
+                   PARSE_JSON(%s), PARSE_JSON(%s),
+                   %s,
+                   %s, PARSE_JSON(%s)
             """,
             (
                 dag_run.dag_id,
@@ -97,6 +298,24 @@ def write_metrics_to_snowflake(**context):
                 dbt_run_duration_sec,
                 dbt_test_duration_sec,
                 dbt_test_state,
+                ingest_metrics.get("windows_fetched"),
+                ingest_metrics.get("windows_unchanged"),
+                ingest_metrics.get("skip_rate"),
+                ingest_api.get("requests"),
+                ingest_api.get("retries"),
+                ingest_api.get("rate_limit_sleep_seconds"),
+                _stage_value(ingest_metrics, ("api_get_json",), "seconds"),
+                _stage_value(ingest_metrics, ("minio_put",), "seconds"),
+                _stage_value(ingest_metrics, ("minio_put",), "bytes"),
+                _stage_value(loader_metrics, ("minio_get", "minio_stream"), "seconds"),
+                _stage_value(loader_metrics, ("minio_get", "minio_stream"), "bytes"),
+                _stage_value(loader_metrics, ("snowflake_upsert_batch", "snowflake_copy"), "seconds"),
+                _stage_value(loader_metrics, ("snowflake_write", "snowflake_copy"), "bytes"),
+                json.dumps(ingest_stage_metrics) if ingest_stage_metrics else None,
+                json.dumps(loader_stage_metrics) if loader_stage_metrics else None,
+                dbt_invocation_id,
+                len(targets),
+                json.dumps(competitions_failed),
             ),
         )
         conn.commit()
@@ -113,33 +332,77 @@ with DAG(
     tags=["football", "minio", "snowflake", "dbt"],
 ) as dag:
 
-    ingest_incremental = BashOperator(
-        task_id="ingest_matches_incremental_to_minio",
-        bash_command="cd /opt/airflow/repo && python -m ingestion.src.ingest_matches_incremental",
+    list_competitions = PythonOperator(
+        task_id="list_target_competitions",
+        python_callable=target_competitions,
     )
 
-    load_incremental = BashOperator(
-        task_id="load_incremental_minio_to_snowflake",
-        bash_command="cd /opt/airflow/repo && python -m ingestion.src.load_incremental_matches_to_snowflake",
-        do_xcom_push=True,  # captures final JSON print from loader
+    # One ingest -> load chain per competition. Each map index retries on its own, and a load only waits
+    # for its own competition's ingest, so a 429 or a bad payload in one league never blocks the others.
+    @task_group(group_id="competition")
+    def ingest_and_load(code):
+        ingest_incremental = BashOperator(
+            task_id="ingest_matches_incremental_to_minio",
+            bash_command=(
+                "cd /opt/airflow/repo && "
+                'python -m ingestion.src.ingest_matches_incremental --competition "$COMPETITION_CODE"'
+            ),
+            env={"COMPETITION_CODE": code},
+            append_env=True,
+            do_xcom_push=True,  # captures final JSON print (change-detection counts)
+            pool=API_POOL,
+            retries=3,
+            retry_exponential_backoff=True,  # backs off past a quota reset
+            map_index_template="{{ task.env['COMPETITION_CODE'] }}",
+        )
+
+        load_incremental = BashOperator(
+            task_id="load_incremental_minio_to_snowflake",
+            bash_command=(
+                "cd /opt/airflow/repo && "
+                'python -m ingestion.src.load_incremental_matches_to_snowflake --competition "$COMPETITION_CODE"'
+            ),
+            env={"COMPETITION_CODE": code},
+            append_env=True,
+            do_xcom_push=True,  # captures final JSON print from loader
+            pool=LOADER_POOL,
+            map_index_template="{{ task.env['COMPETITION_CODE'] }}",
+        )
+
+        ingest_incremental >> load_incremental
+
+    per_competition = ingest_and_load.expand(code=list_competitions.output)
+
+    # Quiet days (nothing new in bronze) skip dbt entirely; write_metrics still records the run.
+    # Runs once every competition is done, so the leagues that did load still get their dbt run.
+    check_new_data = ShortCircuitOperator(
+        task_id="skip_dbt_if_no_new_data",
+        python_callable=has_new_data,
+        ignore_downstream_trigger_rules=False,
+        trigger_rule=TriggerRule.ALL_DONE,
     )
 
     dbt_run = BashOperator(
         task_id="dbt_run",
+        bash_command=DBT_RUN_SELECTIVE,
+    )
+
+    # Per-model time / rows / bytes scanned from dbt_run's copy of run_results.json (run_state/), so it is
+    # unaffected by dbt test overwriting target/. A side branch: a profiling failure never blocks dbt_test.
+    profile_dbt_run = BashOperator(
+        task_id="profile_dbt_run",
         bash_command=(
-            "export DBT_PROFILES_DIR=/opt/airflow/repo/dbt && "
-            "cd /opt/airflow/repo/dbt/football_dbt && "
-            "dbt run"
+            "cd /opt/airflow/repo && python -m ingestion.src.dbt_run_profile "
+            "--run-results dbt/football_dbt/run_state/run_results.json "
+            "--dag-id {{ dag.dag_id }} --run-id '{{ run_id }}'"
         ),
+        do_xcom_push=True,  # captures final JSON print (invocation_id, slowest models)
+        trigger_rule=TriggerRule.NONE_SKIPPED,  # failed model runs are profiled too, skipped ones are not
     )
 
     dbt_test = BashOperator(
         task_id="dbt_test",
-        bash_command=(
-            "export DBT_PROFILES_DIR=/opt/airflow/repo/dbt && "
-            "cd /opt/airflow/repo/dbt/football_dbt && "
-            "dbt test"
-        ),
+        bash_command=DBT_TEST_BUILT,
     )
 
     write_metrics = PythonOperator(
@@ -148,4 +411,5 @@ with DAG(
         trigger_rule=TriggerRule.ALL_DONE,  # write metrics even if dbt fails
     )
 
-    ingest_incremental >> load_incremental >> dbt_run >> dbt_test >> write_metrics
\ No newline at end of file
+    list_competitions >> per_competition >> check_new_data >> dbt_run >> dbt_test >> write_metrics
+    dbt_run >> profile_dbt_run >> write_metrics
\ No newline at end of file
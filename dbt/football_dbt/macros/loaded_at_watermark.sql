@@ -0,0 +1,9 @@
+{% macro loaded_at_watermark(column='loaded_at') -%}
+  {#
+    Lower bound for an incremental loaded_at filter: this table's max(<column>) minus
+    var('loaded_at_lookback_hours'). LOADED_AT is stamped when a loader's batch transaction starts, so a
+    batch that commits after a dbt run can carry loaded_at values below that run's max; the overlap picks
+    those rows up again. Models using it must be idempotent over the re-read slice.
+  #}
+  (select dateadd(hour, -{{ var('loaded_at_lookback_hours') }}, coalesce(max({{ column }}), '1970-01-01'::timestamp_tz)) from {{ this }})
+{%- endmacro %}
@@ -0,0 +1,95 @@
+{% macro team_form(window) -%}
+  {#
+    Last-<window> finished-match form per (competition_code, team_id), built from matches_latest.
+    Incremental runs recompute only teams with a match loaded after this table's source_loaded_at
+    watermark; the model merges their rows on (competition_code, team_id).
+  #}
+with sides as (
+
+  select
+    competition_code,
+    utc_date,
+    status,
+    loaded_at,
+    home_team_id as team_id,
+    home_team_name as team_name,
+    ft_home_goals as gf,
+    ft_away_goals as ga,
+    case
+      when winner = 'HOME_TEAM' then 'W'
+      when winner = 'DRAW' then 'D'
+      when winner = 'AWAY_TEAM' then 'L'
+      else null
+    end as result
+  from {{ ref('matches_latest') }}
+  where home_team_id is not null
+
+  union all
+
+  select
+    competition_code,
+    utc_date,
+    status,
+    loaded_at,
+    away_team_id as team_id,
+    away_team_name as team_name,
+    ft_away_goals as gf,
+    ft_home_goals as ga,
+    case
+      when winner = 'AWAY_TEAM' then 'W'
+      when winner = 'DRAW' then 'D'
+      when winner = 'HOME_TEAM' then 'L'
+      else null
+    end as result
+  from {{ ref('matches_latest') }}
+  where away_team_id is not null
+),
+
+{% if is_incremental() %}
+changed_teams as (
+  select distinct competition_code, team_id
+  from sides
+  where loaded_at > {{ loaded_at_watermark('source_loaded_at') }}
+),
+{% endif %}
+
+ranked as (
+  select
+    *,
+    -- Watermark over all of the team's matches, so an unfinished fixture does not re-trigger it every run
+    max(loaded_at) over (partition by competition_code, team_id) as team_loaded_at,
+    row_number() over (
+      partition by competition_code, team_id, iff(status = 'FINISHED', 0, 1)
+      order by utc_date desc
+    ) as rn
+  from sides
+  {% if is_incremental() %}
+  where (competition_code, team_id) in (select competition_code, team_id from changed_teams)
+  {% endif %}
+),
+
+last_n as (
+  select * from ranked where status = 'FINISHED' and rn <= {{ window }}
+)
+
+select
+  competition_code,
+  team_id,
+  max(team_name) as team_name,
+
+  count(*) as games_played_last{{ window }},
+  sum(iff(result = 'W', 1, 0)) as wins_last{{ window }},
+  sum(iff(result = 'D', 1, 0)) as draws_last{{ window }},
+  sum(iff(result = 'L', 1, 0)) as losses_last{{ window }},
+
+  sum(gf) as goals_for_last{{ window }},
+  sum(ga) as goals_against_last{{ window }},
+  sum(gf) - sum(ga) as goal_diff_last{{ window }},
+
+  sum(case when result = 'W' then 3 when result = 'D' then 1 else 0 end) as points_last{{ window }},
+  max(utc_date) as last_match_utc,
+  max(team_loaded_at) as source_loaded_at
+
+from last_n
+group by competition_code, team_id
+{%- endmacro %}
@@ -1,11 +1,40 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    unique_key=['competition_code', 'season_id'],
+    incremental_strategy='delete+insert'
+) }}
 
-with finished as (
+-- Incremental runs only re-aggregate (competition_code, season_id) partitions with a match loaded or
+-- updated after the watermarks stored in this table; delete+insert on the partition key swaps in their
+-- re-ranked standings and leaves every other season untouched.
+-- Matches without a competition_code or season_id get no standings: NULL never matches the partition IN
+-- list or the delete+insert key, so such rows could only go stale or duplicate.
+with scoped as (
+  select
+    *,
+    max(loaded_at) over (partition by competition_code, season_id) as partition_loaded_at,
+    max(last_updated) over (partition by competition_code, season_id) as partition_last_updated
+  from {{ ref('matches_latest') }}
+  where competition_code is not null
+    and season_id is not null
+  {% if is_incremental() %}
+  and (competition_code, season_id) in (
+    select competition_code, season_id
+    from {{ ref('matches_latest') }}
+    where loaded_at > {{ loaded_at_watermark('source_loaded_at') }}
+       or last_updated > (select coalesce(max(source_last_updated), '1970-01-01'::timestamp_tz) from {{ this }})
+  )
+  {% endif %}
+),
+
+finished as (
 
   select
     competition_code,
     season_id,
     utc_date,
+    partition_loaded_at,
+    partition_last_updated,
 
     home_team_id as team_id,
     home_team_name as team_name,
@@ -20,7 +49,7 @@ with finished as (
     case when winner = 'HOME_TEAM' then 1 else 0 end as w,
     case when winner = 'DRAW' then 1 else 0 end as d,
     case when winner = 'AWAY_TEAM' then 1 else 0 end as l
-  from {{ ref('matches_latest') }}
+  from scoped
   where status = 'FINISHED' and home_team_id is not null
 
   union all
@@ -29,6 +58,8 @@ with finished as (
     competition_code,
     season_id,
     utc_date,
+    partition_loaded_at,
+    partition_last_updated,
 
     away_team_id as team_id,
     away_team_name as team_name,
@@ -43,7 +74,7 @@ with finished as (
     case when winner = 'AWAY_TEAM' then 1 else 0 end as w,
     case when winner = 'DRAW' then 1 else 0 end as d,
     case when winner = 'HOME_TEAM' then 1 else 0 end as l
-  from {{ ref('matches_latest') }}
+  from scoped
   where status = 'FINISHED' and away_team_id is not null
 ),
 
@@ -61,7 +92,10 @@ agg as (
     sum(ga) as goals_against,
     sum(gf) - sum(ga) as goal_diff,
     sum(pts) as points,
-    max(utc_date) as as_of_utc
+    max(utc_date) as as_of_utc,
+    -- Watermarks over every match of the partition (not just finished ones)
+    max(partition_loaded_at) as source_loaded_at,
+    max(partition_last_updated) as source_last_updated
   from finished
   group by competition_code, season_id, team_id
 ),
@@ -76,4 +110,4 @@ ranked as (
   from agg
 )
 
-select * from ranked
\ No newline at end of file
+select * from ranked
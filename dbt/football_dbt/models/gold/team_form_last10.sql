@@ -0,0 +1,7 @@
+{{ config(
+    materialized='incremental',
+    unique_key=['competition_code', 'team_id'],
+    incremental_strategy='merge'
+) }}
+
+{{ team_form(10) }}
@@ -0,0 +1,15 @@
+{{ config(
+    materialized='incremental',
+    unique_key=['file_key', 'match_id'],
+    incremental_strategy='delete+insert',
+    cluster_by=['competition_code', 'season_id', 'to_date(utc_date)']
+) }}
+
+-- Append-mostly: each run flattens the RAW_MATCHES rows loaded since the last one, plus a
+-- loaded_at_lookback_hours overlap for batches that committed late. Re-flattened and re-loaded files
+-- replace their own rows via (file_key, match_id).
+{% if is_incremental() %}
+{{ flatten_raw_matches(loaded_after=loaded_at_watermark()) }}
+{% else %}
+{{ flatten_raw_matches() }}
+{% endif %}
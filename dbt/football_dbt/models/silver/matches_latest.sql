@@ -4,9 +4,19 @@
     incremental_strategy='merge'
 ) }}
 
-with latest_rows as (
+with candidate_rows as (
   select *
-  from {{ ref('v_matches') }}
+  from {{ ref('matches_flattened') }}
+  {% if is_incremental() %}
+  -- Rows loaded after the last merge, minus the lookback overlap. The slice is a loaded_at suffix, so it
+  -- holds every version at least as new as anything merged for its matches; ranking it is enough
+  where loaded_at > {{ loaded_at_watermark() }}
+  {% endif %}
+),
+
+latest_rows as (
+  select *
+  from candidate_rows
   qualify row_number() over (
     partition by match_id
     order by loaded_at desc, last_updated desc
@@ -4,55 +4,97 @@
     incremental_strategy='merge'
 ) }}
 
-with base as (
-  select
-    competition_code,
-    season_id,
-    utc_date,
-
-    home_team_id as team_id,
-    home_team_name as name,
-    home_team_short_name as short_name,
-    home_team_tla as tla,
-    home_team_crest as crest
+with
+{% if is_incremental() %}
+changed_teams as (
+  -- Teams with a match loaded after the newest match load any team row came from (minus the lookback
+  -- overlap). Only their rows are rebuilt; every other team is left as it is.
+  select home_team_id as team_id
   from {{ ref('matches_latest') }}
-  where home_team_id is not null
-
-  union all
+  where loaded_at > {{ loaded_at_watermark('source_loaded_at') }}
+  union
+  select away_team_id as team_id
+  from {{ ref('matches_latest') }}
+  where loaded_at > {{ loaded_at_watermark('source_loaded_at') }}
+),
+{% endif %}
 
+appearances as (
+  -- One pass over matches_latest (a changed team's matches on incremental runs): every match unpivots
+  -- into its home and away appearance
   select
-    competition_code,
-    season_id,
-    utc_date,
+    m.competition_code,
+    m.season_id,
+    m.utc_date,
+    m.loaded_at,
 
-    away_team_id as team_id,
-    away_team_name as name,
-    away_team_short_name as short_name,
-    away_team_tla as tla,
-    away_team_crest as crest
-  from {{ ref('matches_latest') }}
-  where away_team_id is not null
+    iff(s.side = 'home', m.home_team_id, m.away_team_id) as team_id,
+    iff(s.side = 'home', m.home_team_name, m.away_team_name) as name,
+    iff(s.side = 'home', m.home_team_short_name, m.away_team_short_name) as short_name,
+    iff(s.side = 'home', m.home_team_tla, m.away_team_tla) as tla,
+    iff(s.side = 'home', m.home_team_crest, m.away_team_crest) as crest
+  from {{ ref('matches_latest') }} m
+  cross join (select 'home' as side union all select 'away' as side) s
+  {% if is_incremental() %}
+  where m.home_team_id in (select team_id from changed_teams)
+     or m.away_team_id in (select team_id from changed_teams)
+  {% endif %}
 ),
 
-ranked as (
+latest as (
   select
     *,
-    row_number() over (
-      partition by team_id
-      order by utc_date desc
-    ) as rn
-  from base
+    max(loaded_at) over (partition by team_id) as source_loaded_at
+  from appearances
+  where team_id is not null
+  {% if is_incremental() %}
+  -- All of a changed team's matches, not just the new ones: a fixture moved earlier, or an older match
+  -- re-loaded late, then resolves exactly as in a full build
+  and team_id in (select team_id from changed_teams)
+  {% endif %}
+  qualify row_number() over (
+    partition by team_id
+    order by utc_date desc
+  ) = 1
 )
 
 select
-  team_id,
-  name,
-  short_name,
-  tla,
-  crest,
-  competition_code,
-  season_id,
-  utc_date as last_seen_utc_date,
-  current_timestamp() as updated_at
-from ranked
-where rn = 1
\ No newline at end of file
+  l.team_id,
+  l.name,
+  l.short_name,
+  l.tla,
+  l.crest,
+  l.competition_code,
+  l.season_id,
+  l.utc_date as last_seen_utc_date,
+  {% if is_incremental() %}
+  -- updated_at only moves when the team's attributes change
+  case
+    when t.team_id is null
+      or l.name is distinct from t.name
+      or l.short_name is distinct from t.short_name
+      or l.tla is distinct from t.tla
+      or l.crest is distinct from t.crest
+    then current_timestamp()
+    else t.updated_at
+  end as updated_at,
+  {% else %}
+  current_timestamp() as updated_at,
+  {% endif %}
+  l.source_loaded_at
+from latest l
+{% if is_incremental() %}
+left join {{ this }} t
+  on t.team_id = l.team_id
+-- Merge only new teams and rows that would change. source_loaded_at is compared too, so the watermark
+-- keeps moving for teams whose attributes did not change (updated_at still does not move for them).
+where t.team_id is null
+   or l.name is distinct from t.name
+   or l.short_name is distinct from t.short_name
+   or l.tla is distinct from t.tla
+   or l.crest is distinct from t.crest
+   or l.competition_code is distinct from t.competition_code
+   or l.season_id is distinct from t.season_id
+   or l.utc_date is distinct from t.last_seen_utc_date
+   or l.source_loaded_at is distinct from t.source_loaded_at
+{% endif %}
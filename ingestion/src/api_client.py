@@ -1,49 +1,76 @@
 import time
 import random
+import threading
 import requests
 
-from .config import FOOTBALL_DATA_API_TOKEN
+from .config import FOOTBALL_DATA_API_TOKEN, FOOTBALL_DATA_BASE_URL
 from .logger import get_logger
+from .metrics import METRICS
+from .rate_limiter import get_rate_limiter
 
-BASE_URL = "https://api.football-data.org/v4"
+BASE_URL = FOOTBALL_DATA_BASE_URL
 
 logger = get_logger("api_client")
 
+_local = threading.local()
+
+def _get_session() -> requests.Session:
+    """
+    One keep-alive Session per thread, so repeated calls reuse the TCP+TLS connection.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _local.session = session
+    return session
+
 def get_json(path: str, params: dict | None = None, timeout: int = 30, max_retries: int = 5):
     """
     GET a JSON response from football-data.org with:
+    - proactive, process-wide rate limiting (token bucket synced with quota headers)
     - retries on transient errors
     - backoff on 429 and 5xx
     """
     url = f"{BASE_URL}{path}"
     headers = {"X-Auth-Token": FOOTBALL_DATA_API_TOKEN}
+    limiter = get_rate_limiter()
 
-    for attempt in range(1, max_retries + 1):
-        try:
-            resp = requests.get(url, headers=headers, params=params, timeout=timeout)
+    with METRICS.timer("api_get_json"):
+        for attempt in range(1, max_retries + 1):
+            try:
+                METRICS.inc("api_limiter_wait_seconds", limiter.acquire())
+                resp = _get_session().get(url, headers=headers, params=params, timeout=timeout)
+                limiter.update_from_headers(resp.headers)
+                METRICS.inc("api_requests", status=resp.status_code)
 
-            # Handle rate limiting
-            if resp.status_code == 429:
-                retry_after = resp.headers.get("Retry-After")
-                sleep_s = int(retry_after) if retry_after and retry_after.isdigit() else (5 * attempt)
-                logger.warning(f"429 Rate limited. Sleeping {sleep_s}s (attempt {attempt}/{max_retries})")
-                time.sleep(sleep_s)
-                continue
+                # Handle rate limiting
+                if resp.status_code == 429:
+                    retry_after = resp.headers.get("Retry-After")
+                    sleep_s = int(retry_after) if retry_after and retry_after.isdigit() else (5 * attempt)
+                    logger.warning(f"429 Rate limited. Sleeping {sleep_s}s (attempt {attempt}/{max_retries})")
+                    METRICS.inc("api_retries", reason="429")
+                    METRICS.inc("api_rate_limit_sleep_seconds", sleep_s)
+                    # Pause the shared limiter so every thread backs off; the next acquire() waits it out
+                    limiter.pause(sleep_s)
+                    continue
 
-            # Retry server errors
-            if 500 <= resp.status_code < 600:
-                sleep_s = (2 ** attempt) + random.random()
-                logger.warning(f"{resp.status_code} Server error. Sleeping {sleep_s:.1f}s (attempt {attempt}/{max_retries})")
-                time.sleep(sleep_s)
-                continue
+                # Retry server errors
+                if 500 <= resp.status_code < 600:
+                    sleep_s = (2 ** attempt) + random.random()
+                    logger.warning(f"{resp.status_code} Server error. Sleeping {sleep_s:.1f}s (attempt {attempt}/{max_retries})")
+                    METRICS.inc("api_retries", reason="5xx")
+                    time.sleep(sleep_s)
+                    continue
 
-            # Non-retryable client errors
-            resp.raise_for_status()
-            return resp.json()
+                # Non-retryable client errors
+                resp.raise_for_status()
+                METRICS.add_bytes("api_get_json", len(resp.content))
+                return resp.json()
 
-        except requests.exceptions.RequestException as e:
-            sleep_s = (2 ** attempt) + random.random()
-            logger.warning(f"Request failed: {e}. Sleeping {sleep_s:.1f}s (attempt {attempt}/{max_retries})")
-            time.sleep(sleep_s)
+            except requests.exceptions.RequestException as e:
+                sleep_s = (2 ** attempt) + random.random()
+                logger.warning(f"Request failed: {e}. Sleeping {sleep_s:.1f}s (attempt {attempt}/{max_retries})")
+                METRICS.inc("api_retries", reason="error")
+                time.sleep(sleep_s)
 
-    raise RuntimeError(f"Failed GET {url} after {max_retries} retries")
\ No newline at end of file
+        raise RuntimeError(f"Failed GET {url} after {max_retries} retries")
\ No newline at end of file
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import random
+from typing import Any, Optional
+
+import aiohttp
+
+from .config import FOOTBALL_DATA_API_TOKEN, FOOTBALL_DATA_BASE_URL
+from .logger import get_logger
+from .metrics import METRICS
+from .rate_limiter import TokenBucket, get_rate_limiter
+
+logger = get_logger("async_api_client")
+
+
+class AsyncFootballClient:
+    """
+    asyncio client for football-data.org with a persistent keep-alive connection pool.
+
+    Same semantics as api_client.get_json:
+    - proactive pacing through the shared token bucket
+    - 429: honour Retry-After (else 5s * attempt) and pause every caller
+    - 5xx / connection errors: exponential backoff with jitter
+    - RuntimeError after max_retries
+
+    Usage:
+        async with AsyncFootballClient() as client:
+            payload = await client.get_json("/competitions/PL/matches", params={...})
+
+    Point `base_url` at a local mock server (see mock_football_api) to exercise it offline.
+    """
+
+    def __init__(
+        self,
+        base_url: str = FOOTBALL_DATA_BASE_URL,
+        token: Optional[str] = FOOTBALL_DATA_API_TOKEN,
+        max_connections: int = 10,
+        timeout: int = 30,
+        max_retries: int = 5,
+        limiter: Optional[TokenBucket] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = limiter or get_rate_limiter()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncFootballClient":
+        connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60, ttl_dns_cache=300)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers={"X-Auth-Token": self.token or ""},
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get_json(self, path: str, params: dict | None = None) -> Any:
+        if self._session is None:
+            raise RuntimeError("AsyncFootballClient must be used inside 'async with'")
+
+        url = f"{self.base_url}{path}"
+
+        with METRICS.timer("api_get_json"):
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    METRICS.inc("api_limiter_wait_seconds", await self.limiter.acquire_async())
+                    async with self._session.get(url, params=params) as resp:
+                        self.limiter.update_from_headers(resp.headers)
+                        METRICS.inc("api_requests", status=resp.status)
+
+                        # Handle rate limiting
+                        if resp.status == 429:
+                            retry_after = resp.headers.get("Retry-After")
+                            sleep_s = int(retry_after) if retry_after and retry_after.isdigit() else (5 * attempt)
+                            logger.warning(f"429 Rate limited. Sleeping {sleep_s}s (attempt {attempt}/{self.max_retries})")
+                            METRICS.inc("api_retries", reason="429")
+                            METRICS.inc("api_rate_limit_sleep_seconds", sleep_s)
+                            self.limiter.pause(sleep_s)
+                            continue
+
+                        # Retry server errors
+                        if 500 <= resp.status < 600:
+                            sleep_s = (2 ** attempt) + random.random()
+                            logger.warning(
+                                f"{resp.status} Server error. Sleeping {sleep_s:.1f}s (attempt {attempt}/{self.max_retries})"
+                            )
+                            METRICS.inc("api_retries", reason="5xx")
+                            await asyncio.sleep(sleep_s)
+                            continue
+
+                        resp.raise_for_status()
+                        body = await resp.read()
+                        METRICS.add_bytes("api_get_json", len(body))
+                        return json.loads(body)
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    sleep_s = (2 ** attempt) + random.random()
+                    logger.warning(f"Request failed: {e}. Sleeping {sleep_s:.1f}s (attempt {attempt}/{self.max_retries})")
+                    METRICS.inc("api_retries", reason="error")
+                    await asyncio.sleep(sleep_s)
+
+            raise RuntimeError(f"Failed GET {url} after {self.max_retries} retries")
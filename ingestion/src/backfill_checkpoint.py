@@ -0,0 +1,86 @@
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+from .bronze_writer import put_bronze_json
+from .logger import get_logger
+from .minio_reader import get_json_object_if_exists
+
+logger = get_logger("backfill_checkpoint")
+
+# One checkpoint object per backfill job, beside the bronze data
+CHECKPOINT_PREFIX = "_state/backfill_checkpoints"
+
+
+def _checkpoint_key(job_id: str) -> str:
+    return f"{CHECKPOINT_PREFIX}/job={job_id}.json"
+
+
+class BackfillCheckpoint:
+    """
+    Progress record for one backfill job: the run_id / dt partition it writes under and every
+    finished chunk. A retried job reuses the same run_id, so resumed chunks land on the same
+    bronze keys, and finished chunks are never fetched again.
+
+    Thread-safe: parallel chunk workers call mark_done() as they finish.
+    """
+
+    def __init__(self, job_id: str, run_id: str, dt_partition: str, chunks: Optional[list[dict]] = None, status: str = "running"):
+        self.job_id = job_id
+        self.run_id = run_id
+        self.dt_partition = dt_partition
+        self.chunks = chunks or []
+        self.status = status
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load_or_start(cls, job_id: str, run_id: str, dt_partition: str) -> "BackfillCheckpoint":
+        """
+        Resume an unfinished checkpoint for `job_id`, or start a new one with `run_id` / `dt_partition`.
+        A job whose last run completed starts over, so it can be re-run deliberately.
+        """
+        record = get_json_object_if_exists(_checkpoint_key(job_id))
+        if record is not None and record.get("status") != "complete":
+            checkpoint = cls(job_id, record["run_id"], record["dt_partition"], record.get("chunks", []), record["status"])
+            logger.info(
+                f"Resuming backfill job={job_id} run_id={checkpoint.run_id}: "
+                f"{len(checkpoint.chunks)} chunk(s) already done"
+            )
+            return checkpoint
+
+        checkpoint = cls(job_id, run_id, dt_partition)
+        checkpoint._save()
+        return checkpoint
+
+    @property
+    def completed_ranges(self) -> list[tuple[str, str]]:
+        return [(c["date_from"], c["date_to"]) for c in self.chunks]
+
+    def _save(self) -> None:
+        put_bronze_json(_checkpoint_key(self.job_id), {
+            "job_id": self.job_id,
+            "run_id": self.run_id,
+            "dt_partition": self.dt_partition,
+            "status": self.status,
+            "chunks": self.chunks,
+            "updated_at_utc": datetime.now(timezone.utc).isoformat(),
+        })
+
+    def mark_done(self, date_from: str, date_to: str, match_count: int, written: bool) -> None:
+        """
+        Record a chunk as finished. Call only after its bronze write succeeded.
+        """
+        with self._lock:
+            self.chunks.append({
+                "date_from": date_from,
+                "date_to": date_to,
+                "match_count": match_count,
+                "written": written,
+                "finished_at_utc": datetime.now(timezone.utc).isoformat(),
+            })
+            self._save()
+
+    def finish(self) -> None:
+        with self._lock:
+            self.status = "complete"
+            self._save()
@@ -0,0 +1,97 @@
+import threading
+from datetime import date, timedelta
+from typing import Optional
+
+from .logger import get_logger
+
+logger = get_logger("backfill_chunker")
+
+
+class AdaptiveChunker:
+    """
+    Hands out consecutive (date_from, date_to) windows over a backfill range and sizes each
+    new window from the match density of the chunks seen so far.
+
+    - a chunk under budget grows the window (at most 2x per step), so summer breaks take few calls
+    - a chunk over `target_matches` or `max_payload_bytes` shrinks it proportionally
+    - windows always stay within [min_days, max_days]
+    - adaptive=False keeps a fixed `initial_days` window (the old BACKFILL_CHUNK_DAYS behaviour)
+    - `skip` ranges (chunks finished by an earlier attempt) are never handed out again
+
+    Thread-safe: parallel workers take windows with next_window() and report with record().
+    """
+
+    def __init__(
+        self,
+        start_d: date,
+        end_d: date,
+        initial_days: int,
+        min_days: int = 1,
+        max_days: int = 60,
+        target_matches: int = 200,
+        max_payload_bytes: int = 4 * 1024 * 1024,
+        adaptive: bool = True,
+        skip: Optional[list[tuple[str, str]]] = None,
+    ):
+        self.end_d = end_d
+        self.min_days = min_days
+        self.max_days = max_days
+        self.target_matches = target_matches
+        self.max_payload_bytes = max_payload_bytes
+        self.adaptive = adaptive
+        self.skip = sorted((date.fromisoformat(a), date.fromisoformat(b)) for a, b in (skip or []))
+
+        self._cursor = start_d
+        self._days = min(max(initial_days, min_days), max_days)
+        self._lock = threading.Lock()
+
+    @property
+    def days(self) -> int:
+        return self._days
+
+    def next_window(self) -> Optional[tuple[str, str]]:
+        """
+        Next window at the current size, or None once the range is exhausted.
+        """
+        with self._lock:
+            # Jump over ranges that are already done
+            for skip_from, skip_to in self.skip:
+                if skip_from <= self._cursor <= skip_to:
+                    self._cursor = skip_to + timedelta(days=1)
+
+            if self._cursor > self.end_d:
+                return None
+            chunk_end = min(self._cursor + timedelta(days=self._days - 1), self.end_d)
+
+            # ...and stop short of the next one
+            for skip_from, _ in self.skip:
+                if self._cursor < skip_from <= chunk_end:
+                    chunk_end = skip_from - timedelta(days=1)
+                    break
+
+            window = (self._cursor.isoformat(), chunk_end.isoformat())
+            self._cursor = chunk_end + timedelta(days=1)
+            return window
+
+    def record(self, date_from: str, date_to: str, match_count: int, payload_bytes: int) -> None:
+        """
+        Resize future windows from one finished chunk.
+        """
+        if not self.adaptive:
+            return
+
+        days = (date.fromisoformat(date_to) - date.fromisoformat(date_from)).days + 1
+        ratio = min(
+            self.target_matches / max(match_count, 1),
+            self.max_payload_bytes / max(payload_bytes, 1),
+            2.0,
+        )
+        new_days = min(max(int(days * ratio), self.min_days), self.max_days)
+
+        with self._lock:
+            if new_days != self._days:
+                logger.info(
+                    f"Chunk {date_from}..{date_to} had {match_count} matches / {payload_bytes} bytes; "
+                    f"window {self._days} -> {new_days} days"
+                )
+                self._days = new_days
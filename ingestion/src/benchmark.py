@@ -0,0 +1,398 @@
+"""
+Reproducible ingest → bronze → load benchmark with local stand-ins for every external system:
+synthetic payloads from mock_football_api (latency / quota / 5xx), local_s3 for MinIO and
+local_snowflake (SQLite) for Snowflake. The real api_client, bronze writer, minio_reader and
+incremental loader run unchanged against them.
+
+Per stage it reports files/sec, MB/sec, API calls, SQL statements and peak RSS, plus the
+metrics.py stage breakdown. Results are JSON, so runs on different commits can be compared.
+
+Examples:
+    # defaults: 4 competitions x 2 seasons, 30-day chunks, 60 matches per chunk
+    python -m ingestion.src.benchmark --out bench/$(git rev-parse --short HEAD).json
+
+    # force 429s: the client paces at 600/min, the mock only allows 120/min
+    python -m ingestion.src.benchmark --api-requests-per-minute 120 --client-requests-per-minute 600
+
+    # flag a >10% drop in files/sec or MB/sec (or >10% more peak RSS) against an earlier run
+    python -m ingestion.src.benchmark --compare bench/baseline.json --tolerance 0.1
+
+    # also load the same bronze keys in batch and copy mode and compare the bronze tables
+    python -m ingestion.src.benchmark --copy-parity
+
+Config still validates its env vars: set FOOTBALL_DATA_API_TOKEN, MINIO_ACCESS_KEY and MINIO_SECRET_KEY
+to any value. BRONZE_LOAD_MODE=copy needs BRONZE_COPY_STAGE=file://<dir> (LocalSnowflake has no PUT).
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import math
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Optional
+
+from . import api_client, load_incremental_matches_to_snowflake, rate_limiter
+from .bronze_stage_loader import LocalFileStage
+from .config import (
+    BRONZE_COPY_STAGE,
+    BRONZE_LOAD_MODE,
+    FOOTBALL_DATA_HTTP_CLIENT,
+    INGEST_MAX_WORKERS,
+    MINIO_BRONZE_BUCKET,
+)
+from .ingest_matches_incremental import _write_competition_window
+from .local_s3 import use_local_s3
+from .local_snowflake import LocalSnowflake, use_local_snowflake
+from .logger import get_logger
+from .match_file_loader import load_keys
+from .metrics import METRICS
+from .minio_reader import iter_partitioned_keys
+from .mock_football_api import start_mock_server
+from .rate_limiter import TokenBucket
+from .snowflake_pool import SnowflakeSessionPool
+
+logger = get_logger("benchmark")
+
+COMPETITION_CODES = ["PL", "SA", "BL1", "PD", "FL1", "DED", "PPL", "ELC", "BSA", "CL"]
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+
+
+def competition_codes(n: int) -> list[str]:
+    return COMPETITION_CODES[:n] + [f"C{i:02d}" for i in range(len(COMPETITION_CODES), n)]
+
+
+def season_windows(seasons: int, chunk_days: int, today: Optional[date] = None) -> list[tuple[str, str]]:
+    """
+    (dateFrom, dateTo) chunks covering the last `seasons` full calendar years (the mock's season = year).
+    """
+    today = today or datetime.now(timezone.utc).date()
+    windows = []
+    for year in range(today.year - seasons, today.year):
+        start, end = date(year, 1, 1), date(year, 12, 31)
+        while start <= end:
+            stop = min(start + timedelta(days=chunk_days - 1), end)
+            windows.append((start.isoformat(), stop.isoformat()))
+            start = stop + timedelta(days=1)
+    return windows
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Reset the kernel's peak-RSS counter (Linux). False when only the process-lifetime peak is available.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _stage_result(name: str, elapsed: float, files: int, byte_stages: tuple, rss_scope: str, **extra) -> dict:
+    summary = METRICS.summary()
+    stage_bytes = sum(summary["stages"].get(s, {}).get("bytes", 0) for s in byte_stages)
+    result = {
+        "seconds": round(elapsed, 3),
+        "files": files,
+        "files_per_sec": round(files / elapsed, 2) if elapsed else 0.0,
+        "mb": round(stage_bytes / (1024 * 1024), 3),
+        "mb_per_sec": round(stage_bytes / (1024 * 1024) / elapsed, 3) if elapsed else 0.0,
+        "api_calls": summary["api"]["requests"],
+        "peak_rss_mb": _peak_rss_mb(),
+        "peak_rss_scope": rss_scope,
+        **extra,
+        "stage_metrics": summary,
+    }
+    logger.info(
+        f"[{name}] {files} files in {elapsed:.2f}s: {result['files_per_sec']} files/s, "
+        f"{result['mb_per_sec']} MB/s, peak RSS {result['peak_rss_mb']} MB"
+    )
+    return result
+
+
+async def _fetch_all_async(jobs: list[tuple[str, str, str]], base_url: str, write) -> list[bool]:
+    from .async_api_client import AsyncFootballClient
+
+    semaphore = asyncio.Semaphore(max(1, INGEST_MAX_WORKERS))
+    async with AsyncFootballClient(base_url=base_url, max_connections=max(1, INGEST_MAX_WORKERS)) as client:
+        async def _one(code: str, date_from: str, date_to: str) -> bool:
+            async with semaphore:
+                payload = await client.get_json(
+                    f"/competitions/{code}/matches", params={"dateFrom": date_from, "dateTo": date_to}
+                )
+            return await asyncio.to_thread(write, code, payload, date_from, date_to)
+
+        return await asyncio.gather(*(_one(*job) for job in jobs))
+
+
+def run_ingest(jobs: list[tuple[str, str, str]], base_url: str) -> dict:
+    """
+    Stage 1: API → bronze. Same fan-out as ingest_matches_incremental (INGEST_MAX_WORKERS,
+    FOOTBALL_DATA_HTTP_CLIENT), one window payload + manifest written per job.
+    """
+    run_id = str(uuid.uuid4())
+    now_utc = datetime.now(timezone.utc)
+    dt_partition = now_utc.strftime("%Y-%m-%d")
+
+    def _write(code: str, payload: dict, date_from: str, date_to: str) -> bool:
+        return _write_competition_window(code, payload, run_id, date_from, date_to, dt_partition, now_utc.isoformat())
+
+    def _one(job: tuple[str, str, str]) -> bool:
+        code, date_from, date_to = job
+        payload = api_client.get_json(f"/competitions/{code}/matches", params={"dateFrom": date_from, "dateTo": date_to})
+        return _write(code, payload, date_from, date_to)
+
+    METRICS.reset()
+    rss_scope = "stage" if _reset_peak_rss() else "process"
+    started = time.perf_counter()
+    if FOOTBALL_DATA_HTTP_CLIENT == "async":
+        written = asyncio.run(_fetch_all_async(jobs, base_url, _write))
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, INGEST_MAX_WORKERS)) as pool:
+            written = list(pool.map(_one, jobs))
+    elapsed = time.perf_counter() - started
+
+    return _stage_result(
+        "ingest", elapsed, sum(1 for w in written if w), ("minio_put",), rss_scope,
+        windows_fetched=len(jobs),
+    )
+
+
+def run_load(local_snowflake: LocalSnowflake) -> dict:
+    """
+    Stage 2: bronze → Snowflake stand-in, through load_incremental_matches_to_snowflake.main().
+    """
+    METRICS.reset()
+    rss_scope = "stage" if _reset_peak_rss() else "process"
+    statements_before = local_snowflake.statements
+    out = io.StringIO()
+    started = time.perf_counter()
+    with redirect_stdout(out):
+        load_incremental_matches_to_snowflake.main([])
+    elapsed = time.perf_counter() - started
+
+    loader = json.loads(out.getvalue().strip().splitlines()[-1])
+    rows = local_snowflake.query("SELECT COUNT(*) FROM FOOTBALL_DB.BRONZE.RAW_MATCHES")[0][0]
+    return _stage_result(
+        "load", elapsed, loader["data_files_loaded"], ("minio_get", "minio_stream"), rss_scope,
+        sql_statements=local_snowflake.statements - statements_before,
+        raw_matches_rows=rows,
+        files_discovered=loader["files_discovered"],
+    )
+
+
+# Bronze tables written by the match loaders, compared without LOADED_AT (it is the load time)
+PARITY_TABLES = {
+    "RAW_MATCHES": "FILE_KEY, COMPETITION_CODE, DATE_FROM, DATE_TO, RUN_ID, DT, PAYLOAD",
+    "RAW_MANIFESTS": "FILE_KEY, ENDPOINT, RUN_ID, DT, MANIFEST",
+    "LOAD_STATE": "FILE_KEY, ENDPOINT",
+}
+
+
+def copy_parity_check(prefix: str = "endpoint=matches/") -> dict:
+    """
+    Load the same bronze keys with match_file_loader.load_keys() in batch mode and in copy mode
+    (LocalFileStage + LocalSnowflake COPY INTO), each into a fresh LocalSnowflake, and compare
+    RAW_MATCHES, RAW_MANIFESTS and LOAD_STATE row for row. Raises when the modes disagree.
+    """
+    keys = list(iter_partitioned_keys(prefix))
+    data_keys = sorted(k for k in keys if k.endswith(".json") and not k.endswith(".manifest.json"))
+    manifest_keys = set(k for k in keys if k.endswith(".manifest.json"))
+
+    tables: dict[str, dict[str, list[tuple]]] = {table: {} for table in PARITY_TABLES}
+    with tempfile.TemporaryDirectory() as stage_dir:
+        for mode in ("batch", "copy"):
+            local = LocalSnowflake()
+            pool = SnowflakeSessionPool(connect=local.connect, size=1)
+            try:
+                load_keys(
+                    data_keys,
+                    manifest_keys,
+                    manifest_endpoint="matches",
+                    load_state_endpoint="matches_incremental",
+                    pool=pool,
+                    mode=mode,
+                    stage=LocalFileStage(stage_dir) if mode == "copy" else None,
+                )
+                for table, columns in PARITY_TABLES.items():
+                    tables[table][mode] = local.query(
+                        f"SELECT {columns} FROM FOOTBALL_DB.BRONZE.{table} ORDER BY {columns}"
+                    )
+            finally:
+                pool.close()
+                os.remove(local.path)
+        leftover = os.listdir(stage_dir)
+
+    result = {"files": len(data_keys), "rows": {t: len(rows["batch"]) for t, rows in tables.items()}}
+    mismatched = [t for t, rows in tables.items() if rows["batch"] != rows["copy"]]
+    if mismatched:
+        raise RuntimeError(f"Copy mode and batch mode loaded different rows into: {', '.join(mismatched)}")
+    if leftover:
+        raise RuntimeError(f"COPY INTO ... PURGE = TRUE left staged files behind: {leftover}")
+    logger.info(f"[copy-parity] {len(data_keys)} files: batch and copy mode match ({result['rows']})")
+    return result
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> tuple[dict, list[str]]:
+    """
+    Ratios current / baseline per stage, and the metrics that regressed by more than `tolerance`.
+    """
+    ratios: dict[str, dict] = {}
+    regressions: list[str] = []
+    for stage, result in current["stages"].items():
+        base = (baseline.get("stages") or {}).get(stage)
+        if not base:
+            continue
+        ratios[stage] = {}
+        for metric, higher_is_better in (("files_per_sec", True), ("mb_per_sec", True), ("peak_rss_mb", False)):
+            if not base.get(metric) or result.get(metric) is None:
+                continue
+            ratio = result[metric] / base[metric]
+            ratios[stage][metric] = round(ratio, 3)
+            if (higher_is_better and ratio < 1 - tolerance) or (not higher_is_better and ratio > 1 + tolerance):
+                regressions.append(f"{stage}.{metric}: {base[metric]} -> {result[metric]} ({ratio:.2f}x)")
+    return ratios, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingest → bronze → load against local stand-ins")
+    parser.add_argument("--competitions", type=int, default=4)
+    parser.add_argument("--seasons", type=int, default=2)
+    parser.add_argument("--chunk-days", type=int, default=30)
+    parser.add_argument("--matches-per-chunk", type=int, default=60)
+    parser.add_argument("--api-latency-ms", type=int, default=20)
+    parser.add_argument("--api-requests-per-minute", type=int, default=6000, help="Mock quota; 429 above it")
+    parser.add_argument("--client-requests-per-minute", type=float, default=6000, help="Client token bucket")
+    parser.add_argument("--api-error-rate", type=float, default=0.0, help="Share of 503 responses")
+    parser.add_argument("--snowflake-latency-ms", type=float, default=20, help="Added to every SQL statement")
+    parser.add_argument("--log-level", default="WARNING", help="Pipeline log level while the stages run")
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument(
+        "--copy-parity", action="store_true", help="Also load the bronze keys in batch and copy mode and compare"
+    )
+    args = parser.parse_args()
+
+    if BRONZE_LOAD_MODE == "copy" and not BRONZE_COPY_STAGE.startswith("file://"):
+        raise RuntimeError("BRONZE_LOAD_MODE=copy needs BRONZE_COPY_STAGE=file://<dir> (LocalSnowflake has no PUT)")
+    if args.competitions < 1 or args.seasons < 1 or args.chunk_days < 1 or args.matches_per_chunk < 1:
+        raise RuntimeError("--competitions, --seasons, --chunk-days and --matches-per-chunk must be >= 1")
+
+    matches_per_day = math.ceil(args.matches_per_chunk / args.chunk_days)
+    windows = season_windows(args.seasons, args.chunk_days)
+    jobs = [(code, date_from, date_to) for code in competition_codes(args.competitions) for date_from, date_to in windows]
+
+    # Wire every external system to its stand-in
+    mock = start_mock_server(
+        latency_ms=args.api_latency_ms,
+        requests_per_minute=args.api_requests_per_minute,
+        error_rate=args.api_error_rate,
+        matches_per_day=matches_per_day,
+    )
+    api_client.BASE_URL = mock.base_url
+    with rate_limiter._limiter_lock:
+        rate_limiter._limiter = TokenBucket(args.client_requests_per_minute)
+    s3 = use_local_s3()
+    local_snowflake = use_local_snowflake(LocalSnowflake(latency_ms=args.snowflake_latency_ms))
+
+    level = getattr(logging, args.log_level.upper())
+    for name, pipeline_logger in logging.Logger.manager.loggerDict.items():
+        if isinstance(pipeline_logger, logging.Logger) and name != "benchmark":
+            pipeline_logger.setLevel(level)
+
+    logger.info(f"Benchmark: {len(jobs)} windows, ~{matches_per_day * args.chunk_days} matches per chunk")
+    try:
+        stages = {"ingest": run_ingest(jobs, mock.base_url)}
+        stages["ingest"].update({"mock_api_calls": mock.calls, "mock_api_rate_limited": mock.rate_limited})
+        stages["load"] = run_load(local_snowflake)
+    finally:
+        mock.shutdown()
+        os.remove(local_snowflake.path)
+    copy_parity = copy_parity_check() if args.copy_parity else None
+
+    report: dict[str, Any] = {
+        "benchmark": "ingest_bronze_load",
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": {
+            **{
+                k: v for k, v in vars(args).items()
+                if k not in ("out", "compare", "tolerance", "log_level", "copy_parity")
+            },
+            "matches_per_day": matches_per_day,
+            "windows": len(jobs),
+            "http_client": FOOTBALL_DATA_HTTP_CLIENT,
+            "bronze_load_mode": BRONZE_LOAD_MODE,
+            "ingest_max_workers": INGEST_MAX_WORKERS,
+        },
+        "bronze_objects": sum(1 for bucket, _ in s3.objects if bucket == MINIO_BRONZE_BUCKET),
+        "stages": stages,
+    }
+    if copy_parity:
+        report["copy_parity"] = copy_parity
+
+    regressions: list[str] = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("params") != report["params"]:
+            logger.warning(f"{args.compare} was run with different params; ratios are not like for like")
+        report["compare"] = {"baseline_commit": baseline.get("commit"), "tolerance": args.tolerance}
+        report["compare"]["ratios"], regressions = compare(report, baseline, args.tolerance)
+        report["compare"]["regressions"] = regressions
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Wrote benchmark report to {args.out}")
+
+    # Print report JSON as last line
+    print(json.dumps(report))
+
+    if regressions:
+        raise RuntimeError(f"Benchmark regressed against {args.compare}: {regressions}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import gzip
+import hashlib
+import io
+import zlib
+from datetime import date, datetime
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+CODECS = ("json", "gzip", "zstd")
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+PARQUET_MAGIC = b"PAR1"
+
+# Same columns (and order) as SILVER.v_matches, minus the warehouse-side loaded_at
+V_MATCHES_COLUMNS = [
+    "file_key", "competition_code", "date_from", "date_to", "run_id", "dt",
+    "match_id", "utc_date", "status", "stage", "match_group", "matchday", "last_updated",
+    "competition_id", "competition_code_in_payload", "competition_name", "competition_type",
+    "season_id", "season_start_date", "season_end_date", "season_current_matchday",
+    "home_team_id", "home_team_name", "home_team_short_name", "home_team_tla", "home_team_crest",
+    "away_team_id", "away_team_name", "away_team_short_name", "away_team_tla", "away_team_crest",
+    "winner", "duration", "ft_home_goals", "ft_away_goals", "ht_home_goals", "ht_away_goals",
+]
+
+
+def _require_zstd() -> None:
+    if zstandard is None:
+        raise RuntimeError("zstd bronze encoding needs the 'zstandard' package")
+
+
+def compress_bytes(raw: bytes, codec: str = "json") -> bytes:
+    """
+    Compress serialized JSON with `codec` ("json" = store uncompressed).
+    """
+    if codec not in CODECS:
+        raise RuntimeError(f"Unknown bronze codec {codec!r}; expected one of {CODECS}")
+
+    if codec == "gzip":
+        return gzip.compress(raw, compresslevel=6, mtime=0)
+    if codec == "zstd":
+        _require_zstd()
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    return raw
+
+
+def detect_codec(head: bytes) -> str:
+    if head.startswith(GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return "json"
+
+
+def decode_bytes(data: bytes) -> bytes:
+    """
+    Undo whatever compression `data` carries (detected from its magic bytes).
+    """
+    codec = detect_codec(data[:4])
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zstd":
+        _require_zstd()
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def iter_decoded_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Decompress a stream of chunks on the fly; plain JSON passes through untouched.
+    """
+    it = iter(chunks)
+    head = b""
+    for chunk in it:
+        head += chunk
+        if len(head) >= 4:
+            break
+
+    codec = detect_codec(head)
+    if codec == "json":
+        if head:
+            yield head
+        yield from it
+        return
+
+    if codec == "gzip":
+        decompressor = zlib.decompressobj(wbits=31)
+    else:
+        _require_zstd()
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    for chunk in _chain(head, it):
+        out = decompressor.decompress(chunk)
+        if out:
+            yield out
+    if codec == "gzip":
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+def _chain(head: bytes, rest: Iterator[bytes]) -> Iterator[bytes]:
+    if head:
+        yield head
+    yield from rest
+
+
+class ChunkReader:
+    """
+    File-like read() over an iterator of byte chunks (e.g. iter_decoded_chunks output).
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buf = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buf) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buf += chunk
+        if size < 0:
+            out, self._buf = self._buf, b""
+        else:
+            out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
+
+def open_decoded(body: Any, chunk_size: int = 64 * 1024) -> BinaryIO:
+    """
+    Readable, decompressed view of an S3 response body.
+    """
+    return ChunkReader(iter_decoded_chunks(body.iter_chunks(chunk_size)))
+
+
+def encoding_info(raw_bytes: int, stored: bytes, codec: str) -> dict:
+    """
+    Manifest block describing how an object was stored.
+    """
+    return {
+        "codec": codec,
+        "bytes_uncompressed": raw_bytes,
+        "bytes_stored": len(stored),
+        "sha256": hashlib.sha256(stored).hexdigest(),
+    }
+
+
+def flatten_match(match: dict, file_meta: Optional[dict] = None) -> dict:
+    """
+    One v_matches-shaped row from a football-data.org match dict (plus file_key / run metadata).
+    """
+    meta = file_meta or {}
+    competition = match.get("competition") or {}
+    season = match.get("season") or {}
+    home = match.get("homeTeam") or {}
+    away = match.get("awayTeam") or {}
+    score = match.get("score") or {}
+    full_time = score.get("fullTime") or {}
+    half_time = score.get("halfTime") or {}
+
+    return {
+        "file_key": meta.get("file_key"),
+        "competition_code": meta.get("competition_code"),
+        "date_from": meta.get("date_from"),
+        "date_to": meta.get("date_to"),
+        "run_id": meta.get("run_id"),
+        "dt": meta.get("dt"),
+        "match_id": match.get("id"),
+        "utc_date": match.get("utcDate"),
+        "status": match.get("status"),
+        "stage": match.get("stage"),
+        "match_group": match.get("group"),
+        "matchday": match.get("matchday"),
+        "last_updated": match.get("lastUpdated"),
+        "competition_id": competition.get("id"),
+        "competition_code_in_payload": competition.get("code"),
+        "competition_name": competition.get("name"),
+        "competition_type": competition.get("type"),
+        "season_id": season.get("id"),
+        "season_start_date": season.get("startDate"),
+        "season_end_date": season.get("endDate"),
+        "season_current_matchday": season.get("currentMatchday"),
+        "home_team_id": home.get("id"),
+        "home_team_name": home.get("name"),
+        "home_team_short_name": home.get("shortName"),
+        "home_team_tla": home.get("tla"),
+        "home_team_crest": home.get("crest"),
+        "away_team_id": away.get("id"),
+        "away_team_name": away.get("name"),
+        "away_team_short_name": away.get("shortName"),
+        "away_team_tla": away.get("tla"),
+        "away_team_crest": away.get("crest"),
+        "winner": score.get("winner"),
+        "duration": score.get("duration"),
+        "ft_home_goals": full_time.get("home"),
+        "ft_away_goals": full_time.get("away"),
+        "ht_home_goals": half_time.get("home"),
+        "ht_away_goals": half_time.get("away"),
+    }
+
+
+def typed_match_row(row: dict) -> dict:
+    """
+    Cast a flatten_match() row to v_matches types: timestamps as aware datetimes, dates as dates.
+    """
+    return {
+        c: _to_timestamp(v) if c in _TIMESTAMP_COLUMNS else _to_date(v) if c in _DATE_COLUMNS else v
+        for c, v in row.items()
+    }
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("Parquet bronze renditions need the 'pyarrow' package")
+
+
+def encode_parquet(rows: list[dict]) -> bytes:
+    """
+    Parquet file (zstd-compressed columns) with the V_MATCHES_COLUMNS schema and v_matches types.
+    """
+    _require_pyarrow()
+    table = pa.Table.from_pylist([typed_match_row(row) for row in rows], schema=_parquet_schema())
+    out = io.BytesIO()
+    pq.write_table(table, out, compression="zstd")
+    return out.getvalue()
+
+
+def decode_parquet(data: bytes) -> list[dict]:
+    _require_pyarrow()
+    return pq.read_table(io.BytesIO(data)).to_pylist()
+
+
+_NUMBER_COLUMNS = {
+    "match_id", "matchday", "competition_id", "season_id", "season_current_matchday",
+    "home_team_id", "away_team_id", "ft_home_goals", "ft_away_goals", "ht_home_goals", "ht_away_goals",
+}
+_TIMESTAMP_COLUMNS = {"utc_date", "last_updated"}
+_DATE_COLUMNS = {"date_from", "date_to", "dt", "season_start_date", "season_end_date"}
+
+
+def _to_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+def _to_date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+
+def _parquet_schema():
+    def _type(column: str):
+        if column in _NUMBER_COLUMNS:
+            return pa.int64()
+        if column in _TIMESTAMP_COLUMNS:
+            return pa.timestamp("us", tz="UTC")
+        if column in _DATE_COLUMNS:
+            return pa.date32()
+        return pa.string()
+
+    return pa.schema([(c, _type(c)) for c in V_MATCHES_COLUMNS])
@@ -0,0 +1,40 @@
+import re
+
+# Parse metadata from the MinIO key pattern:
+# endpoint=<e>/competition=<code>/dateFrom=YYYY-MM-DD/dateTo=YYYY-MM-DD/dt=YYYY-MM-DD/run_id=<uuid>[.manifest].json
+RUN_ID_RE = re.compile(r"run_id=([a-f0-9\-]+)\.(?:manifest\.)?json$")
+DT_RE = re.compile(r"dt=(\d{4}-\d{2}-\d{2})")
+COMP_RE = re.compile(r"competition=([^/]+)/")
+DATEFROM_RE = re.compile(r"dateFrom=(\d{4}-\d{2}-\d{2})")
+DATETO_RE = re.compile(r"dateTo=(\d{4}-\d{2}-\d{2})")
+
+
+def parse_key(key: str):
+    """
+    Returns (run_id, dt, competition, date_from, date_to); missing parts are None.
+    """
+    run_id = RUN_ID_RE.search(key).group(1) if RUN_ID_RE.search(key) else None
+    dt = DT_RE.search(key).group(1) if DT_RE.search(key) else None
+    comp = COMP_RE.search(key).group(1) if COMP_RE.search(key) else None
+    date_from = DATEFROM_RE.search(key).group(1) if DATEFROM_RE.search(key) else None
+    date_to = DATETO_RE.search(key).group(1) if DATETO_RE.search(key) else None
+    return run_id, dt, comp, date_from, date_to
+
+
+def manifest_key_for(data_key: str) -> str:
+    return data_key.replace(".json", ".manifest.json")
+
+
+def file_meta(data_key: str) -> dict:
+    """
+    RAW_MATCHES-style file columns for a data key (what v_matches carries next to each match).
+    """
+    run_id, dt, comp, date_from, date_to = parse_key(data_key)
+    return {
+        "file_key": data_key,
+        "competition_code": comp,
+        "date_from": date_from,
+        "date_to": date_to,
+        "run_id": run_id,
+        "dt": dt,
+    }
@@ -1,8 +1,12 @@
 import json
+from dataclasses import dataclass
 from typing import Any, Optional
 
+from .config import BRONZE_LOAD_STATEMENT_MAX_BYTES
+from .load_state import mark_loaded_many
 from .logger import get_logger
-from .snowflake_client import get_snowflake_conn
+from .metrics import METRICS
+from .snowflake_pool import borrow_connection
 
 logger = get_logger("bronze_snowflake_loader")
 
@@ -11,13 +15,13 @@ RAW_MATCHES_FQN = "FOOTBALL_DB.BRONZE.RAW_MATCHES"
 RAW_MANIFESTS_FQN = "FOOTBALL_DB.BRONZE.RAW_MANIFESTS"
 
 
-def upsert_raw_competitions(file_key: str, run_id: Optional[str], dt: Optional[str], payload: Any) -> None:
-    conn = get_snowflake_conn()
-    try:
+def upsert_raw_competitions(file_key: str, run_id: Optional[str], dt: Optional[str], payload: Any, conn: Any = None) -> None:
+    with borrow_connection(conn) as conn, METRICS.timer("snowflake_upsert_raw_competitions"):
         cur = conn.cursor()
         cur.execute(f"DELETE FROM {RAW_COMPETITIONS_FQN} WHERE FILE_KEY = %s", (file_key,))
 
         payload_json = json.dumps(payload)
+        METRICS.add_bytes("snowflake_write", len(payload_json))
         cur.execute(
             f"""
             INSERT INTO {RAW_COMPETITIONS_FQN} (FILE_KEY, RUN_ID, DT, PAYLOAD)
@@ -28,8 +32,6 @@ def upsert_raw_competitions(file_key: str, run_id: Optional[str], dt: Optional[s
 
         conn.commit()
         logger.info(f"Upserted RAW_COMPETITIONS for file_key={file_key}")
-    finally:
-        conn.close()
 
 
 def upsert_raw_matches(
@@ -40,13 +42,14 @@ def upsert_raw_matches(
     run_id: Optional[str],
     dt: Optional[str],
     payload: Any,
+    conn: Any = None,
 ) -> None:
-    conn = get_snowflake_conn()
-    try:
+    with borrow_connection(conn) as conn, METRICS.timer("snowflake_upsert_raw_matches"):
         cur = conn.cursor()
         cur.execute(f"DELETE FROM {RAW_MATCHES_FQN} WHERE FILE_KEY = %s", (file_key,))
 
         payload_json = json.dumps(payload)
+        METRICS.add_bytes("snowflake_write", len(payload_json))
         cur.execute(
             f"""
             INSERT INTO {RAW_MATCHES_FQN}
@@ -59,8 +62,6 @@ def upsert_raw_matches(
 
         conn.commit()
         logger.info(f"Upserted RAW_MATCHES for file_key={file_key}")
-    finally:
-        conn.close()
 
 
 def upsert_raw_manifest(
@@ -69,13 +70,14 @@ def upsert_raw_manifest(
     run_id: Optional[str],
     dt: Optional[str],
     manifest: Any,
+    conn: Any = None,
 ) -> None:
-    conn = get_snowflake_conn()
-    try:
+    with borrow_connection(conn) as conn, METRICS.timer("snowflake_upsert_raw_manifest"):
         cur = conn.cursor()
         cur.execute(f"DELETE FROM {RAW_MANIFESTS_FQN} WHERE FILE_KEY = %s", (file_key,))
 
         manifest_json = json.dumps(manifest)
+        METRICS.add_bytes("snowflake_write", len(manifest_json))
         cur.execute(
             f"""
             INSERT INTO {RAW_MANIFESTS_FQN}
@@ -88,5 +90,132 @@ def upsert_raw_manifest(
 
         conn.commit()
         logger.info(f"Upserted RAW_MANIFESTS for file_key={file_key}")
-    finally:
-        conn.close()
\ No newline at end of file
+
+
+@dataclass
+class MatchFile:
+    """
+    One bronze matches object (plus its manifest, if present) ready to be loaded.
+    `payload` is either the decoded JSON or its raw text, which is forwarded to PARSE_JSON unchanged.
+    """
+    file_key: str
+    competition_code: Optional[str]
+    date_from: Optional[str]
+    date_to: Optional[str]
+    run_id: Optional[str]
+    dt: Optional[str]
+    payload: Any
+    manifest_key: Optional[str] = None
+    manifest: Optional[dict] = None
+
+
+def _chunk_rows(rows: list[tuple], max_bytes: int) -> list[list[tuple]]:
+    """
+    Split rows into groups whose serialized size (last column is the JSON text) stays under max_bytes.
+    A single oversized row still gets its own group.
+    """
+    chunks: list[list[tuple]] = []
+    current: list[tuple] = []
+    current_bytes = 0
+    for row in rows:
+        row_bytes = len(row[-1])
+        if current and current_bytes + row_bytes > max_bytes:
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(row)
+        current_bytes += row_bytes
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _insert_from_values(cur, insert_sql: str, select_sql: str, rows: list[tuple], max_bytes: int) -> None:
+    width = len(rows[0])
+    row_sql = "(" + ", ".join(["%s"] * width) + ")"
+    for chunk in _chunk_rows(rows, max_bytes):
+        cur.execute(
+            f"{insert_sql} SELECT {select_sql} FROM VALUES {', '.join([row_sql] * len(chunk))}",
+            [v for row in chunk for v in row],
+        )
+
+
+def upsert_match_files_batch(
+    files: list[MatchFile],
+    manifest_endpoint: str,
+    load_state_endpoint: str,
+    conn: Any = None,
+    max_statement_bytes: int = BRONZE_LOAD_STATEMENT_MAX_BYTES,
+) -> None:
+    """
+    Load a batch of matches files in one transaction using set-based statements:
+    - DELETE + INSERT ... FROM VALUES into RAW_MATCHES
+    - DELETE + INSERT ... FROM VALUES into RAW_MANIFESTS
+    - one MERGE into LOAD_STATE for data files and manifests
+    Either the whole batch is loaded and marked, or (on error) nothing is.
+    """
+    if not files:
+        return
+
+    match_rows = [
+        (
+            f.file_key, f.competition_code, f.date_from, f.date_to, f.run_id, f.dt,
+            f.payload if isinstance(f.payload, str) else json.dumps(f.payload),
+        )
+        for f in files
+    ]
+    manifest_rows = [
+        (
+            f.manifest_key,
+            f.manifest.get("endpoint") or manifest_endpoint,
+            f.manifest.get("run_id") or f.run_id,
+            # For dt in RAW_MANIFESTS we prefer the manifest's dt_partition; fall back to parsed dt
+            f.manifest.get("dt_partition") or f.dt,
+            json.dumps(f.manifest),
+        )
+        for f in files
+        if f.manifest_key and f.manifest is not None
+    ]
+    load_state_entries = [(f.file_key, load_state_endpoint) for f in files] + [
+        (row[0], f"{load_state_endpoint}_manifest") for row in manifest_rows
+    ]
+
+    with borrow_connection(conn) as conn, METRICS.timer("snowflake_upsert_batch"):
+        cur = conn.cursor()
+        cur.execute("BEGIN")
+        try:
+            match_keys = [row[0] for row in match_rows]
+            cur.execute(
+                f"DELETE FROM {RAW_MATCHES_FQN} WHERE FILE_KEY IN ({', '.join(['%s'] * len(match_keys))})",
+                match_keys,
+            )
+            _insert_from_values(
+                cur,
+                f"INSERT INTO {RAW_MATCHES_FQN} (FILE_KEY, COMPETITION_CODE, DATE_FROM, DATE_TO, RUN_ID, DT, PAYLOAD)",
+                "column1, column2, column3::DATE, column4::DATE, column5, column6::DATE, PARSE_JSON(column7)",
+                match_rows,
+                max_statement_bytes,
+            )
+
+            if manifest_rows:
+                manifest_keys = [row[0] for row in manifest_rows]
+                cur.execute(
+                    f"DELETE FROM {RAW_MANIFESTS_FQN} WHERE FILE_KEY IN ({', '.join(['%s'] * len(manifest_keys))})",
+                    manifest_keys,
+                )
+                _insert_from_values(
+                    cur,
+                    f"INSERT INTO {RAW_MANIFESTS_FQN} (FILE_KEY, ENDPOINT, RUN_ID, DT, MANIFEST)",
+                    "column1, column2, column3, column4::DATE, PARSE_JSON(column5)",
+                    manifest_rows,
+                    max_statement_bytes,
+                )
+
+            mark_loaded_many(load_state_entries, conn=conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    METRICS.add_bytes("snowflake_write", sum(len(row[-1]) for row in match_rows + manifest_rows))
+
+    logger.info(f"Upserted batch: data_files={len(match_rows)}, manifests={len(manifest_rows)}")
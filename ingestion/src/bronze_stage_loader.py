@@ -0,0 +1,202 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Any, Optional
+
+from .bronze_keys import manifest_key_for, parse_key
+from .bronze_snowflake_loader import RAW_MANIFESTS_FQN, RAW_MATCHES_FQN
+from .config import BRONZE_COPY_GZIP, BRONZE_COPY_STAGE
+from .load_state import mark_loaded_many
+from .logger import get_logger
+from .metrics import METRICS
+from .minio_reader import stream_object_to
+from .snowflake_pool import borrow_connection
+
+logger = get_logger("bronze_stage_loader")
+
+
+class SnowflakeStage:
+    """
+    Snowflake internal stage (the RAW_MATCHES table stage by default).
+    Files are uploaded with PUT and removed again by COPY ... PURGE = TRUE.
+    """
+
+    def __init__(self, location: str = BRONZE_COPY_STAGE):
+        self.location = location.rstrip("/")
+
+    def put(self, cur, local_path: str) -> None:
+        cur.execute(f"PUT 'file://{local_path}' {self.location} AUTO_COMPRESS = FALSE OVERWRITE = TRUE")
+
+
+class LocalFileStage:
+    """
+    Stage stand-in for local checks: PUT copies the staged NDJSON files into a directory, and
+    LocalSnowflake runs the COPY INTO statements against it, so copy mode works without Snowflake.
+    """
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.location = f"file://{os.path.abspath(directory)}"
+
+    def put(self, cur, local_path: str) -> None:
+        shutil.copy(local_path, self.directory)
+
+
+def default_stage() -> Any:
+    """
+    Stage named by BRONZE_COPY_STAGE: a file://<dir> location is a LocalFileStage (LocalSnowflake runs
+    its COPY INTO), anything else a Snowflake stage.
+    """
+    if BRONZE_COPY_STAGE.startswith("file://"):
+        return LocalFileStage(BRONZE_COPY_STAGE[len("file://"):])
+    return SnowflakeStage()
+
+
+def _write_record(out, meta: dict, field: str, key: str) -> int:
+    """
+    Write one NDJSON line: the metadata object with the raw object bytes spliced in as `field`.
+    The object body is streamed as-is; it is never parsed or re-serialized.
+    """
+    head = json.dumps(meta)[:-1] + f', "{field}": '
+    out.write(head.encode("utf-8"))
+    written = stream_object_to(key, out, single_line=True)
+    out.write(b"}\n")
+    return written
+
+
+def _copy_into(cur, table_fqn: str, columns: str, select_sql: str, stage: Any, file_name: str, compress: bool) -> None:
+    cur.execute(
+        f"""
+        COPY INTO {table_fqn} ({columns})
+        FROM (SELECT {select_sql} FROM {stage.location})
+        FILES = ('{file_name}')
+        FILE_FORMAT = (TYPE = JSON COMPRESSION = {"GZIP" if compress else "NONE"})
+        ON_ERROR = ABORT_STATEMENT
+        PURGE = TRUE
+        """
+    )
+
+
+def copy_match_files(
+    data_keys: list[str],
+    manifest_keys: set[str],
+    manifest_endpoint: str,
+    load_state_endpoint: str,
+    conn: Any = None,
+    stage: Optional[Any] = None,
+    compress: bool = BRONZE_COPY_GZIP,
+) -> tuple[int, int]:
+    """
+    Bulk-load matches files (and their manifests) with PUT + COPY INTO.
+
+    - raw object bytes are streamed unchanged into NDJSON stage files (optionally gzip), one line per object
+    - FILE_KEY/COMPETITION_CODE/DATE_FROM/DATE_TO/RUN_ID/DT come from parse_key()
+    - DELETE, both COPYs and the LOAD_STATE MERGE run in one transaction
+
+    Returns (data_files_loaded, manifests_loaded).
+    """
+    if not data_keys:
+        return 0, 0
+
+    stage = stage or default_stage()
+    suffix = ".ndjson.gz" if compress else ".ndjson"
+    opener = gzip.open if compress else open
+    batch_id = uuid.uuid4().hex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        matches_name = f"raw_matches_{batch_id}{suffix}"
+        manifests_name = f"raw_manifests_{batch_id}{suffix}"
+        matches_path = os.path.join(tmp, matches_name)
+        manifests_path = os.path.join(tmp, manifests_name)
+
+        staged_bytes = 0
+        with opener(matches_path, "wb") as out:
+            for key in data_keys:
+                run_id, dt, comp, date_from, date_to = parse_key(key)
+                meta = {
+                    "file_key": key,
+                    "competition_code": comp,
+                    "date_from": date_from,
+                    "date_to": date_to,
+                    "run_id": run_id,
+                    "dt": dt,
+                }
+                staged_bytes += _write_record(out, meta, "payload", key)
+
+        loaded_manifest_keys: list[str] = []
+        with opener(manifests_path, "wb") as out:
+            for key in data_keys:
+                manifest_key = manifest_key_for(key)
+                if manifest_key not in manifest_keys:
+                    logger.warning(f"Manifest missing for {key} (expected {manifest_key})")
+                    continue
+                run_id, dt, _, _, _ = parse_key(manifest_key)
+                meta = {"file_key": manifest_key, "run_id": run_id, "dt": dt}
+                staged_bytes += _write_record(out, meta, "manifest", manifest_key)
+                loaded_manifest_keys.append(manifest_key)
+
+        logger.info(
+            f"Staging {len(data_keys)} data files + {len(loaded_manifest_keys)} manifests "
+            f"({staged_bytes} raw bytes) to {stage.location}"
+        )
+
+        with borrow_connection(conn) as conn, METRICS.timer("snowflake_copy"):
+            cur = conn.cursor()
+            stage.put(cur, matches_path)
+            if loaded_manifest_keys:
+                stage.put(cur, manifests_path)
+            METRICS.add_bytes("snowflake_copy", os.path.getsize(matches_path) + (
+                os.path.getsize(manifests_path) if loaded_manifest_keys else 0
+            ))
+
+            cur.execute("BEGIN")
+            try:
+                cur.execute(
+                    f"DELETE FROM {RAW_MATCHES_FQN} WHERE FILE_KEY IN ({', '.join(['%s'] * len(data_keys))})",
+                    list(data_keys),
+                )
+                _copy_into(
+                    cur,
+                    RAW_MATCHES_FQN,
+                    "FILE_KEY, COMPETITION_CODE, DATE_FROM, DATE_TO, RUN_ID, DT, PAYLOAD",
+                    "$1:file_key::string, $1:competition_code::string, $1:date_from::date, "
+                    "$1:date_to::date, $1:run_id::string, $1:dt::date, $1:payload",
+                    stage,
+                    matches_name,
+                    compress,
+                )
+
+                if loaded_manifest_keys:
+                    cur.execute(
+                        f"DELETE FROM {RAW_MANIFESTS_FQN} WHERE FILE_KEY IN ({', '.join(['%s'] * len(loaded_manifest_keys))})",
+                        loaded_manifest_keys,
+                    )
+                    # Prefer the manifest's own endpoint/run_id/dt_partition; fall back to the key
+                    _copy_into(
+                        cur,
+                        RAW_MANIFESTS_FQN,
+                        "FILE_KEY, ENDPOINT, RUN_ID, DT, MANIFEST",
+                        f"$1:file_key::string, coalesce($1:manifest:endpoint::string, '{manifest_endpoint}'), "
+                        "coalesce($1:manifest:run_id::string, $1:run_id::string), "
+                        "coalesce($1:manifest:dt_partition::string, $1:dt::string)::date, $1:manifest",
+                        stage,
+                        manifests_name,
+                        compress,
+                    )
+
+                mark_loaded_many(
+                    [(k, load_state_endpoint) for k in data_keys]
+                    + [(k, f"{load_state_endpoint}_manifest") for k in loaded_manifest_keys],
+                    conn=conn,
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    logger.info(f"Copied batch: data_files={len(data_keys)}, manifests={len(loaded_manifest_keys)}")
+    return len(data_keys), len(loaded_manifest_keys)
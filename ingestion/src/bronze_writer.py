@@ -1,17 +1,62 @@
+import hashlib
 import json
 from typing import Any
 
+from .bronze_formats import compress_bytes, encode_parquet, encoding_info, flatten_match
+from .bronze_keys import file_meta
+from .metrics import METRICS
 from .minio_client import get_s3_client
-from .config import MINIO_BRONZE_BUCKET
+from .config import BRONZE_ENCODING, BRONZE_PARQUET, MINIO_BRONZE_BUCKET
 
 def put_json(bucket: str, key: str, payload: Any) -> None:
     s3 = get_s3_client()
-    s3.put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=json.dumps(payload).encode("utf-8"),
-        ContentType="application/json",
-    )
+    body = json.dumps(payload).encode("utf-8")
+    with METRICS.timer("minio_put"):
+        s3.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=body,
+            ContentType="application/json",
+        )
+    METRICS.add_bytes("minio_put", len(body))
 
 def put_bronze_json(key: str, payload: Any) -> None:
-    put_json(MINIO_BRONZE_BUCKET, key, payload)
\ No newline at end of file
+    put_json(MINIO_BRONZE_BUCKET, key, payload)
+
+def put_bronze_payload(data_key: str, payload: Any, codec: str = BRONZE_ENCODING, parquet: bool = BRONZE_PARQUET) -> dict:
+    """
+    Write a raw API payload under `data_key` with the bronze codec (key keeps its .json suffix;
+    readers detect the codec from the bytes), plus an optional Parquet rendition with one
+    v_matches row per match next to it. Returns the manifest fields describing what was written.
+    """
+    s3 = get_s3_client()
+    raw = json.dumps(payload).encode("utf-8")
+    stored = compress_bytes(raw, codec)
+    extra = {"gzip": {"ContentEncoding": "gzip"}, "zstd": {"ContentEncoding": "zstd"}}.get(codec, {})
+    with METRICS.timer("minio_put"):
+        s3.put_object(
+            Bucket=MINIO_BRONZE_BUCKET,
+            Key=data_key,
+            Body=stored,
+            ContentType="application/json",
+            **extra,
+        )
+    METRICS.add_bytes("minio_put", len(stored))
+    info = {"encoding": encoding_info(len(raw), stored, codec)}
+
+    if parquet:
+        meta = file_meta(data_key)
+        rows = [flatten_match(m, meta) for m in payload.get("matches", [])]
+        data = encode_parquet(rows)
+        parquet_key = data_key.replace(".json", ".parquet")
+        with METRICS.timer("minio_put"):
+            s3.put_object(Bucket=MINIO_BRONZE_BUCKET, Key=parquet_key, Body=data, ContentType="application/vnd.apache.parquet")
+        METRICS.add_bytes("minio_put", len(data))
+        info["parquet"] = {
+            "key": parquet_key,
+            "rows": len(rows),
+            "bytes_stored": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }
+
+    return info
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Optional
+
+from .bronze_writer import put_bronze_json
+from .minio_reader import get_json_object_if_exists
+
+# Per-competition window state lives beside the bronze data, outside the endpoint=... prefixes the loaders list
+DIGEST_PREFIX = "_state/window_digests"
+
+# Backfill chunks of one run finish on several threads and share their competition's state object
+_state_lock = threading.Lock()
+
+
+def payload_digest(payload: Any) -> str:
+    """
+    sha256 of the payload's matches in canonical form (sorted keys, no whitespace).
+    Request echo fields such as `filters` are left out so only real match changes move the digest.
+    """
+    matches = payload.get("matches", []) if isinstance(payload, dict) else payload
+    canonical = json.dumps(matches, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def max_last_updated(payload: Any) -> Optional[str]:
+    values = [m.get("lastUpdated") for m in payload.get("matches", []) if m.get("lastUpdated")]
+    return max(values) if values else None
+
+
+def _match_date(match: dict) -> Optional[str]:
+    utc_date = match.get("utcDate")
+    return utc_date[:10] if utc_date else None
+
+
+def _match_map(payload: Any) -> dict[str, list]:
+    """
+    {match_id: [match date, lastUpdated]} for a payload's matches.
+    """
+    return {
+        str(m.get("id")): [_match_date(m), m.get("lastUpdated")]
+        for m in payload.get("matches", [])
+    }
+
+
+def _state_key(endpoint: str, competition: str) -> str:
+    return f"{DIGEST_PREFIX}/endpoint={endpoint}/competition={competition}.json"
+
+
+def load_window_state(endpoint: str, competition: str) -> Optional[dict]:
+    """
+    {"windows": [{date_from, date_to, sha256, data_key, ...}], "matches": {match_id: [date, lastUpdated]}}
+    for the windows last written for a competition, or None before the first write.
+    """
+    return get_json_object_if_exists(_state_key(endpoint, competition))
+
+
+def _covered_dates(windows: list[dict], date_from: str, date_to: str) -> set[str]:
+    """
+    Days of date_from..date_to that fall inside at least one stored window.
+    """
+    covered = set()
+    for window in windows:
+        start = max(date.fromisoformat(window["date_from"]), date.fromisoformat(date_from))
+        stop = min(date.fromisoformat(window["date_to"]), date.fromisoformat(date_to))
+        while start <= stop:
+            covered.add(start.isoformat())
+            start += timedelta(days=1)
+    return covered
+
+
+def check_window(endpoint: str, competition: str, date_from: str, date_to: str, payload: Any) -> tuple[bool, str, Optional[dict]]:
+    """
+    Compare a freshly fetched window with the competition's stored window state, match by match.
+
+    Windows need not line up with the stored ones (the daily window moves every day, backfill chunk
+    boundaries move with the adaptive chunker). The window is unchanged when every match on the days
+    it shares with the stored windows has the same lastUpdated, no stored match on those days is gone,
+    and the days it does not share hold no matches.
+    Returns (unchanged, digest, previous_window) where previous_window is the stored window that
+    overlaps it most (its data_key is the bronze object still holding these matches).
+    """
+    digest = payload_digest(payload)
+    state = load_window_state(endpoint, competition)
+    if not state or not state.get("windows"):
+        return False, digest, None
+
+    windows = state["windows"]
+    previous = max(
+        windows, key=lambda w: len(_covered_dates([w], date_from, date_to)) if w["date_to"] >= date_from else -1
+    )
+    if previous["date_from"] == date_from and previous["date_to"] == date_to and previous.get("sha256") == digest:
+        return True, digest, previous
+
+    covered = _covered_dates(windows, date_from, date_to)
+    if not covered:
+        return False, digest, None
+
+    stored = state.get("matches", {})
+    current = _match_map(payload)
+    for match_id, (match_date, last_updated) in current.items():
+        if match_date not in covered:
+            return False, digest, previous
+        seen = stored.get(match_id)
+        if seen is None or seen[1] is None or seen[1] != last_updated:
+            return False, digest, previous
+
+    for match_id, (match_date, _) in stored.items():
+        if match_date in covered and match_id not in current:
+            return False, digest, previous
+
+    return True, digest, previous
+
+
+def save_window_state(
+    endpoint: str, competition: str, date_from: str, date_to: str, digest: str, payload: Any, data_key: str,
+    accumulate: bool = False,
+) -> None:
+    """
+    Record a window as the competition's latest state.
+
+    With accumulate=False (incremental) the window replaces the stored state: one last window per
+    competition. With accumulate=True (backfill) it is merged in, replacing the stored windows and
+    matches on its days, so chunks with other boundaries can still be compared later.
+    """
+    window = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "sha256": digest,
+        "max_last_updated": max_last_updated(payload),
+        "record_count": len(payload.get("matches", [])),
+        "data_key": data_key,
+        "updated_at_utc": datetime.now(timezone.utc).isoformat(),
+    }
+    matches = _match_map(payload)
+
+    with _state_lock:
+        state = (load_window_state(endpoint, competition) if accumulate else None) or {"windows": [], "matches": {}}
+        windows = [
+            w for w in state["windows"]
+            if not (w["date_from"] >= date_from and w["date_to"] <= date_to)
+        ]
+        stored = {
+            match_id: seen for match_id, seen in state["matches"].items()
+            if not (seen[0] and date_from <= seen[0] <= date_to)
+        }
+        stored.update(matches)
+        put_bronze_json(
+            _state_key(endpoint, competition),
+            {"windows": sorted(windows + [window], key=lambda w: w["date_from"]), "matches": stored},
+        )
@@ -5,12 +5,56 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
 
 FOOTBALL_DATA_API_TOKEN = os.getenv("FOOTBALL_DATA_API_TOKEN")
+FOOTBALL_DATA_BASE_URL = os.getenv("FOOTBALL_DATA_BASE_URL", "https://api.football-data.org/v4")
+# HTTP client used by the match ingestion: "sync" (requests) or "async" (aiohttp, AsyncFootballClient)
+FOOTBALL_DATA_HTTP_CLIENT = os.getenv("FOOTBALL_DATA_HTTP_CLIENT", "sync").strip().lower()
+# Plan quota (free tier: 10 requests/minute); shared by all ingestion threads in a process
+FOOTBALL_DATA_REQUESTS_PER_MINUTE = float(os.getenv("FOOTBALL_DATA_REQUESTS_PER_MINUTE", "10"))
+# Competitions fetched in parallel by the incremental ingestion
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "4"))
+# What to do with a window whose payload digest is unchanged: "skip" (write nothing) or "mark" (manifest only)
+INGEST_UNCHANGED_POLICY = os.getenv("INGEST_UNCHANGED_POLICY", "skip").strip().lower()
+# Also write an endpoint=matches_delta/ object holding only matches whose lastUpdated advanced
+INGEST_MATCH_DELTA = os.getenv("INGEST_MATCH_DELTA", "true").strip().lower() in ("1", "true", "yes")
+# How a missing match index is seeded: "none" (first delta = full window) or "silver" (SILVER.MATCHES_LATEST)
+INGEST_MATCH_INDEX_SEED = os.getenv("INGEST_MATCH_INDEX_SEED", "none").strip().lower()
 
 MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "http://localhost:9000")
 MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
 MINIO_BRONZE_BUCKET = os.getenv("MINIO_BRONZE_BUCKET", "football-bronze")
 MINIO_REGION = os.getenv("MINIO_REGION", "us-east-1")
+MINIO_MAX_POOL_CONNECTIONS = int(os.getenv("MINIO_MAX_POOL_CONNECTIONS", "16"))
+
+# Raw bronze payload codec ("json" = uncompressed, "gzip", "zstd"), plus an optional v_matches-shaped Parquet copy
+BRONZE_ENCODING = os.getenv("BRONZE_ENCODING", "json").strip().lower()
+BRONZE_PARQUET = os.getenv("BRONZE_PARQUET", "false").strip().lower() in ("1", "true", "yes")
+
+# Bronze -> Snowflake batching: files per transaction, bytes per multi-row statement
+BRONZE_LOAD_BATCH_SIZE = int(os.getenv("BRONZE_LOAD_BATCH_SIZE", "50"))
+BRONZE_LOAD_STATEMENT_MAX_BYTES = int(os.getenv("BRONZE_LOAD_STATEMENT_MAX_BYTES", str(8 * 1024 * 1024)))
+
+# BRONZE_LOAD_MODE=batch binds payloads into INSERTs; =copy streams raw bytes to a stage + COPY INTO
+# BRONZE_COPY_STAGE=file://<dir> stages into a local directory (LocalFileStage, for LocalSnowflake)
+BRONZE_LOAD_MODE = os.getenv("BRONZE_LOAD_MODE", "batch").strip().lower()
+BRONZE_COPY_STAGE = os.getenv("BRONZE_COPY_STAGE", "@FOOTBALL_DB.BRONZE.%RAW_MATCHES")
+BRONZE_COPY_GZIP = os.getenv("BRONZE_COPY_GZIP", "true").strip().lower() in ("1", "true", "yes")
+
+# Loader prefetch: MinIO fetch threads, and how many decoded files may wait for the writer
+LOADER_FETCH_WORKERS = int(os.getenv("LOADER_FETCH_WORKERS", "8"))
+LOADER_MAX_INFLIGHT = int(os.getenv("LOADER_MAX_INFLIGHT", "16"))
+# Batch loader payload handling: "passthrough" (raw text to PARSE_JSON) or "decode" (json.loads + json.dumps)
+LOADER_PAYLOAD_MODE = os.getenv("LOADER_PAYLOAD_MODE", "passthrough").strip().lower()
+# Incremental loader discovery: "watermark" (only dt partitions near the last load) or "full" reconcile
+LOADER_DISCOVERY_MODE = os.getenv("LOADER_DISCOVERY_MODE", "watermark").strip().lower()
+LOADER_WATERMARK_LOOKBACK_DAYS = int(os.getenv("LOADER_WATERMARK_LOOKBACK_DAYS", "2"))
+# Which bronze objects the incremental loader picks up: "full" window payloads or "delta" changed matches
+INCREMENTAL_LOAD_SOURCE = os.getenv("INCREMENTAL_LOAD_SOURCE", "full").strip().lower()
+
+# Stage metrics: OpenMetrics textfile written at the end of each run, and/or a live /metrics port (0 = off)
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "").strip()
+METRICS_HTTP_PORT = int(os.getenv("METRICS_HTTP_PORT", "0"))
+METRICS_HTTP_HOST = os.getenv("METRICS_HTTP_HOST", "0.0.0.0").strip()
 
 missing = []
 for k, v in {
@@ -22,4 +66,28 @@ for k, v in {
         missing.append(k)
 
 if missing:
-    raise RuntimeError(f"Missing required env vars: {missing}")
\ No newline at end of file
+    raise RuntimeError(f"Missing required env vars: {missing}")
+
+if FOOTBALL_DATA_HTTP_CLIENT not in ("sync", "async"):
+    raise RuntimeError(f"FOOTBALL_DATA_HTTP_CLIENT must be 'sync' or 'async', got {FOOTBALL_DATA_HTTP_CLIENT!r}")
+
+if INGEST_UNCHANGED_POLICY not in ("skip", "mark"):
+    raise RuntimeError(f"INGEST_UNCHANGED_POLICY must be 'skip' or 'mark', got {INGEST_UNCHANGED_POLICY!r}")
+
+if INGEST_MATCH_INDEX_SEED not in ("none", "silver"):
+    raise RuntimeError(f"INGEST_MATCH_INDEX_SEED must be 'none' or 'silver', got {INGEST_MATCH_INDEX_SEED!r}")
+
+if LOADER_PAYLOAD_MODE not in ("decode", "passthrough"):
+    raise RuntimeError(f"LOADER_PAYLOAD_MODE must be 'decode' or 'passthrough', got {LOADER_PAYLOAD_MODE!r}")
+
+if LOADER_DISCOVERY_MODE not in ("watermark", "full"):
+    raise RuntimeError(f"LOADER_DISCOVERY_MODE must be 'watermark' or 'full', got {LOADER_DISCOVERY_MODE!r}")
+
+if INCREMENTAL_LOAD_SOURCE not in ("full", "delta"):
+    raise RuntimeError(f"INCREMENTAL_LOAD_SOURCE must be 'full' or 'delta', got {INCREMENTAL_LOAD_SOURCE!r}")
+
+if BRONZE_ENCODING not in ("json", "gzip", "zstd"):
+    raise RuntimeError(f"BRONZE_ENCODING must be 'json', 'gzip' or 'zstd', got {BRONZE_ENCODING!r}")
+
+if BRONZE_LOAD_MODE not in ("batch", "copy"):
+    raise RuntimeError(f"BRONZE_LOAD_MODE must be 'batch' or 'copy', got {BRONZE_LOAD_MODE!r}")
\ No newline at end of file
@@ -0,0 +1,311 @@
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from .logger import get_logger
+from .snowflake_pool import get_pool
+
+logger = get_logger("dbt_run_profile")
+
+MODEL_RUN_METRICS_FQN = "FOOTBALL_DB.OPS.DBT_MODEL_RUN_METRICS"
+MODEL_DAILY_VIEW_FQN = "FOOTBALL_DB.OPS.V_DBT_MODEL_DAILY"
+MODEL_COST_TREND_VIEW_FQN = "FOOTBALL_DB.OPS.V_DBT_MODEL_COST_TREND"
+
+# Trend view: the last RECENT_RUNS successful runs of a model against the BASELINE_RUNS before them.
+# A model is flagged when its time or bytes scanned grew COST_GROWTH_MARGIN times faster than its row count.
+RECENT_RUNS = 7
+BASELINE_RUNS = 28
+MIN_RUNS = 3
+COST_GROWTH_MARGIN = 1.25
+
+_COLUMNS = (
+    "INVOCATION_ID", "DAG_ID", "RUN_ID", "GENERATED_AT",
+    "MODEL_UNIQUE_ID", "MODEL_NAME", "RELATION_NAME", "STATUS",
+    "STARTED_AT", "COMPLETED_AT", "EXECUTION_TIME_SEC", "ROWS_AFFECTED", "QUERY_ID",
+    "BYTES_SCANNED", "ROWS_PRODUCED", "PARTITIONS_SCANNED", "PARTITIONS_TOTAL", "QUERY_ELAPSED_SEC", "WAREHOUSE_SIZE",
+    "TABLE_ROWS", "TABLE_BYTES",
+)
+
+
+def parse_run_results(path: str) -> tuple[dict, list[dict]]:
+    """
+    Read dbt's target/run_results.json. Returns (metadata, one row per model node) with timing and
+    the Snowflake adapter response (rows_affected, query_id of the model's main statement).
+    """
+    with open(path, encoding="utf-8") as f:
+        results = json.load(f)
+
+    metadata = results.get("metadata") or {}
+    rows = []
+    for result in results.get("results", []):
+        unique_id = result.get("unique_id") or ""
+        if not unique_id.startswith("model."):
+            continue
+
+        execute = next((t for t in result.get("timing") or [] if t.get("name") == "execute"), {})
+        adapter = result.get("adapter_response") or {}
+        rows.append({
+            "model_unique_id": unique_id,
+            "model_name": unique_id.split(".")[-1],
+            "relation_name": result.get("relation_name"),
+            "status": result.get("status"),
+            "started_at": execute.get("started_at"),
+            "completed_at": execute.get("completed_at"),
+            "execution_time_sec": result.get("execution_time"),
+            "rows_affected": adapter.get("rows_affected"),
+            "query_id": adapter.get("query_id"),
+        })
+    return metadata, rows
+
+
+def _split_relation(relation_name: Optional[str]) -> Optional[tuple[str, str, str]]:
+    """
+    'FOOTBALL_DB.SILVER.matches_latest' -> ('FOOTBALL_DB', 'SILVER', 'MATCHES_LATEST'); quoted parts keep their case.
+    """
+    if not relation_name:
+        return None
+    parts = [p[1:-1] if p.startswith('"') else p.upper() for p in relation_name.split(".")]
+    return tuple(parts) if len(parts) == 3 else None
+
+
+def _history_since(rows: list[dict]) -> Optional[str]:
+    """
+    Lower bound for QUERY_HISTORY's END_TIME_RANGE_START: an hour before the first model started.
+    """
+    started = [r["started_at"] for r in rows if r["started_at"]]
+    if not started:
+        return None
+    return (datetime.fromisoformat(min(started).replace("Z", "+00:00")) - timedelta(hours=1)).isoformat()
+
+
+def fetch_query_stats(cur, query_ids: list[str], since: str) -> dict[str, dict]:
+    """
+    Bytes scanned, rows produced and pruning for the models' statements, from INFORMATION_SCHEMA.QUERY_HISTORY
+    (this user's queries, last 7 days, no ACCOUNT_USAGE latency).
+    """
+    if not query_ids:
+        return {}
+    cur.execute(
+        f"""
+        SELECT QUERY_ID, BYTES_SCANNED, ROWS_PRODUCED, PARTITIONS_SCANNED, PARTITIONS_TOTAL,
+               TOTAL_ELAPSED_TIME / 1000.0, WAREHOUSE_SIZE
+        FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY(
+          END_TIME_RANGE_START => %s::TIMESTAMP_LTZ,
+          RESULT_LIMIT => 10000
+        ))
+        WHERE QUERY_ID IN ({", ".join(["%s"] * len(query_ids))})
+        """,
+        [since, *query_ids],
+    )
+    return {
+        row[0]: {
+            "bytes_scanned": row[1],
+            "rows_produced": row[2],
+            "partitions_scanned": row[3],
+            "partitions_total": row[4],
+            "query_elapsed_sec": float(row[5]) if row[5] is not None else None,
+            "warehouse_size": row[6],
+        }
+        for row in cur.fetchall()
+    }
+
+
+def fetch_table_stats(cur, relations: list[tuple[str, str, str]]) -> dict[tuple[str, str, str], dict]:
+    """
+    Current ROW_COUNT / BYTES of the models' tables (views have neither), the volume the trend view compares against.
+    """
+    stats: dict[tuple[str, str, str], dict] = {}
+    for database in sorted({r[0] for r in relations}):
+        schemas = sorted({r[1] for r in relations if r[0] == database})
+        cur.execute(
+            f"""
+            SELECT TABLE_SCHEMA, TABLE_NAME, ROW_COUNT, BYTES
+            FROM {database}.INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA IN ({", ".join(["%s"] * len(schemas))})
+            """,
+            schemas,
+        )
+        for schema, name, row_count, size in cur.fetchall():
+            stats[(database, schema, name)] = {"table_rows": row_count, "table_bytes": size}
+    return stats
+
+
+def ensure_tables(cur) -> None:
+    cur.execute("CREATE SCHEMA IF NOT EXISTS FOOTBALL_DB.OPS")
+    cur.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {MODEL_RUN_METRICS_FQN} (
+          INVOCATION_ID STRING,
+          DAG_ID STRING,
+          RUN_ID STRING,
+          GENERATED_AT TIMESTAMP_TZ,
+
+          MODEL_UNIQUE_ID STRING,
+          MODEL_NAME STRING,
+          RELATION_NAME STRING,
+          STATUS STRING,
+
+          STARTED_AT TIMESTAMP_TZ,
+          COMPLETED_AT TIMESTAMP_TZ,
+          EXECUTION_TIME_SEC FLOAT,
+          ROWS_AFFECTED NUMBER,
+          QUERY_ID STRING,
+
+          BYTES_SCANNED NUMBER,
+          ROWS_PRODUCED NUMBER,
+          PARTITIONS_SCANNED NUMBER,
+          PARTITIONS_TOTAL NUMBER,
+          QUERY_ELAPSED_SEC FLOAT,
+          WAREHOUSE_SIZE STRING,
+
+          TABLE_ROWS NUMBER,
+          TABLE_BYTES NUMBER,
+
+          CREATED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+        )
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE OR REPLACE VIEW {MODEL_DAILY_VIEW_FQN} AS
+        SELECT
+          MODEL_NAME,
+          TO_DATE(COALESCE(STARTED_AT, GENERATED_AT)) AS RUN_DATE,
+          COUNT(*) AS RUNS,
+          AVG(EXECUTION_TIME_SEC) AS AVG_EXECUTION_TIME_SEC,
+          AVG(BYTES_SCANNED) AS AVG_BYTES_SCANNED,
+          SUM(ROWS_AFFECTED) AS ROWS_AFFECTED,
+          MAX(TABLE_ROWS) AS TABLE_ROWS,
+          AVG(EXECUTION_TIME_SEC) / NULLIF(MAX(TABLE_ROWS), 0) * 1e6 AS SEC_PER_MILLION_ROWS,
+          AVG(BYTES_SCANNED) / NULLIF(MAX(TABLE_ROWS), 0) AS BYTES_SCANNED_PER_ROW
+        FROM {MODEL_RUN_METRICS_FQN}
+        WHERE STATUS = 'success'
+        GROUP BY MODEL_NAME, TO_DATE(COALESCE(STARTED_AT, GENERATED_AT))
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE OR REPLACE VIEW {MODEL_COST_TREND_VIEW_FQN} AS
+        WITH ranked AS (
+          SELECT
+            *,
+            ROW_NUMBER() OVER (PARTITION BY MODEL_NAME ORDER BY COALESCE(STARTED_AT, GENERATED_AT) DESC) AS RN
+          FROM {MODEL_RUN_METRICS_FQN}
+          WHERE STATUS = 'success'
+        ),
+        windows AS (
+          SELECT
+            MODEL_NAME,
+            COUNT_IF(RN <= {RECENT_RUNS}) AS RECENT_RUNS,
+            COUNT_IF(RN > {RECENT_RUNS}) AS BASELINE_RUNS,
+            AVG(IFF(RN <= {RECENT_RUNS}, EXECUTION_TIME_SEC, NULL)) AS RECENT_EXECUTION_TIME_SEC,
+            AVG(IFF(RN > {RECENT_RUNS}, EXECUTION_TIME_SEC, NULL)) AS BASELINE_EXECUTION_TIME_SEC,
+            AVG(IFF(RN <= {RECENT_RUNS}, BYTES_SCANNED, NULL)) AS RECENT_BYTES_SCANNED,
+            AVG(IFF(RN > {RECENT_RUNS}, BYTES_SCANNED, NULL)) AS BASELINE_BYTES_SCANNED,
+            AVG(IFF(RN <= {RECENT_RUNS}, TABLE_ROWS, NULL)) AS RECENT_TABLE_ROWS,
+            AVG(IFF(RN > {RECENT_RUNS}, TABLE_ROWS, NULL)) AS BASELINE_TABLE_ROWS
+          FROM ranked
+          WHERE RN <= {RECENT_RUNS + BASELINE_RUNS}
+          GROUP BY MODEL_NAME
+        ),
+        growth AS (
+          SELECT
+            *,
+            RECENT_EXECUTION_TIME_SEC / NULLIF(BASELINE_EXECUTION_TIME_SEC, 0) AS TIME_GROWTH,
+            RECENT_BYTES_SCANNED / NULLIF(BASELINE_BYTES_SCANNED, 0) AS BYTES_SCANNED_GROWTH,
+            RECENT_TABLE_ROWS / NULLIF(BASELINE_TABLE_ROWS, 0) AS VOLUME_GROWTH
+          FROM windows
+        )
+        SELECT
+          *,
+          RECENT_RUNS >= {MIN_RUNS}
+            AND BASELINE_RUNS >= {MIN_RUNS}
+            AND (
+              TIME_GROWTH > VOLUME_GROWTH * {COST_GROWTH_MARGIN}
+              OR BYTES_SCANNED_GROWTH > VOLUME_GROWTH * {COST_GROWTH_MARGIN}
+            ) AS COST_OUTPACES_VOLUME
+        FROM growth
+        """
+    )
+
+
+def write_model_metrics(conn, metadata: dict, rows: list[dict], dag_id: Optional[str], run_id: Optional[str]) -> None:
+    """
+    Replace this invocation's rows in DBT_MODEL_RUN_METRICS (a retried task never double counts).
+    """
+    invocation_id = metadata.get("invocation_id")
+    cur = conn.cursor()
+    ensure_tables(cur)
+    cur.execute("BEGIN")
+    try:
+        cur.execute(f"DELETE FROM {MODEL_RUN_METRICS_FQN} WHERE INVOCATION_ID = %s", (invocation_id,))
+        if rows:
+            cur.executemany(
+                f"INSERT INTO {MODEL_RUN_METRICS_FQN} ({', '.join(_COLUMNS)}) VALUES ({', '.join(['%s'] * len(_COLUMNS))})",
+                [
+                    (invocation_id, dag_id, run_id, metadata.get("generated_at"))
+                    + tuple(row.get(column.lower()) for column in _COLUMNS[4:])
+                    for row in rows
+                ],
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store per-model dbt timings, rows and bytes scanned in OPS")
+    parser.add_argument("--run-results", default=os.path.join("dbt", "football_dbt", "target", "run_results.json"))
+    parser.add_argument("--dag-id")
+    parser.add_argument("--run-id")
+    parser.add_argument("--no-query-history", action="store_true", help="Skip bytes scanned / table sizes")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and print only, no Snowflake")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.run_results):
+        # dbt failed before writing results; nothing to profile
+        logger.warning(f"No run results at {args.run_results}")
+        print(json.dumps({"invocation_id": None, "models": 0}))
+        return
+
+    metadata, rows = parse_run_results(args.run_results)
+    logger.info(f"Parsed {len(rows)} model results from invocation {metadata.get('invocation_id')}")
+
+    query_history = False
+    if not args.dry_run:
+        with get_pool().connection() as conn:
+            if not args.no_query_history:
+                cur = conn.cursor()
+                try:
+                    since = _history_since(rows)
+                    queries = fetch_query_stats(cur, [r["query_id"] for r in rows if r["query_id"]], since) if since else {}
+                    relations = {r["model_unique_id"]: _split_relation(r["relation_name"]) for r in rows}
+                    tables = fetch_table_stats(cur, [rel for rel in relations.values() if rel])
+                    for row in rows:
+                        row.update(queries.get(row["query_id"], {}))
+                        row.update(tables.get(relations[row["model_unique_id"]], {}))
+                    query_history = True
+                except Exception as e:
+                    # Warehouse stats are best effort: timings and rows_affected are still stored
+                    logger.warning(f"Query history unavailable, storing run_results only: {e}")
+            write_model_metrics(conn, metadata, rows, args.dag_id, args.run_id)
+        logger.info(f"Wrote {len(rows)} rows to {MODEL_RUN_METRICS_FQN}")
+
+    slowest = sorted(rows, key=lambda r: r["execution_time_sec"] or 0, reverse=True)[:3]
+
+    # Print summary JSON as last line (Airflow XCom-safe)
+    print(json.dumps({
+        "invocation_id": metadata.get("invocation_id"),
+        "models": len(rows),
+        "models_failed": sum(1 for r in rows if r["status"] not in ("success", "skipped")),
+        "total_execution_sec": round(sum(r["execution_time_sec"] or 0 for r in rows), 3),
+        "slowest": [{"model": r["model_name"], "seconds": r["execution_time_sec"]} for r in slowest],
+        "query_history": query_history,
+    }))
+
+
+if __name__ == "__main__":
+    main()
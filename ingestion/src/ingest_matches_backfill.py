@@ -1,13 +1,20 @@
+import asyncio
+import json
 import os
 import uuid
-from datetime import datetime, timezone, timedelta, date
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone, date
 
 from dotenv import load_dotenv
 
 from .api_client import get_json
-from .bronze_writer import put_bronze_json
-from .config import MINIO_BRONZE_BUCKET
+from .backfill_checkpoint import BackfillCheckpoint
+from .backfill_chunker import AdaptiveChunker
+from .bronze_writer import put_bronze_json, put_bronze_payload
+from .change_detector import check_window, save_window_state
+from .config import FOOTBALL_DATA_HTTP_CLIENT, INGEST_UNCHANGED_POLICY, MINIO_BRONZE_BUCKET
 from .logger import get_logger
+from .metrics import export_metrics, start_metrics
 
 logger = get_logger("ingest_matches_backfill")
 
@@ -34,65 +41,217 @@ def _load_env():
     return comp, start_d, end_d, chunk_days
 
 
-def main():
-    competition, start_d, end_d, chunk_days = _load_env()
+def _build_chunker(start_d: date, end_d: date, chunk_days: int, skip: list[tuple[str, str]]) -> AdaptiveChunker:
+    """
+    BACKFILL_CHUNK_DAYS is the starting window; with BACKFILL_ADAPTIVE (default true) it then
+    grows on sparse chunks and shrinks when a chunk exceeds the match-count or payload-size budget.
+    """
+    adaptive = os.getenv("BACKFILL_ADAPTIVE", "true").strip().lower() in ("1", "true", "yes")
+    max_days = int(os.getenv("BACKFILL_MAX_CHUNK_DAYS", "60"))
+    target_matches = int(os.getenv("BACKFILL_TARGET_MATCHES", "200"))
+    max_payload_bytes = int(os.getenv("BACKFILL_MAX_PAYLOAD_BYTES", str(4 * 1024 * 1024)))
 
-    run_id = str(uuid.uuid4())
-    now_utc = datetime.now(timezone.utc)
-    dt_partition = now_utc.strftime("%Y-%m-%d")
+    if max_days < 1 or max_days > 60:
+        raise RuntimeError("BACKFILL_MAX_CHUNK_DAYS should be between 1 and 60")
+    if target_matches < 1 or max_payload_bytes < 1:
+        raise RuntimeError("BACKFILL_TARGET_MATCHES and BACKFILL_MAX_PAYLOAD_BYTES must be >= 1")
+
+    return AdaptiveChunker(
+        start_d,
+        end_d,
+        initial_days=chunk_days,
+        max_days=max_days if adaptive else chunk_days,
+        target_matches=target_matches,
+        max_payload_bytes=max_payload_bytes,
+        adaptive=adaptive,
+        skip=skip,
+    )
+
+
+def _payload_bytes(payload: dict) -> int:
+    return len(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+def _write_chunk(
+    competition: str, date_from: str, date_to: str, payload: dict, run_id: str, dt_partition: str, fetched_at_utc: str
+) -> tuple[int, bool]:
+    """
+    Write one chunk's payload + manifest to bronze. Returns (match_count, written);
+    a chunk whose matches are all unchanged since an earlier backfill is not written again.
+    """
+    match_count = len(payload.get("matches", []))
+
+    data_key = (
+        f"endpoint=matches_backfill/"
+        f"competition={competition}/"
+        f"dateFrom={date_from}/"
+        f"dateTo={date_to}/"
+        f"dt={dt_partition}/"
+        f"run_id={run_id}.json"
+    )
+    manifest_key = data_key.replace(".json", ".manifest.json")
+
+    unchanged, digest, previous = check_window("matches_backfill", competition, date_from, date_to, payload)
+
+    manifest = {
+        "run_id": run_id,
+        "endpoint": "matches_backfill",
+        "competition": competition,
+        "params": {"dateFrom": date_from, "dateTo": date_to},
+        "dt_partition": dt_partition,
+        "fetched_at_utc": fetched_at_utc,
+        "record_count": match_count,
+        "payload_sha256": digest,
+        "bucket": MINIO_BRONZE_BUCKET,
+        "data_key": data_key,
+    }
+
+    if unchanged:
+        if INGEST_UNCHANGED_POLICY == "mark":
+            manifest.update({"unchanged": True, "data_key": None, "previous_data_key": previous.get("data_key")})
+            put_bronze_json(manifest_key, manifest)
+        if (previous["date_from"], previous["date_to"]) != (date_from, date_to):
+            save_window_state(
+                "matches_backfill", competition, date_from, date_to, digest, payload, previous.get("data_key"),
+                accumulate=True,
+            )
+        return match_count, False
+
+    manifest.update(put_bronze_payload(data_key, payload))
+    put_bronze_json(manifest_key, manifest)
+    save_window_state("matches_backfill", competition, date_from, date_to, digest, payload, data_key, accumulate=True)
+    return match_count, True
 
-    logger.info(f"Backfill competition={competition}, range={start_d}..{end_d}, chunk_days={chunk_days}")
 
-    cur = start_d
+def _fetch_and_write(
+    competition: str, chunker: AdaptiveChunker, checkpoint: BackfillCheckpoint, date_from: str, date_to: str,
+    fetched_at_utc: str,
+) -> tuple[int, bool]:
+    payload = get_json(
+        path=f"/competitions/{competition}/matches",
+        params={"dateFrom": date_from, "dateTo": date_to},
+    )
+    chunker.record(date_from, date_to, len(payload.get("matches", [])), _payload_bytes(payload))
+    match_count, written = _write_chunk(
+        competition, date_from, date_to, payload, checkpoint.run_id, checkpoint.dt_partition, fetched_at_utc
+    )
+    checkpoint.mark_done(date_from, date_to, match_count, written)
+    return match_count, written
+
+
+def _backfill_threads(
+    competition: str, chunker: AdaptiveChunker, checkpoint: BackfillCheckpoint, workers: int, fetched_at_utc: str
+) -> int:
+    """
+    Keep up to `workers` chunks in flight; each new window is sized from the chunks finished so far.
+    API calls are paced by the shared token bucket. Returns the number of chunks fetched.
+    """
     chunk_num = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        inflight = {}
+        while True:
+            while len(inflight) < workers:
+                window = chunker.next_window()
+                if window is None:
+                    break
+                chunk_num += 1
+                logger.info(f"[{chunk_num}] Fetching chunk dateFrom={window[0]} dateTo={window[1]}")
+                future = pool.submit(
+                    _fetch_and_write, competition, chunker, checkpoint, window[0], window[1], fetched_at_utc
+                )
+                inflight[future] = window
 
-    while cur <= end_d:
-        chunk_num += 1
-        chunk_start = cur
-        chunk_end = min(cur + timedelta(days=chunk_days - 1), end_d)
+            if not inflight:
+                break
 
-        date_from = chunk_start.isoformat()
-        date_to = chunk_end.isoformat()
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in done:
+                date_from, date_to = inflight.pop(future)
+                match_count, written = future.result()
+                if written:
+                    logger.info(f"Saved chunk {date_from}..{date_to}: matches={match_count}")
+                else:
+                    logger.info(f"Unchanged since last backfill, skipped {date_from}..{date_to}: matches={match_count}")
+    return chunk_num
 
-        logger.info(f"[{chunk_num}] Fetching chunk dateFrom={date_from} dateTo={date_to}")
 
-        payload = get_json(
-            path=f"/competitions/{competition}/matches",
+async def _backfill_async(
+    competition: str, chunker: AdaptiveChunker, checkpoint: BackfillCheckpoint, workers: int, fetched_at_utc: str
+) -> int:
+    """
+    Async variant: up to `workers` chunks in flight over one keep-alive AsyncFootballClient,
+    with MinIO writes on worker threads. Returns the number of chunks fetched.
+    """
+    from .async_api_client import AsyncFootballClient
+
+    async def _one(client: AsyncFootballClient, date_from: str, date_to: str) -> tuple[int, bool]:
+        payload = await client.get_json(
+            f"/competitions/{competition}/matches",
             params={"dateFrom": date_from, "dateTo": date_to},
         )
+        chunker.record(date_from, date_to, len(payload.get("matches", [])), _payload_bytes(payload))
+        match_count, written = await asyncio.to_thread(
+            _write_chunk, competition, date_from, date_to, payload, checkpoint.run_id, checkpoint.dt_partition,
+            fetched_at_utc,
+        )
+        await asyncio.to_thread(checkpoint.mark_done, date_from, date_to, match_count, written)
+        return match_count, written
 
-        match_count = len(payload.get("matches", []))
+    chunk_num = 0
+    async with AsyncFootballClient(max_connections=workers) as client:
+        inflight = {}
+        while True:
+            while len(inflight) < workers:
+                window = chunker.next_window()
+                if window is None:
+                    break
+                chunk_num += 1
+                logger.info(f"[{chunk_num}] Fetching chunk dateFrom={window[0]} dateTo={window[1]}")
+                inflight[asyncio.create_task(_one(client, *window))] = window
 
-        data_key = (
-            f"endpoint=matches_backfill/"
-            f"competition={competition}/"
-            f"dateFrom={date_from}/"
-            f"dateTo={date_to}/"
-            f"dt={dt_partition}/"
-            f"run_id={run_id}.json"
-        )
+            if not inflight:
+                break
+
+            done, _ = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                date_from, date_to = inflight.pop(task)
+                if task.exception() is not None:
+                    # Let the other in-flight chunks finish and checkpoint, like the thread pool does
+                    await asyncio.gather(*inflight, return_exceptions=True)
+                match_count, written = task.result()
+                if written:
+                    logger.info(f"Saved chunk {date_from}..{date_to}: matches={match_count}")
+                else:
+                    logger.info(f"Unchanged since last backfill, skipped {date_from}..{date_to}: matches={match_count}")
+    return chunk_num
+
+
+def main():
+    start_metrics()
+    competition, start_d, end_d, chunk_days = _load_env()
+    workers = max(1, int(os.getenv("BACKFILL_MAX_WORKERS", "2")))
+
+    now_utc = datetime.now(timezone.utc)
 
-        put_bronze_json(data_key, payload)
+    # A retry of the same job (same competition + range) resumes under the original run_id
+    job_id = os.getenv("BACKFILL_JOB_ID") or f"{competition}_{start_d}_{end_d}"
+    checkpoint = BackfillCheckpoint.load_or_start(job_id, str(uuid.uuid4()), now_utc.strftime("%Y-%m-%d"))
+    chunker = _build_chunker(start_d, end_d, chunk_days, skip=checkpoint.completed_ranges)
 
-        manifest_key = data_key.replace(".json", ".manifest.json")
-        manifest = {
-            "run_id": run_id,
-            "endpoint": "matches_backfill",
-            "competition": competition,
-            "params": {"dateFrom": date_from, "dateTo": date_to},
-            "dt_partition": dt_partition,
-            "fetched_at_utc": now_utc.isoformat(),
-            "record_count": match_count,
-            "bucket": MINIO_BRONZE_BUCKET,
-            "data_key": data_key,
-        }
-        put_bronze_json(manifest_key, manifest)
+    logger.info(
+        f"Backfill competition={competition}, range={start_d}..{end_d}, chunk_days={chunk_days}, "
+        f"adaptive={chunker.adaptive}, workers={workers}, job={job_id}, run_id={checkpoint.run_id}"
+    )
 
-        logger.info(f"[{chunk_num}] Saved chunk: matches={match_count}")
-        cur = chunk_end + timedelta(days=1)
+    if FOOTBALL_DATA_HTTP_CLIENT == "async":
+        chunks = asyncio.run(_backfill_async(competition, chunker, checkpoint, workers, now_utc.isoformat()))
+    else:
+        chunks = _backfill_threads(competition, chunker, checkpoint, workers, now_utc.isoformat())
 
-    logger.info("✅ Backfill ingestion complete.")
+    checkpoint.finish()
+    logger.info(f"✅ Backfill ingestion complete: chunks={chunks}, resumed_chunks={len(checkpoint.completed_ranges) - chunks}")
+    logger.info(f"Stage metrics: {json.dumps(export_metrics())}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
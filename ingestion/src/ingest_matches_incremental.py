@@ -1,15 +1,29 @@
 # ingestion/src/ingest_matches_incremental.py
 
+import argparse
+import asyncio
+import json
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 
 from dotenv import load_dotenv
 
 from .api_client import get_json
-from .bronze_writer import put_bronze_json
-from .config import MINIO_BRONZE_BUCKET
+from .bronze_writer import put_bronze_json, put_bronze_payload
+from .change_detector import check_window, save_window_state
+from .config import (
+    FOOTBALL_DATA_HTTP_CLIENT,
+    INGEST_MATCH_DELTA,
+    INGEST_MATCH_INDEX_SEED,
+    INGEST_MAX_WORKERS,
+    INGEST_UNCHANGED_POLICY,
+    MINIO_BRONZE_BUCKET,
+)
 from .logger import get_logger
+from .metrics import export_metrics, start_metrics
+from .match_index import extract_changed_matches, load_match_index, save_match_index
 
 logger = get_logger("ingest_matches_incremental")
 
@@ -26,7 +40,165 @@ def _load_targets() -> list[str]:
     return [x.strip() for x in raw.split(",") if x.strip()]
 
 
+def _write_competition_window(
+    code: str, payload: dict, run_id: str, date_from: str, date_to: str, dt_partition: str, fetched_at_utc: str
+) -> bool:
+    """
+    Write one competition's window payload + manifest to bronze.
+    Returns False (and writes no data object) when every match in the window is unchanged since the last run.
+    """
+    match_count = len(payload.get("matches", []))
+
+    # Bronze path (partitioned)
+    data_key = (
+        f"endpoint=matches/"
+        f"competition={code}/"
+        f"dateFrom={date_from}/"
+        f"dateTo={date_to}/"
+        f"dt={dt_partition}/"
+        f"run_id={run_id}.json"
+    )
+    manifest_key = data_key.replace(".json", ".manifest.json")
+
+    unchanged, digest, previous = check_window("matches", code, date_from, date_to, payload)
+
+    manifest = {
+        "run_id": run_id,
+        "endpoint": "matches",
+        "competition": code,
+        "params": {"dateFrom": date_from, "dateTo": date_to},
+        "dt_partition": dt_partition,
+        "fetched_at_utc": fetched_at_utc,
+        "record_count": match_count,
+        "payload_sha256": digest,
+        "bucket": MINIO_BRONZE_BUCKET,
+        "data_key": data_key,
+    }
+
+    if unchanged:
+        logger.info(f"Unchanged payload for competition={code} (sha256={digest[:12]}), policy={INGEST_UNCHANGED_POLICY}")
+        if INGEST_UNCHANGED_POLICY == "mark":
+            # Manifest only: there is no data object, so loaders and matches_latest never see the duplicate
+            manifest.update({"unchanged": True, "data_key": None, "previous_data_key": previous.get("data_key")})
+            put_bronze_json(manifest_key, manifest)
+        if (previous["date_from"], previous["date_to"]) != (date_from, date_to):
+            # Move the stored window along with the daily one; its matches still live in the previous object
+            save_window_state("matches", code, date_from, date_to, digest, payload, previous.get("data_key"))
+        return False
+
+    # 1) Write raw payload (codec / sizes / checksum go into the manifest)
+    manifest.update(put_bronze_payload(data_key, payload))
+    logger.info(f"Saved {match_count} matches to s3://{MINIO_BRONZE_BUCKET}/{data_key}")
+
+    # 2) Write manifest next to it
+    put_bronze_json(manifest_key, manifest)
+    logger.info(f"Wrote manifest to s3://{MINIO_BRONZE_BUCKET}/{manifest_key}")
+
+    # 3) Changed-matches delta
+    if INGEST_MATCH_DELTA:
+        _write_match_delta(code, payload, run_id, date_from, date_to, dt_partition, fetched_at_utc, data_key)
+
+    # 4) Remember the window only once the data is safely in bronze
+    save_window_state("matches", code, date_from, date_to, digest, payload, data_key)
+    return True
+
+
+def _write_match_delta(
+    code: str, payload: dict, run_id: str, date_from: str, date_to: str, dt_partition: str, fetched_at_utc: str,
+    data_key: str,
+) -> int:
+    """
+    Write only the matches whose lastUpdated advanced since the last run, next to the full payload
+    under endpoint=matches_delta/. Returns the number of changed matches (0 = no delta object written).
+    """
+    index = load_match_index(code, seed=INGEST_MATCH_INDEX_SEED)
+    changed = extract_changed_matches(payload, index)
+
+    logger.info(f"Match delta for competition={code}: {len(changed)}/{len(payload.get('matches', []))} changed")
+    if not changed:
+        return 0
+
+    delta_key = data_key.replace("endpoint=matches/", "endpoint=matches_delta/", 1)
+    delta_manifest_key = delta_key.replace(".json", ".manifest.json")
+
+    # Same shape as the API payload so RAW_MATCHES / v_matches read it unchanged
+    written = put_bronze_payload(delta_key, {**payload, "resultSet": {"count": len(changed)}, "matches": changed})
+    put_bronze_json(delta_manifest_key, {
+        "run_id": run_id,
+        "endpoint": "matches_delta",
+        "competition": code,
+        "params": {"dateFrom": date_from, "dateTo": date_to},
+        "dt_partition": dt_partition,
+        "fetched_at_utc": fetched_at_utc,
+        "record_count": len(changed),
+        "bucket": MINIO_BRONZE_BUCKET,
+        "data_key": delta_key,
+        "source_data_key": data_key,
+        **written,
+    })
+    logger.info(f"Saved {len(changed)} changed matches to s3://{MINIO_BRONZE_BUCKET}/{delta_key}")
+
+    # Advance the index only once the delta is in bronze; a failed write re-emits the same delta next run
+    save_match_index(code, index)
+    return len(changed)
+
+
+def _ingest_competition(code: str, run_id: str, date_from: str, date_to: str, dt_partition: str, fetched_at_utc: str) -> bool:
+    logger.info(f"Fetching matches for competition={code} ...")
+
+    payload = get_json(
+        path=f"/competitions/{code}/matches",
+        params={"dateFrom": date_from, "dateTo": date_to},
+    )
+    return _write_competition_window(code, payload, run_id, date_from, date_to, dt_partition, fetched_at_utc)
+
+
+async def _ingest_all_async(
+    targets: list[str], run_id: str, date_from: str, date_to: str, dt_partition: str, fetched_at_utc: str
+) -> tuple[dict[str, bool], list[str]]:
+    """
+    Async variant: one keep-alive AsyncFootballClient for every competition.
+    MinIO writes run on worker threads so they overlap with the remaining API calls.
+    Returns {code: changed} for successful competitions and the list of codes that failed.
+    """
+    from .async_api_client import AsyncFootballClient
+
+    semaphore = asyncio.Semaphore(max(1, INGEST_MAX_WORKERS))
+
+    async with AsyncFootballClient(max_connections=max(1, INGEST_MAX_WORKERS)) as client:
+        async def _one(code: str) -> bool:
+            async with semaphore:
+                logger.info(f"Fetching matches for competition={code} ...")
+                payload = await client.get_json(
+                    f"/competitions/{code}/matches",
+                    params={"dateFrom": date_from, "dateTo": date_to},
+                )
+            return await asyncio.to_thread(
+                _write_competition_window, code, payload, run_id, date_from, date_to, dt_partition, fetched_at_utc
+            )
+
+        results = await asyncio.gather(*(_one(code) for code in targets), return_exceptions=True)
+
+    changed: dict[str, bool] = {}
+    failed = []
+    for code, result in zip(targets, results):
+        if isinstance(result, Exception):
+            logger.error(f"Ingestion failed for competition={code}: {result}")
+            failed.append(code)
+        else:
+            changed[code] = result
+    return changed, failed
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Incremental matches ingestion into bronze")
+    parser.add_argument(
+        "--competition",
+        help="Ingest only this competition code (one Airflow mapped task per competition); default: TARGET_COMPETITION_CODES",
+    )
+    args = parser.parse_args()
+
+    start_metrics()
     run_id = str(uuid.uuid4())
     now_utc = datetime.now(timezone.utc)
 
@@ -35,53 +207,51 @@ def main():
     date_to = (now_utc + timedelta(days=7)).strftime("%Y-%m-%d")
     dt_partition = now_utc.strftime("%Y-%m-%d")
 
-    targets = _load_targets()
+    targets = [args.competition.strip()] if args.competition else _load_targets()
 
     logger.info(f"Targets: {targets}")
     logger.info(f"Window: dateFrom={date_from}, dateTo={date_to}")
 
-    for code in targets:
-        logger.info(f"Fetching matches for competition={code} ...")
-
-        payload = get_json(
-            path=f"/competitions/{code}/matches",
-            params={"dateFrom": date_from, "dateTo": date_to},
+    # Fan out competitions; API calls are paced by the shared token bucket,
+    # and one competition's MinIO writes overlap with the others' API calls.
+    changed: dict[str, bool] = {}
+    failed: list[str] = []
+    if FOOTBALL_DATA_HTTP_CLIENT == "async":
+        changed, failed = asyncio.run(
+            _ingest_all_async(targets, run_id, date_from, date_to, dt_partition, now_utc.isoformat())
         )
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(INGEST_MAX_WORKERS, len(targets)))) as pool:
+            futures = {
+                pool.submit(_ingest_competition, code, run_id, date_from, date_to, dt_partition, now_utc.isoformat()): code
+                for code in targets
+            }
+            for future in as_completed(futures):
+                code = futures[future]
+                try:
+                    changed[code] = future.result()
+                except Exception as e:
+                    logger.error(f"Ingestion failed for competition={code}: {e}")
+                    failed.append(code)
 
-        match_count = len(payload.get("matches", []))
+    if failed:
+        raise RuntimeError(f"Incremental ingestion failed for competitions: {sorted(failed)}")
 
-        # Bronze path (partitioned)
-        data_key = (
-            f"endpoint=matches/"
-            f"competition={code}/"
-            f"dateFrom={date_from}/"
-            f"dateTo={date_to}/"
-            f"dt={dt_partition}/"
-            f"run_id={run_id}.json"
-        )
+    windows_unchanged = sum(1 for c in changed.values() if not c)
+    logger.info(
+        f"✅ Incremental matches ingestion complete: windows_changed={len(changed) - windows_unchanged}, "
+        f"windows_unchanged={windows_unchanged}"
+    )
 
-        # 1) Write raw payload
-        put_bronze_json(data_key, payload)
-        logger.info(f"Saved {match_count} matches to s3://{MINIO_BRONZE_BUCKET}/{data_key}")
-
-        # 2) Write manifest next to it
-        manifest_key = data_key.replace(".json", ".manifest.json")
-        manifest = {
-            "run_id": run_id,
-            "endpoint": "matches",
-            "competition": code,
-            "params": {"dateFrom": date_from, "dateTo": date_to},
-            "dt_partition": dt_partition,
-            "fetched_at_utc": now_utc.isoformat(),
-            "record_count": match_count,
-            "bucket": MINIO_BRONZE_BUCKET,
-            "data_key": data_key,
-        }
-
-        put_bronze_json(manifest_key, manifest)
-        logger.info(f"Wrote manifest to s3://{MINIO_BRONZE_BUCKET}/{manifest_key}")
-
-    logger.info("✅ Incremental matches ingestion complete.")
+    # Print metrics JSON as last line (Airflow XCom-safe)
+    print(json.dumps({
+        "competitions": targets,
+        "windows_fetched": len(changed),
+        "windows_written": len(changed) - windows_unchanged,
+        "windows_unchanged": windows_unchanged,
+        "skip_rate": round(windows_unchanged / len(changed), 4) if changed else 0.0,
+        "stage_metrics": export_metrics(),
+    }))
 
 
 if __name__ == "__main__":
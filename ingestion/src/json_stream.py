@@ -0,0 +1,116 @@
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator
+
+try:
+    import ijson  # C-backed (yajl2_c) when available; pure-Python fallback below otherwise
+except ImportError:
+    ijson = None
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_array_items(fp: BinaryIO, key: str = "matches", chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Yield the elements of the top-level array `key` of a JSON object read from a binary stream
+    (e.g. an S3 response body), holding about one element in memory at a time.
+    Yields nothing if the object has no such key.
+    """
+    if ijson is not None:
+        yield from ijson.items(fp, f"{key}.item", use_float=True)
+        return
+    yield from _iter_array_items_py(fp, key, chunk_size)
+
+
+def _iter_array_items_py(fp: BinaryIO, key: str, chunk_size: int) -> Iterator[Any]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    raw_decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def _more() -> bool:
+        # Append the next chunk, dropping everything already consumed
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+            buf, pos = buf[pos:] + decoder.decode(b"", final=True), 0
+            return False
+        buf, pos = buf[pos:] + decoder.decode(chunk), 0
+        return True
+
+    def _peek() -> str:
+        while pos >= len(buf):
+            if not _more() and pos >= len(buf):
+                return ""
+        return buf[pos]
+
+    def _skip_whitespace() -> str:
+        nonlocal pos
+        while (ch := _peek()) and ch in _WHITESPACE:
+            pos += 1
+        return ch
+
+    def _read_string() -> str:
+        # pos is on the opening quote; returns the raw (still escaped) contents
+        nonlocal pos
+        pos += 1
+        out = []
+        escaped = False
+        while True:
+            ch = _peek()
+            if not ch:
+                raise ValueError("Unterminated string in JSON stream")
+            pos += 1
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                return "".join(out)
+            out.append(ch)
+
+    # 1) Walk the top-level object until the `key` member's array opens
+    depth = 0
+    while True:
+        ch = _peek()
+        if not ch:
+            return
+        if ch == '"':
+            text = _read_string()
+            if depth == 1 and _skip_whitespace() == ":":
+                pos += 1
+                if text == key:
+                    if _skip_whitespace() != "[":
+                        return
+                    pos += 1
+                    break
+            continue
+        if ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+        pos += 1
+
+    # 2) Decode one element at a time
+    while True:
+        ch = _skip_whitespace()
+        if ch == ",":
+            pos += 1
+            continue
+        if ch == "]" or not ch:
+            return
+        try:
+            item, end = raw_decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if _more():
+                continue
+            raise
+        # A number that ends exactly at the buffer edge may continue in the next chunk
+        if end == len(buf) and not isinstance(item, (dict, list, str)) and _more():
+            continue
+        pos = end
+        yield item
@@ -1,34 +1,22 @@
 # ingestion/src/load_backfill_matches_to_snowflake.py
 
-import re
+import json
 
 from .logger import get_logger
-from .minio_reader import list_objects, get_json_object
-from .load_state import get_loaded_keys, mark_loaded
-from .bronze_snowflake_loader import upsert_raw_matches, upsert_raw_manifest
+from .minio_reader import iter_partitioned_keys
+from .metrics import export_metrics, start_metrics
+from .load_state import get_loaded_keys
+from .match_file_loader import load_keys
+from .snowflake_pool import get_pool
 
 logger = get_logger("load_backfill_matches_to_snowflake")
 
-# Parse metadata from your MinIO key pattern
-RUN_ID_RE = re.compile(r"run_id=([a-f0-9\-]+)\.(?:manifest\.)?json$")
-DT_RE = re.compile(r"dt=(\d{4}-\d{2}-\d{2})")
-COMP_RE = re.compile(r"competition=([^/]+)/")
-DATEFROM_RE = re.compile(r"dateFrom=(\d{4}-\d{2}-\d{2})")
-DATETO_RE = re.compile(r"dateTo=(\d{4}-\d{2}-\d{2})")
-
-
-def _parse_key(key: str):
-    run_id = RUN_ID_RE.search(key).group(1) if RUN_ID_RE.search(key) else None
-    dt = DT_RE.search(key).group(1) if DT_RE.search(key) else None
-    comp = COMP_RE.search(key).group(1) if COMP_RE.search(key) else None
-    date_from = DATEFROM_RE.search(key).group(1) if DATEFROM_RE.search(key) else None
-    date_to = DATETO_RE.search(key).group(1) if DATETO_RE.search(key) else None
-    return run_id, dt, comp, date_from, date_to
-
 
 def main():
+    start_metrics()
     prefix = "endpoint=matches_backfill/"
-    keys = list_objects(prefix)
+    # Competitions are listed in parallel
+    keys = list(iter_partitioned_keys(prefix))
 
     data_keys = sorted([k for k in keys if k.endswith(".json") and not k.endswith(".manifest.json")])
     manifest_keys = set([k for k in keys if k.endswith(".manifest.json")])
@@ -36,61 +24,32 @@ def main():
     if not data_keys:
         raise RuntimeError(f"No backfill match files found in MinIO with prefix: {prefix}")
 
-    # ✅ Load-state: skip already loaded data files
-    already_loaded = get_loaded_keys(prefix)
+    # ✅ Load-state: skip already loaded data files.
+    # Always a full reconcile: a resumed backfill keeps writing under its original dt= partition,
+    # which a dt watermark could already have passed.
+    pool = get_pool()
+    with pool.connection() as conn:
+        already_loaded = get_loaded_keys(prefix, conn=conn)
     data_keys_to_load = [k for k in data_keys if k not in already_loaded]
 
     logger.info(f"Found {len(data_keys)} backfill data files")
     logger.info(f"Already loaded (by prefix): {len(already_loaded)}")
     logger.info(f"To load now: {len(data_keys_to_load)}")
 
-    loaded_data = 0
-    loaded_manifests = 0
-
-    for i, data_key in enumerate(data_keys_to_load, start=1):
-        run_id, dt, comp, date_from, date_to = _parse_key(data_key)
-
-        logger.info(f"[{i}/{len(data_keys_to_load)}] Loading data_key={data_key}")
-        payload = get_json_object(data_key)
-
-        # 1) Upsert data payload into RAW_MATCHES
-        upsert_raw_matches(
-            file_key=data_key,
-            competition_code=comp,
-            date_from=date_from,
-            date_to=date_to,
-            run_id=run_id,
-            dt=dt,
-            payload=payload,
-        )
-        loaded_data += 1
-
-        # 2) Mark the data file as loaded (idempotent MERGE)
-        mark_loaded(data_key, endpoint="matches_backfill")
-
-        # 3) Load matching manifest (if present)
-        expected_manifest_key = data_key.replace(".json", ".manifest.json")
-        if expected_manifest_key in manifest_keys:
-            manifest = get_json_object(expected_manifest_key)
-
-            # For dt in RAW_MANIFESTS we prefer the manifest's dt_partition; fall back to parsed dt
-            manifest_dt = manifest.get("dt_partition") or dt
-
-            upsert_raw_manifest(
-                file_key=expected_manifest_key,
-                endpoint=manifest.get("endpoint") or "matches_backfill",
-                run_id=manifest.get("run_id") or run_id,
-                dt=manifest_dt,
-                manifest=manifest,
-            )
-            loaded_manifests += 1
-
-            # Mark manifest as loaded too
-            mark_loaded(expected_manifest_key, endpoint="matches_backfill_manifest")
-        else:
-            logger.warning(f"Manifest missing for {data_key} (expected {expected_manifest_key})")
+    # Reuse one pooled session for the whole run; each batch of files is one transaction
+    loaded_data, loaded_manifests, failed_keys = load_keys(
+        data_keys_to_load,
+        manifest_keys,
+        manifest_endpoint="matches_backfill",
+        load_state_endpoint="matches_backfill",
+        pool=pool,
+    )
 
     logger.info(f"✅ Loaded backfill: data_files={loaded_data}, manifests={loaded_manifests}")
+    logger.info(f"Stage metrics: {json.dumps(export_metrics())}")
+
+    if failed_keys:
+        raise RuntimeError(f"{len(failed_keys)} file(s) failed to fetch and were left unloaded: {failed_keys[:5]}")
 
 
 if __name__ == "__main__":
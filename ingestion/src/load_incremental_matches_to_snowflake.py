@@ -1,110 +1,109 @@
-import re
+import argparse
 import json
+from datetime import date, timedelta
+from typing import Optional
 
+from .bronze_keys import parse_key
 from .logger import get_logger
-from .minio_reader import list_objects, get_json_object
-from .load_state import get_loaded_keys, mark_loaded
-from .bronze_snowflake_loader import upsert_raw_matches, upsert_raw_manifest
+from .minio_reader import iter_partitioned_keys
+from .config import (
+    INCREMENTAL_LOAD_SOURCE,
+    LOADER_DISCOVERY_MODE,
+    LOADER_WATERMARK_LOOKBACK_DAYS,
+)
+from .metrics import export_metrics, start_metrics
+from .load_state import discover_unloaded_keys, set_watermark, watermark_since
+from .match_file_loader import load_keys
+from .snowflake_pool import get_pool
 
 logger = get_logger("load_incremental_matches_to_snowflake")
 
-RUN_ID_RE = re.compile(r"run_id=([a-f0-9\-]+)\.(?:manifest\.)?json$")
-DT_RE = re.compile(r"dt=(\d{4}-\d{2}-\d{2})")
-COMP_RE = re.compile(r"competition=([^/]+)/")
-DATEFROM_RE = re.compile(r"dateFrom=(\d{4}-\d{2}-\d{2})")
-DATETO_RE = re.compile(r"dateTo=(\d{4}-\d{2}-\d{2})")
 
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Load new incremental matches files from MinIO into Snowflake")
+    parser.add_argument("--competition", help="Load only this competition= partition (one Airflow mapped task per competition)")
+    args = parser.parse_args(argv)
 
-def _parse_key(key: str):
-    run_id = RUN_ID_RE.search(key).group(1) if RUN_ID_RE.search(key) else None
-    dt = DT_RE.search(key).group(1) if DT_RE.search(key) else None
-    comp = COMP_RE.search(key).group(1) if COMP_RE.search(key) else None
-    date_from = DATEFROM_RE.search(key).group(1) if DATEFROM_RE.search(key) else None
-    date_to = DATETO_RE.search(key).group(1) if DATETO_RE.search(key) else None
-    return run_id, dt, comp, date_from, date_to
+    start_metrics()
 
+    # "delta" loads only the changed-matches objects written next to each window payload
+    if INCREMENTAL_LOAD_SOURCE == "delta":
+        prefix, manifest_endpoint, load_state_endpoint = "endpoint=matches_delta/", "matches_delta", "matches_delta"
+    else:
+        prefix, manifest_endpoint, load_state_endpoint = "endpoint=matches/", "matches", "matches_incremental"
 
-def main():
-    prefix = "endpoint=matches/"
-    keys = list_objects(prefix)
+    # A per-competition run keeps its own watermark, so one league failing never moves another league's
+    # discovery window past files it has not loaded; LOAD_STATE keys are shared either way
+    competitions = [args.competition] if args.competition else None
+    reconcile_prefix = f"{prefix}competition={args.competition}/" if args.competition else prefix
+    watermark_endpoint = f"{load_state_endpoint}:{args.competition}" if args.competition else load_state_endpoint
+
+    # Watermark discovery only looks at recent dt= partitions; LOADER_DISCOVERY_MODE=full reconciles everything
+    pool = get_pool()
+    since = None
+    if LOADER_DISCOVERY_MODE == "watermark":
+        with pool.connection() as conn:
+            since = watermark_since(watermark_endpoint, LOADER_WATERMARK_LOOKBACK_DAYS, conn=conn)
+
+    # Incremental windows start the day before their dt= partition, so dateFrom >= since - 1 day
+    # prunes each competition's listing server-side
+    date_from_min = (date.fromisoformat(since) - timedelta(days=1)).isoformat() if since else None
+    keys = list(iter_partitioned_keys(prefix, competitions=competitions, date_from_min=date_from_min, dt_from=since))
 
     data_keys = sorted([k for k in keys if k.endswith(".json") and not k.endswith(".manifest.json")])
     manifest_keys = set([k for k in keys if k.endswith(".manifest.json")])
 
     if not data_keys:
-        logger.info(f"No incremental match files found in MinIO with prefix: {prefix}")
+        logger.info(f"No incremental match files found in MinIO with prefix: {reconcile_prefix}")
 
         # Print metrics JSON as last line (Airflow XCom-safe)
         print(json.dumps({
             "prefix": prefix,
+            "competition": args.competition,
             "files_discovered": 0,
             "files_to_load": 0,
             "data_files_loaded": 0,
             "manifests_loaded": 0,
+            "stage_metrics": export_metrics(),
         }))
         return
 
     # ✅ Load-state: skip already loaded data files (and manifests indirectly)
-    already_loaded = get_loaded_keys(prefix)
-    data_keys_to_load = [k for k in data_keys if k not in already_loaded]
+    with pool.connection() as conn:
+        data_keys_to_load = discover_unloaded_keys(data_keys, reconcile_prefix, conn=conn, since=since)
 
     logger.info(f"Found {len(data_keys)} incremental data files")
-    logger.info(f"Already loaded (by prefix): {len(already_loaded)}")
     logger.info(f"To load now: {len(data_keys_to_load)}")
 
-    loaded_data = 0
-    loaded_manifests = 0
-
-    for i, data_key in enumerate(data_keys_to_load, start=1):
-        run_id, dt, comp, date_from, date_to = _parse_key(data_key)
-
-        logger.info(f"[{i}/{len(data_keys_to_load)}] Loading data_key={data_key}")
-        payload = get_json_object(data_key)
-
-        # 1) Upsert data payload into RAW_MATCHES
-        upsert_raw_matches(
-            file_key=data_key,
-            competition_code=comp,
-            date_from=date_from,
-            date_to=date_to,
-            run_id=run_id,
-            dt=dt,
-            payload=payload,
-        )
-        loaded_data += 1
-
-        # 2) Mark the data file as loaded
-        mark_loaded(data_key, endpoint="matches_incremental")
-
-        # 3) Load matching manifest (if present)
-        expected_manifest_key = data_key.replace(".json", ".manifest.json")
-        if expected_manifest_key in manifest_keys:
-            manifest = get_json_object(expected_manifest_key)
-            manifest_dt = manifest.get("dt_partition") or dt
-
-            upsert_raw_manifest(
-                file_key=expected_manifest_key,
-                endpoint=manifest.get("endpoint") or "matches",
-                run_id=manifest.get("run_id") or run_id,
-                dt=manifest_dt,
-                manifest=manifest,
-            )
-            loaded_manifests += 1
-
-            # Mark manifest as loaded too
-            mark_loaded(expected_manifest_key, endpoint="matches_incremental_manifest")
-        else:
-            logger.warning(f"Manifest missing for {data_key} (expected {expected_manifest_key})")
+    # Reuse one pooled session for the whole run; each batch of files is one transaction
+    loaded_data, loaded_manifests, failed_keys = load_keys(
+        data_keys_to_load,
+        manifest_keys,
+        manifest_endpoint=manifest_endpoint,
+        load_state_endpoint=load_state_endpoint,
+        pool=pool,
+    )
 
     logger.info(f"✅ Loaded incremental: data_files={loaded_data}, manifests={loaded_manifests}")
 
+    if failed_keys:
+        raise RuntimeError(f"{len(failed_keys)} file(s) failed to fetch and were left unloaded: {failed_keys[:5]}")
+
+    # Everything up to the newest dt partition is now loaded
+    newest_dt = max((parse_key(k)[1] for k in data_keys if parse_key(k)[1]), default=None)
+    if newest_dt:
+        with pool.connection() as conn:
+            set_watermark(watermark_endpoint, newest_dt, conn=conn)
+
     # Print metrics JSON as last line (Airflow XCom-safe)
     print(json.dumps({
         "prefix": prefix,
+        "competition": args.competition,
         "files_discovered": len(data_keys),
         "files_to_load": len(data_keys_to_load),
         "data_files_loaded": loaded_data,
         "manifests_loaded": loaded_manifests,
+        "stage_metrics": export_metrics(),
     }))
 
 
@@ -14,7 +14,8 @@ DATETO_RE = re.compile(r"dateTo=(\d{4}-\d{2}-\d{2})")
 
 def main():
     prefix = "endpoint=matches/"
-    data_keys = [k for k in list_objects(prefix) if k.endswith(".json") and not k.endswith(".manifest.json")]
+    all_keys = set(list_objects(prefix))
+    data_keys = [k for k in all_keys if k.endswith(".json") and not k.endswith(".manifest.json")]
     if not data_keys:
         raise RuntimeError(f"No matches JSON files found in MinIO with prefix: {prefix}")
 
@@ -41,7 +42,6 @@ def main():
 
     # load matching manifest if present
     manifest_key = latest_key.replace(".json", ".manifest.json")
-    all_keys = set(list_objects(prefix))
     if manifest_key in all_keys:
         manifest = get_json_object(manifest_key)
         upsert_raw_manifest(
@@ -1,20 +1,25 @@
-from typing import Set, Optional
+from datetime import date, timedelta
+from typing import Any, Set, Optional
 
+from .bronze_keys import parse_key
 from .logger import get_logger
-from .snowflake_client import get_snowflake_conn
+from .metrics import METRICS
+from .snowflake_pool import borrow_connection
 
 logger = get_logger("load_state")
 
 LOAD_STATE_FQN = "FOOTBALL_DB.BRONZE.LOAD_STATE"
+# Highest dt= partition fully loaded per load-state endpoint (watermark discovery)
+LOAD_WATERMARK_FQN = "FOOTBALL_DB.BRONZE.LOAD_WATERMARK"
+_watermark_table_ready = False
 
 
-def get_loaded_keys(prefix: str) -> Set[str]:
+def get_loaded_keys(prefix: str, conn: Any = None) -> Set[str]:
     """
     Returns file_keys already loaded that start with a given prefix.
     Example prefix: 'endpoint=matches_backfill/'
     """
-    conn = get_snowflake_conn()
-    try:
+    with borrow_connection(conn) as conn:
         cur = conn.cursor()
         cur.execute(
             f"""
@@ -25,16 +30,94 @@ def get_loaded_keys(prefix: str) -> Set[str]:
             (prefix + "%",),
         )
         return {row[0] for row in cur.fetchall()}
-    finally:
-        conn.close()
 
 
-def mark_loaded(file_key: str, endpoint: Optional[str] = None) -> None:
+def get_loaded_subset(file_keys: list[str], conn: Any = None, chunk_size: int = 1000) -> Set[str]:
+    """
+    Returns which of `file_keys` are already loaded, looked up by exact key.
+    Cost follows the number of candidate keys, not the size of LOAD_STATE.
+    """
+    loaded: Set[str] = set()
+    if not file_keys:
+        return loaded
+
+    with borrow_connection(conn) as conn:
+        cur = conn.cursor()
+        for start in range(0, len(file_keys), chunk_size):
+            chunk = file_keys[start:start + chunk_size]
+            cur.execute(
+                f"""
+                SELECT FILE_KEY
+                FROM {LOAD_STATE_FQN}
+                WHERE FILE_KEY IN ({", ".join(["%s"] * len(chunk))})
+                """,
+                chunk,
+            )
+            loaded.update(row[0] for row in cur.fetchall())
+    return loaded
+
+
+def _ensure_watermark_table(cur) -> None:
+    """
+    Create LOAD_WATERMARK on first use; runs its DDL at most once per process.
+    """
+    global _watermark_table_ready
+    if _watermark_table_ready:
+        return
+    cur.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {LOAD_WATERMARK_FQN} (
+          ENDPOINT STRING,
+          DT_WATERMARK STRING,
+          UPDATED_AT TIMESTAMP_TZ DEFAULT CURRENT_TIMESTAMP()
+        )
+        """
+    )
+    _watermark_table_ready = True
+
+
+def get_watermark(endpoint: str, conn: Any = None) -> Optional[str]:
+    """
+    Returns the dt watermark (YYYY-MM-DD) for a load-state endpoint, or None if it has never been set.
+    """
+    with borrow_connection(conn) as conn:
+        cur = conn.cursor()
+        _ensure_watermark_table(cur)
+        cur.execute(
+            f"SELECT DT_WATERMARK FROM {LOAD_WATERMARK_FQN} WHERE ENDPOINT = %s",
+            (endpoint,),
+        )
+        row = cur.fetchone()
+        return row[0] if row else None
+
+
+def set_watermark(endpoint: str, dt: str, conn: Any = None) -> None:
+    """
+    Move the dt watermark for a load-state endpoint (never backwards).
+    """
+    with borrow_connection(conn) as conn:
+        cur = conn.cursor()
+        _ensure_watermark_table(cur)
+        cur.execute(
+            f"""
+            MERGE INTO {LOAD_WATERMARK_FQN} t
+            USING (SELECT %s AS ENDPOINT, %s AS DT_WATERMARK) s
+            ON t.ENDPOINT = s.ENDPOINT
+            WHEN MATCHED AND s.DT_WATERMARK > t.DT_WATERMARK THEN
+              UPDATE SET DT_WATERMARK = s.DT_WATERMARK, UPDATED_AT = CURRENT_TIMESTAMP()
+            WHEN NOT MATCHED THEN
+              INSERT (ENDPOINT, DT_WATERMARK) VALUES (s.ENDPOINT, s.DT_WATERMARK)
+            """,
+            (endpoint, dt),
+        )
+        conn.commit()
+
+
+def mark_loaded(file_key: str, endpoint: Optional[str] = None, conn: Any = None) -> None:
     """
     Insert file_key into load state (idempotent).
     """
-    conn = get_snowflake_conn()
-    try:
+    with borrow_connection(conn) as conn, METRICS.timer("snowflake_mark_loaded"):
         cur = conn.cursor()
         cur.execute(
             f"""
@@ -47,5 +130,61 @@ def mark_loaded(file_key: str, endpoint: Optional[str] = None) -> None:
             (file_key, endpoint),
         )
         conn.commit()
-    finally:
-        conn.close()
\ No newline at end of file
+
+
+def mark_loaded_many(entries: list[tuple[str, Optional[str]]], conn: Any) -> None:
+    """
+    Insert many (file_key, endpoint) pairs into load state with a single MERGE (idempotent).
+    Does not commit: the caller owns the transaction, so the markers land together with the data.
+    """
+    if not entries:
+        return
+
+    values_sql = ", ".join(["(%s, %s)"] * len(entries))
+    params = [v for entry in entries for v in entry]
+
+    cur = conn.cursor()
+    with METRICS.timer("snowflake_mark_loaded"):
+        cur.execute(
+            f"""
+            MERGE INTO {LOAD_STATE_FQN} t
+            USING (SELECT column1 AS FILE_KEY, column2 AS ENDPOINT FROM VALUES {values_sql}) s
+            ON t.FILE_KEY = s.FILE_KEY
+            WHEN NOT MATCHED THEN
+              INSERT (FILE_KEY, ENDPOINT) VALUES (s.FILE_KEY, s.ENDPOINT)
+            """,
+            params,
+        )
+
+
+def watermark_since(endpoint: str, lookback_days: int, conn: Any = None) -> Optional[str]:
+    """
+    Oldest dt= partition (YYYY-MM-DD) a watermark-mode run needs to look at, or None when the
+    endpoint has no watermark yet and needs a full reconcile.
+    """
+    watermark = get_watermark(endpoint, conn=conn)
+    if watermark is None:
+        return None
+    return (date.fromisoformat(watermark) - timedelta(days=lookback_days)).isoformat()
+
+
+def discover_unloaded_keys(data_keys: list[str], prefix: str, conn: Any, since: Optional[str] = None) -> list[str]:
+    """
+    Returns the data keys that still need loading, in input order.
+
+    With `since` (see watermark_since), only keys whose dt= partition is at or after it are checked,
+    by exact key; older partitions were fully loaded by an earlier run. Without it, reconciles
+    against every loaded key under `prefix`.
+    """
+    if since is None:
+        already_loaded = get_loaded_keys(prefix, conn=conn)
+        logger.info(f"Full reconcile for prefix={prefix}: {len(already_loaded)} keys already loaded")
+        return [k for k in data_keys if k not in already_loaded]
+
+    candidates = [k for k in data_keys if (parse_key(k)[1] or "") >= since]
+    already_loaded = get_loaded_subset(candidates, conn=conn)
+    logger.info(
+        f"Watermark discovery for prefix={prefix}: dt>={since}, "
+        f"candidates={len(candidates)}, already loaded={len(already_loaded)}"
+    )
+    return [k for k in candidates if k not in already_loaded]
@@ -0,0 +1,638 @@
+"""
+Local silver/gold engine: computes matches_flattened, matches_latest, teams, league_table_snapshot and
+team_form_last5 from bronze objects with Polars, without a Snowflake warehouse.
+
+Examples:
+    # bronze straight from MinIO, results as Parquet
+    python -m ingestion.src.local_engine --source minio --out ./local_out
+
+    # a local copy of the bucket (e.g. `mc mirror`), same key layout
+    python -m ingestion.src.local_engine --source dir --path ./bronze --out ./local_out
+
+    # synthetic fixture + parity check against the dbt model SQL (run in DuckDB)
+    python -m ingestion.src.local_engine --source fixture --parity
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from typing import Any, Iterator, Optional
+
+import polars as pl
+
+from .bronze_formats import (
+    V_MATCHES_COLUMNS,
+    decode_parquet,
+    flatten_match,
+    iter_decoded_chunks,
+    ChunkReader,
+    typed_match_row,
+)
+from .bronze_keys import file_meta
+from .json_stream import iter_array_items
+from .logger import get_logger
+
+try:
+    import duckdb
+    import jinja2
+    import yaml
+except ImportError:
+    duckdb = None
+    jinja2 = None
+    yaml = None
+
+logger = get_logger("local_engine")
+
+DBT_PROJECT_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "dbt", "football_dbt")
+DBT_MODELS_DIR = os.path.join(DBT_PROJECT_DIR, "models")
+DBT_MACROS_DIR = os.path.join(DBT_PROJECT_DIR, "macros")
+DBT_PROJECT_FILE = os.path.join(DBT_PROJECT_DIR, "dbt_project.yml")
+
+# Windows served by the gold team_form_last<N> models
+FORM_WINDOWS = (5, 10, 20)
+
+_INT_COLUMNS = {
+    "match_id", "matchday", "competition_id", "season_id", "season_current_matchday",
+    "home_team_id", "away_team_id", "ft_home_goals", "ft_away_goals", "ht_home_goals", "ht_away_goals",
+}
+_TIMESTAMP_COLUMNS = {"utc_date", "last_updated", "loaded_at"}
+_DATE_COLUMNS = {"date_from", "date_to", "dt", "season_start_date", "season_end_date"}
+
+
+def _polars_type(column: str):
+    if column in _INT_COLUMNS:
+        return pl.Int64
+    if column in _TIMESTAMP_COLUMNS:
+        return pl.Datetime("us", "UTC")
+    if column in _DATE_COLUMNS:
+        return pl.Date
+    return pl.Utf8
+
+
+V_MATCHES_SCHEMA = {c: _polars_type(c) for c in V_MATCHES_COLUMNS + ["loaded_at"]}
+
+
+# ---------------------------------------------------------------------------
+# Bronze readers -> matches_flattened rows
+# ---------------------------------------------------------------------------
+
+def _with_loaded_at(rows: list[dict]) -> list[dict]:
+    # No warehouse load time locally: the dt= partition stands in for RAW_MATCHES.LOADED_AT
+    for row in rows:
+        dt = row.get("dt")
+        row["loaded_at"] = datetime.combine(dt, dtime(), tzinfo=timezone.utc) if dt else None
+    return rows
+
+
+def _is_data_key(key: str, fmt: str) -> bool:
+    if fmt == "parquet":
+        return key.endswith(".parquet")
+    return key.endswith(".json") and not key.endswith(".manifest.json")
+
+
+def read_minio_rows(prefix: str, fmt: str = "json") -> list[dict]:
+    from .minio_reader import iter_partitioned_keys, read_match_rows
+
+    rows: list[dict] = []
+    for key in iter_partitioned_keys(prefix):
+        if _is_data_key(key, fmt):
+            rows.extend(read_match_rows(key))
+    return _with_loaded_at(rows)
+
+
+def read_dir_rows(root: str, prefix: str, fmt: str = "json") -> list[dict]:
+    """
+    Read a local directory laid out like the bronze bucket (relative path = object key).
+    """
+    rows: list[dict] = []
+    base = os.path.join(root, prefix)
+    for dirpath, _, filenames in os.walk(base):
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            key = os.path.relpath(path, root).replace(os.sep, "/")
+            if not _is_data_key(key, fmt):
+                continue
+            with open(path, "rb") as fp:
+                if fmt == "parquet":
+                    rows.extend(decode_parquet(fp.read()))
+                    continue
+                meta = file_meta(key)
+                stream = ChunkReader(iter_decoded_chunks(iter(lambda: fp.read(64 * 1024), b"")))
+                rows.extend(typed_match_row(flatten_match(m, meta)) for m in iter_array_items(stream))
+    return _with_loaded_at(rows)
+
+
+def fixture_payloads(competitions: tuple[str, ...] = ("PL", "SA"), days: int = 60, runs: int = 3) -> Iterator[tuple[str, dict]]:
+    """
+    Deterministic bronze fixture: several daily runs per competition, each a separate load batch.
+    The first run fetches the whole window; later runs re-fetch only its tail (the last 14 days, then
+    the last day), re-scoring some matches (so matches_latest has real duplicates to resolve). The last
+    run also moves one team's newest fixture three days earlier and drops one match's season, so the
+    incremental parity pass sees a reschedule and a NULL season_id.
+    Team ids are offset per competition so every team plays at most once per kickoff time.
+    """
+    from .mock_football_api import _synthetic_matches
+
+    start = date(2025, 8, 1)
+    end = start + timedelta(days=days - 1)
+    for c_num, code in enumerate(competitions):
+        for run in range(runs):
+            dt = start + timedelta(days=days + run)
+            last = run == runs - 1
+            window_from = start if run == 0 else end - timedelta(days=0 if last else 13)
+            payload = _synthetic_matches(code, window_from.isoformat(), end.isoformat())
+            for n, m in enumerate(payload["matches"]):
+                for side in ("homeTeam", "awayTeam"):
+                    team_id = m[side]["id"] + 100 * c_num
+                    m[side].update({"id": team_id, "name": f"Team {team_id}", "shortName": f"T{team_id}"})
+                # Later runs correct a share of the results
+                if run and m["score"]["fullTime"]["home"] is not None and m["id"] % (run + 2) == 0:
+                    ft = m["score"]["fullTime"]
+                    ft["home"] += run
+                    m["score"]["winner"] = (
+                        "HOME_TEAM" if ft["home"] > ft["away"] else "AWAY_TEAM" if ft["away"] > ft["home"] else "DRAW"
+                    )
+                    m["lastUpdated"] = f"{dt.isoformat()}T06:00:00Z"
+                if last and run:
+                    if n == 0:
+                        m["utcDate"] = f"{(end - timedelta(days=3)).isoformat()}T12:00:00Z"
+                    else:
+                        m["season"] = None
+                    m["lastUpdated"] = f"{dt.isoformat()}T06:00:00Z"
+            key = (
+                f"endpoint=matches/competition={code}/dateFrom={window_from}/dateTo={end}/"
+                f"dt={dt}/run_id={run:08x}-0000-0000-0000-000000000000.json"
+            )
+            yield key, payload
+
+
+def read_fixture_rows(**kwargs) -> list[dict]:
+    rows: list[dict] = []
+    for key, payload in fixture_payloads(**kwargs):
+        meta = file_meta(key)
+        rows.extend(typed_match_row(flatten_match(m, meta)) for m in payload["matches"])
+    return _with_loaded_at(rows)
+
+
+# ---------------------------------------------------------------------------
+# Models (Polars mirrors of the dbt SQL)
+# ---------------------------------------------------------------------------
+
+def matches_flattened(rows: list[dict]) -> pl.DataFrame:
+    return pl.from_dicts(rows, schema=V_MATCHES_SCHEMA)
+
+
+def matches_latest(v: pl.DataFrame) -> pl.DataFrame:
+    # Snowflake sorts NULLs first on DESC; keep that so the pick matches the warehouse
+    latest = (
+        v.sort(["loaded_at", "last_updated"], descending=True, nulls_last=False)
+        .unique(subset="match_id", keep="first", maintain_order=True)
+    )
+    return latest.select(
+        "match_id", "utc_date", "status", "stage", "match_group", "matchday", "last_updated",
+        "competition_id",
+        pl.col("competition_code_in_payload").alias("competition_code"),
+        "competition_name", "competition_type",
+        "season_id", "season_start_date", "season_end_date", "season_current_matchday",
+        "home_team_id", "home_team_name", "home_team_short_name", "home_team_tla", "home_team_crest",
+        "away_team_id", "away_team_name", "away_team_short_name", "away_team_tla", "away_team_crest",
+        "winner", "duration", "ft_home_goals", "ft_away_goals", "ht_home_goals", "ht_away_goals",
+        "file_key",
+        pl.col("competition_code").alias("competition_code_from_run"),
+        "date_from", "date_to", "run_id", "dt", "loaded_at",
+    )
+
+
+def _team_sides(ml: pl.DataFrame, columns: dict[str, str]) -> pl.DataFrame:
+    """
+    UNION ALL of the home-side and away-side projections; `columns` maps output name -> "{side}_..." template.
+    """
+    frames = []
+    for side in ("home", "away"):
+        other = "away" if side == "home" else "home"
+        frames.append(ml.select(**{
+            name: pl.col(src.format(side=side, other=other)) if "{" in src else pl.col(src)
+            for name, src in columns.items()
+        }).filter(pl.col("team_id").is_not_null()))
+    return pl.concat(frames)
+
+
+def teams(ml: pl.DataFrame) -> pl.DataFrame:
+    base = _team_sides(ml, {
+        "competition_code": "competition_code",
+        "season_id": "season_id",
+        "utc_date": "utc_date",
+        "loaded_at": "loaded_at",
+        "team_id": "{side}_team_id",
+        "name": "{side}_team_name",
+        "short_name": "{side}_team_short_name",
+        "tla": "{side}_team_tla",
+        "crest": "{side}_team_crest",
+    })
+    latest = (
+        base.with_columns(pl.col("loaded_at").max().over("team_id").alias("source_loaded_at"))
+        .sort("utc_date", descending=True, nulls_last=False)
+        .unique(subset="team_id", keep="first", maintain_order=True)
+    )
+    return latest.select(
+        "team_id", "name", "short_name", "tla", "crest", "competition_code", "season_id",
+        pl.col("utc_date").alias("last_seen_utc_date"),
+        pl.lit(datetime.now(timezone.utc)).alias("updated_at"),
+        "source_loaded_at",
+    )
+
+
+def _finished_sides(ml: pl.DataFrame, extra: dict[str, str]) -> pl.DataFrame:
+    finished = ml.filter(pl.col("status") == "FINISHED")
+    frames = []
+    for side, win, loss in (("home", "HOME_TEAM", "AWAY_TEAM"), ("away", "AWAY_TEAM", "HOME_TEAM")):
+        other = "away" if side == "home" else "home"
+        frames.append(
+            finished.filter(pl.col(f"{side}_team_id").is_not_null()).select(
+                *[pl.col(src).alias(name) for name, src in extra.items()],
+                pl.col("utc_date"),
+                pl.col(f"{side}_team_id").alias("team_id"),
+                pl.col(f"{side}_team_name").alias("team_name"),
+                pl.col(f"ft_{side}_goals").alias("gf"),
+                pl.col(f"ft_{other}_goals").alias("ga"),
+                pl.when(pl.col("winner") == win).then(pl.lit("W"))
+                .when(pl.col("winner") == "DRAW").then(pl.lit("D"))
+                .when(pl.col("winner") == loss).then(pl.lit("L"))
+                .otherwise(None).alias("result"),
+            )
+        )
+    return pl.concat(frames)
+
+
+def league_table_snapshot(ml: pl.DataFrame) -> pl.DataFrame:
+    # No standings without a competition and season (same as the dbt model)
+    ml = ml.filter(pl.col("competition_code").is_not_null() & pl.col("season_id").is_not_null())
+    # Incremental watermarks, taken over every match of the partition (not just finished ones)
+    ml = ml.with_columns(
+        pl.col("loaded_at").max().over("competition_code", "season_id").alias("source_loaded_at"),
+        pl.col("last_updated").max().over("competition_code", "season_id").alias("source_last_updated"),
+    )
+    finished = _finished_sides(ml, {
+        "competition_code": "competition_code",
+        "season_id": "season_id",
+        "source_loaded_at": "source_loaded_at",
+        "source_last_updated": "source_last_updated",
+    })
+    agg = finished.group_by("competition_code", "season_id", "team_id").agg(
+        pl.col("team_name").max(),
+        pl.len().alias("played"),
+        (pl.col("result") == "W").sum().alias("wins"),
+        (pl.col("result") == "D").sum().alias("draws"),
+        (pl.col("result") == "L").sum().alias("losses"),
+        pl.col("gf").sum().alias("goals_for"),
+        pl.col("ga").sum().alias("goals_against"),
+        (pl.col("gf").sum() - pl.col("ga").sum()).alias("goal_diff"),
+        pl.when(pl.col("result") == "W").then(3).when(pl.col("result") == "D").then(1).otherwise(0)
+        .sum().alias("points"),
+        pl.col("utc_date").max().alias("as_of_utc"),
+        pl.col("source_loaded_at").max(),
+        pl.col("source_last_updated").max(),
+    )
+    ranked = agg.sort(
+        ["competition_code", "season_id", "points", "goal_diff", "goals_for", "team_name"],
+        descending=[False, False, True, True, True, False],
+    )
+    return ranked.with_columns(
+        pl.int_range(1, pl.len() + 1).over("competition_code", "season_id").alias("rank")
+    )
+
+
+def team_form(ml: pl.DataFrame, window: int = 5) -> pl.DataFrame:
+    """
+    team_form_last<window>: the team's last `window` finished matches per competition.
+    """
+    n = window
+    # Watermark over all of the team's matches, finished or not
+    team_loaded_at = pl.concat([
+        ml.select("competition_code", pl.col(f"{side}_team_id").alias("team_id"), "loaded_at")
+        for side in ("home", "away")
+    ]).filter(pl.col("team_id").is_not_null()).group_by("competition_code", "team_id").agg(
+        pl.col("loaded_at").max().alias("source_loaded_at")
+    )
+    finished = _finished_sides(ml, {"competition_code": "competition_code"})
+    last_n = (
+        finished.sort("utc_date", descending=True, nulls_last=False)
+        .with_columns(pl.int_range(1, pl.len() + 1).over("competition_code", "team_id").alias("rn"))
+        .filter(pl.col("rn") <= n)
+    )
+    form = last_n.group_by("competition_code", "team_id").agg(
+        pl.col("team_name").max(),
+        pl.len().alias(f"games_played_last{n}"),
+        (pl.col("result") == "W").sum().alias(f"wins_last{n}"),
+        (pl.col("result") == "D").sum().alias(f"draws_last{n}"),
+        (pl.col("result") == "L").sum().alias(f"losses_last{n}"),
+        pl.col("gf").sum().alias(f"goals_for_last{n}"),
+        pl.col("ga").sum().alias(f"goals_against_last{n}"),
+        (pl.col("gf").sum() - pl.col("ga").sum()).alias(f"goal_diff_last{n}"),
+        pl.when(pl.col("result") == "W").then(3).when(pl.col("result") == "D").then(1).otherwise(0)
+        .sum().alias(f"points_last{n}"),
+        pl.col("utc_date").max().alias("last_match_utc"),
+    )
+    return form.join(team_loaded_at, on=["competition_code", "team_id"], how="left")
+
+
+def build_all(v: pl.DataFrame) -> dict[str, pl.DataFrame]:
+    ml = matches_latest(v)
+    return {
+        "matches_flattened": v,
+        "matches_latest": ml,
+        "teams": teams(ml),
+        "league_table_snapshot": league_table_snapshot(ml),
+        **{f"team_form_last{n}": team_form(ml, n) for n in FORM_WINDOWS},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Parity: run the dbt model SQL itself in DuckDB on the same matches_flattened input
+# ---------------------------------------------------------------------------
+
+# Model -> (dbt path, primary key used to line rows up, columns that legitimately differ)
+PARITY_MODELS = {
+    "matches_latest": ("silver/matches_latest.sql", ["match_id"], set()),
+    "teams": ("silver/teams.sql", ["team_id"], {"updated_at"}),
+    "league_table_snapshot": ("gold/league_table_snapshot.sql", ["competition_code", "season_id", "team_id"], set()),
+    **{
+        f"team_form_last{n}": (f"gold/team_form_last{n}.sql", ["competition_code", "team_id"], set())
+        for n in FORM_WINDOWS
+    },
+}
+
+
+def dbt_project_vars(project_file: str = DBT_PROJECT_FILE) -> dict[str, Any]:
+    """
+    The `vars:` block of dbt_project.yml, so var() renders as it does under dbt.
+    """
+    with open(project_file, "r", encoding="utf-8") as f:
+        return (yaml.safe_load(f) or {}).get("vars") or {}
+
+
+def render_dbt_model(
+    path: str, incremental: bool = False, this: str = "this", macros_dir: str = DBT_MACROS_DIR,
+    config: Optional[dict] = None,
+) -> str:
+    """
+    Render a dbt model (full build unless `incremental`) with the project macros and vars in scope and
+    ref()/source() resolved to bare table names, then patch the few Snowflake-only spellings DuckDB lacks.
+    The model's config(...) arguments are collected into `config` when given.
+    """
+    if jinja2 is None:
+        raise RuntimeError("Parity checks need the 'duckdb', 'jinja2' and 'pyyaml' packages")
+
+    project_vars = dbt_project_vars()
+
+    def _var(name: str, default: Any = None) -> Any:
+        if name in project_vars:
+            return project_vars[name]
+        if default is None:
+            raise RuntimeError(f"Required var {name!r} is not set in dbt_project.yml")
+        return default
+
+    def _config(**kwargs) -> str:
+        if config is not None:
+            config.update(kwargs)
+        return ""
+
+    macros = []
+    for name in sorted(os.listdir(macros_dir)):
+        if name.endswith(".sql"):
+            with open(os.path.join(macros_dir, name), "r", encoding="utf-8") as f:
+                macros.append(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        template = jinja2.Environment().from_string("".join(macros) + f.read())
+
+    sql = template.render(
+        config=_config,
+        ref=lambda name: name,
+        source=lambda source_name, table_name: table_name,
+        is_incremental=lambda: incremental,
+        var=_var,
+        this=this,
+    )
+    sql = re.sub(r"::timestamp_tz\b", "::timestamptz", sql, flags=re.IGNORECASE)
+    # dateadd(hour, n, ts) -> dateadd_hour(n, ts), a DuckDB macro (see _duckdb_connection)
+    sql = re.sub(r"\bdateadd\(\s*hour\s*,", "dateadd_hour(", sql, flags=re.IGNORECASE)
+    return re.sub(r"current_timestamp\(\)", "current_timestamp", sql, flags=re.IGNORECASE)
+
+
+def _duckdb_connection(v: pl.DataFrame):
+    """
+    DuckDB session with Snowflake's NULL ordering and IFF() / DATEADD(hour) stand-ins,
+    and `v` registered as matches_flattened_input.
+    """
+    if duckdb is None:
+        raise RuntimeError("Parity checks need the 'duckdb', 'jinja2' and 'pyyaml' packages")
+
+    con = duckdb.connect()
+    # Snowflake semantics: NULLs last on ASC, first on DESC; IFF()
+    con.execute("SET default_null_order = 'nulls_last_on_asc_first_on_desc'")
+    con.execute("SET TimeZone = 'UTC'")
+    con.execute("CREATE MACRO iff(c, a, b) AS CASE WHEN c THEN a ELSE b END")
+    con.execute("CREATE MACRO dateadd_hour(n, ts) AS ts + to_hours(CAST(n AS BIGINT))")
+    con.register("matches_flattened_input", v.to_arrow())
+    return con
+
+
+def run_dbt_sql(v: pl.DataFrame, models_dir: str = DBT_MODELS_DIR) -> dict[str, pl.DataFrame]:
+    con = _duckdb_connection(v)
+    con.execute("CREATE TABLE matches_flattened AS SELECT * FROM matches_flattened_input")
+
+    out = {}
+    for name, (rel_path, _, _) in PARITY_MODELS.items():
+        sql = render_dbt_model(os.path.join(models_dir, rel_path))
+        con.execute(f"CREATE TABLE {name} AS {sql}")
+        out[name] = con.execute(f"SELECT * FROM {name}").pl()
+    return out
+
+
+def _apply_incremental(con, name: str, sql: str, config: dict) -> None:
+    """
+    Apply one incremental run the way dbt-snowflake does: the rendered SELECT becomes a temp table, target
+    rows matching it on unique_key (plain equality, so NULL keys never match) are deleted, and the temp
+    rows inserted. For merge and delete+insert alike that is the end state of the statement.
+    """
+    strategy = config.get("incremental_strategy", "merge")
+    if strategy not in ("merge", "delete+insert"):
+        raise RuntimeError(f"{name}: incremental_strategy {strategy!r} has no parity stand-in")
+    unique_key = config["unique_key"]
+    keys = [unique_key] if isinstance(unique_key, str) else list(unique_key)
+
+    con.execute(f"CREATE OR REPLACE TEMP TABLE {name}__dbt_tmp AS {sql}")
+    con.execute(
+        f"DELETE FROM {name} WHERE EXISTS (SELECT 1 FROM {name}__dbt_tmp s WHERE "
+        + " AND ".join(f"s.{k} = {name}.{k}" for k in keys)
+        + ")"
+    )
+    con.execute(f"INSERT INTO {name} BY NAME SELECT * FROM {name}__dbt_tmp")
+
+
+def run_dbt_sql_incremental(v: pl.DataFrame, models_dir: str = DBT_MODELS_DIR) -> dict[str, pl.DataFrame]:
+    """
+    Build every model on the first load batch (distinct loaded_at) of `v`, then add each later batch to
+    matches_flattened and run the models' is_incremental() SQL over it, in dependency order.
+    The end state should equal a full build on all of `v` (run_dbt_sql).
+    """
+    con = _duckdb_connection(v)
+    batches = sorted(t for t in v["loaded_at"].unique().to_list() if t is not None)
+    if len(batches) < 2:
+        raise RuntimeError("Incremental parity needs at least two load batches (distinct loaded_at)")
+
+    con.execute(
+        "CREATE TABLE matches_flattened AS SELECT * FROM matches_flattened_input "
+        "WHERE loaded_at IS NULL OR loaded_at <= ?",
+        [batches[0]],
+    )
+    configs: dict[str, dict] = {}
+    for name, (rel_path, _, _) in PARITY_MODELS.items():
+        configs[name] = {}
+        sql = render_dbt_model(os.path.join(models_dir, rel_path), config=configs[name])
+        con.execute(f"CREATE TABLE {name} AS {sql}")
+
+    for batch in batches[1:]:
+        con.execute("INSERT INTO matches_flattened SELECT * FROM matches_flattened_input WHERE loaded_at = ?", [batch])
+        for name, (rel_path, _, _) in PARITY_MODELS.items():
+            sql = render_dbt_model(os.path.join(models_dir, rel_path), incremental=True, this=name)
+            _apply_incremental(con, name, sql, configs[name])
+
+    return {name: con.execute(f"SELECT * FROM {name}").pl() for name in PARITY_MODELS}
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _compare_models(
+    ours: dict[str, pl.DataFrame], theirs: dict[str, pl.DataFrame], labels: tuple[str, str] = ("local", "dbt")
+) -> dict[str, list[str]]:
+    """
+    Line up each PARITY_MODELS table by its key and report every differing column (lower-cased names on
+    both sides). Returns {model: [differences]} (empty lists = parity).
+    """
+    left, right = labels
+    report: dict[str, list[str]] = {}
+
+    for name, (_, keys, ignore) in PARITY_MODELS.items():
+        problems: list[str] = []
+        ours_frame = ours[name].rename({c: c.lower() for c in ours[name].columns})
+        theirs_frame = theirs[name].rename({c: c.lower() for c in theirs[name].columns})
+        columns = [c for c in theirs_frame.columns if c not in ignore]
+        missing = sorted(set(columns) - set(ours_frame.columns))
+        if missing:
+            problems.append(f"missing columns: {missing}")
+        if ours_frame.height != theirs_frame.height:
+            problems.append(f"row count differs: {left}={ours_frame.height} {right}={theirs_frame.height}")
+
+        common = [c for c in columns if c in ours_frame.columns]
+        ours_rows = {tuple(r[k] for k in keys): r for r in ours_frame.select(common).to_dicts()}
+        theirs_rows = {tuple(r[k] for k in keys): r for r in theirs_frame.select(common).to_dicts()}
+        if ours_rows.keys() != theirs_rows.keys():
+            problems.append(
+                f"row keys differ: {left}_only={len(ours_rows.keys() - theirs_rows.keys())}, "
+                f"{right}_only={len(theirs_rows.keys() - ours_rows.keys())}"
+            )
+        for key in sorted(ours_rows.keys() & theirs_rows.keys(), key=str):
+            for column, expected in theirs_rows[key].items():
+                actual = ours_rows[key][column]
+                if _normalize(actual) != _normalize(expected):
+                    problems.append(f"{key} {column}: {left}={actual!r} {right}={expected!r}")
+                    break
+            if len(problems) >= 20:
+                break
+        report[name] = problems
+    return report
+
+
+def parity_check(v: pl.DataFrame, models_dir: str = DBT_MODELS_DIR) -> dict[str, list[str]]:
+    """
+    Compare the Polars models with the dbt SQL on the same input.
+    Returns {model: [differences]} (empty lists = parity).
+    """
+    return _compare_models(build_all(v), run_dbt_sql(v, models_dir))
+
+
+def incremental_parity_check(v: pl.DataFrame, models_dir: str = DBT_MODELS_DIR) -> dict[str, list[str]]:
+    """
+    Compare the dbt SQL built incrementally batch by batch (run_dbt_sql_incremental) with a full build.
+    Returns {model: [differences]} (empty lists = parity).
+    """
+    return _compare_models(
+        run_dbt_sql_incremental(v, models_dir), run_dbt_sql(v, models_dir), labels=("incremental", "full")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local silver/gold engine mirroring the dbt models")
+    parser.add_argument("--source", choices=["minio", "dir", "fixture"], default="minio")
+    parser.add_argument("--path", help="Root directory for --source dir")
+    parser.add_argument("--prefix", default="endpoint=matches/")
+    parser.add_argument("--format", choices=["json", "parquet"], default="json", help="Bronze objects to read")
+    parser.add_argument("--out", help="Write every model as <out>/<model>.parquet")
+    parser.add_argument("--form-window", type=int, default=None, help="Also compute team form for this window")
+    parser.add_argument(
+        "--parity", action="store_true",
+        help="Compare against the dbt SQL (DuckDB), full build and batch-by-batch incremental runs",
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.source == "minio":
+        rows = read_minio_rows(args.prefix, args.format)
+    elif args.source == "dir":
+        if not args.path:
+            raise RuntimeError("--source dir needs --path")
+        rows = read_dir_rows(args.path, args.prefix, args.format)
+    else:
+        rows = read_fixture_rows()
+    read_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    models = build_all(matches_flattened(rows))
+    if args.form_window:
+        models[f"team_form_last{args.form_window}"] = team_form(models["matches_latest"], args.form_window)
+    build_s = time.perf_counter() - started
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        for name, frame in models.items():
+            frame.write_parquet(os.path.join(args.out, f"{name}.parquet"))
+
+    summary: dict[str, Any] = {
+        "rows": {name: frame.height for name, frame in models.items()},
+        "read_seconds": round(read_s, 3),
+        "build_seconds": round(build_s, 3),
+    }
+
+    failed: Optional[dict] = None
+    if args.parity:
+        failed = {}
+        checks = {
+            "parity": parity_check,
+            "incremental_parity": incremental_parity_check,
+        }
+        for check, run_check in checks.items():
+            report = run_check(models["matches_flattened"])
+            summary[check] = {name: not problems for name, problems in report.items()}
+            for name, problems in report.items():
+                if problems:
+                    failed[f"{check}:{name}"] = problems
+                for problem in problems:
+                    logger.error(f"{check} mismatch in {name}: {problem}")
+
+    # Print summary JSON as last line
+    print(json.dumps(summary))
+
+    if failed:
+        raise RuntimeError(f"dbt SQL parity failed for: {sorted(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import threading
+from typing import Any, Optional
+
+from botocore.exceptions import ClientError
+
+from . import minio_client
+
+
+class _Body:
+    """
+    Minimal stand-in for botocore's StreamingBody.
+    """
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self._pos = 0
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        end = len(self._data) if amt is None else self._pos + amt
+        chunk = self._data[self._pos:end]
+        self._pos += len(chunk)
+        return chunk
+
+    def iter_chunks(self, chunk_size: int = 1024):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class LocalS3Client:
+    """
+    In-memory stand-in for the subset of the boto3 S3 client the pipeline uses:
+    put_object, get_object and list_objects_v2 (Prefix, StartAfter, Delimiter, MaxKeys, ContinuationToken).
+
+    Counts list pages in `list_calls`, so listing strategies can be compared without a MinIO server.
+    Install it with use_local_s3(); every get_s3_client() caller then reads and writes here.
+    """
+
+    def __init__(self):
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.list_calls = 0
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket: str, Key: str, Body: Any, **kwargs) -> dict:
+        data = Body.encode("utf-8") if isinstance(Body, str) else bytes(Body)
+        with self._lock:
+            self.objects[(Bucket, Key)] = data
+        return {}
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        with self._lock:
+            data = self.objects.get((Bucket, Key))
+        if data is None:
+            raise ClientError({"Error": {"Code": "NoSuchKey", "Message": Key}}, "GetObject")
+        return {"Body": _Body(data), "ContentLength": len(data)}
+
+    def list_objects_v2(
+        self,
+        Bucket: str,
+        Prefix: str = "",
+        StartAfter: str = "",
+        Delimiter: str = "",
+        MaxKeys: int = 1000,
+        ContinuationToken: Optional[str] = None,
+        **kwargs,
+    ) -> dict:
+        with self._lock:
+            self.list_calls += 1
+            keys = sorted(k for b, k in self.objects if b == Bucket and k.startswith(Prefix))
+
+        after = ContinuationToken or StartAfter
+        if after:
+            keys = [k for k in keys if k > after]
+
+        contents: list[str] = []
+        common_prefixes: list[str] = []
+        last = None
+        for key in keys:
+            if len(contents) + len(common_prefixes) >= MaxKeys:
+                return self._page(contents, common_prefixes, truncated_after=last)
+            if Delimiter and Delimiter in key[len(Prefix):]:
+                common = key[:key.index(Delimiter, len(Prefix)) + len(Delimiter)]
+                if common_prefixes and common_prefixes[-1] == common:
+                    continue
+                common_prefixes.append(common)
+                # Resume after every key sharing this prefix
+                last = common + "\uffff"
+            else:
+                contents.append(key)
+                last = key
+        return self._page(contents, common_prefixes, truncated_after=None)
+
+    @staticmethod
+    def _page(contents: list[str], common_prefixes: list[str], truncated_after: Optional[str]) -> dict:
+        resp: dict = {
+            "Contents": [{"Key": k} for k in contents],
+            "CommonPrefixes": [{"Prefix": p} for p in common_prefixes],
+            "KeyCount": len(contents) + len(common_prefixes),
+            "IsTruncated": truncated_after is not None,
+        }
+        if truncated_after is not None:
+            resp["NextContinuationToken"] = truncated_after
+        return resp
+
+
+def use_local_s3(client: Optional[LocalS3Client] = None) -> LocalS3Client:
+    """
+    Route get_s3_client() to an in-memory LocalS3Client (a new one unless given).
+    """
+    client = client or LocalS3Client()
+    with minio_client._client_lock:
+        minio_client._client = client
+    return client
@@ -0,0 +1,232 @@
+import gzip
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Optional, Sequence
+
+from . import snowflake_pool
+from .snowflake_pool import SnowflakeSessionPool
+
+# Bronze tables as the loaders use them; keys are unique so MERGE can become an UPSERT
+_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS RAW_COMPETITIONS (
+      FILE_KEY TEXT, RUN_ID TEXT, DT TEXT, PAYLOAD TEXT, LOADED_AT TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS RAW_MATCHES (
+      FILE_KEY TEXT, COMPETITION_CODE TEXT, DATE_FROM TEXT, DATE_TO TEXT, RUN_ID TEXT, DT TEXT,
+      PAYLOAD TEXT, LOADED_AT TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS RAW_MANIFESTS (
+      FILE_KEY TEXT, ENDPOINT TEXT, RUN_ID TEXT, DT TEXT, MANIFEST TEXT, LOADED_AT TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS LOAD_STATE (
+      FILE_KEY TEXT PRIMARY KEY, ENDPOINT TEXT, LOADED_AT TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS LOAD_WATERMARK (
+      ENDPOINT TEXT PRIMARY KEY, DT_WATERMARK TEXT, UPDATED_AT TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+)
+
+_FQN = re.compile(r"\bFOOTBALL_DB\.\w+\.")
+_CAST = re.compile(r"::\w+")
+_FROM_VALUES = re.compile(r"\bFROM VALUES ((?:\([^()]*\)(?:, )?)+)")
+_MERGE = re.compile(
+    r"^MERGE INTO (?P<table>\w+) t USING \((?P<source>.*)\) s ON t\.(?P<key>\w+) = s\.(?P=key)"
+    r"(?: WHEN MATCHED AND (?P<cond>.*?) THEN UPDATE SET (?P<set>.*?))?"
+    r" WHEN NOT MATCHED THEN INSERT \((?P<cols>[^)]*)\) VALUES \((?P<vals>[^)]*)\)$"
+)
+# COPY INTO from a file:// stage (bronze_stage_loader.LocalFileStage), as _copy_into() sends it
+_LOCAL_COPY = re.compile(
+    r"^COPY INTO (?P<table>[\w.]+) \((?P<cols>[^)]*)\) FROM \(SELECT (?P<select>.*) FROM file://(?P<directory>\S+)\)"
+    r" FILES = \('(?P<file>[^']+)'\) FILE_FORMAT = \(TYPE = JSON COMPRESSION = (?P<compression>\w+)\)"
+    r" ON_ERROR = ABORT_STATEMENT(?P<purge> PURGE = TRUE)?$",
+    re.IGNORECASE,
+)
+# $1:a:b path into the staged NDJSON line
+_STAGE_PATH = re.compile(r"\$1((?::\w+)+)")
+
+
+def translate(sql: str) -> str:
+    """
+    Rewrite the Snowflake SQL the bronze loaders send into SQLite:
+    %s binds, FOOTBALL_DB.<schema>. prefixes, ::casts, PARSE_JSON, FROM VALUES and single-key MERGE.
+    PUT and COPY INTO have no single-statement SQLite equivalent and raise; the cursor runs COPY INTO
+    from a file:// stage itself (see LocalSnowflakeCursor._copy_from_stage).
+    """
+    sql = " ".join(sql.split())
+    if sql.upper().startswith(("PUT ", "COPY ")):
+        raise RuntimeError(
+            "LocalSnowflake only runs COPY INTO from a file:// stage (LocalFileStage) and has no PUT; "
+            "set BRONZE_COPY_STAGE=file://<dir> or use BRONZE_LOAD_MODE=batch"
+        )
+
+    sql = sql.replace("%s", "?")
+    sql = _FQN.sub("", sql)
+    sql = _CAST.sub("", sql)
+    sql = re.sub(r"\bPARSE_JSON\(", "json(", sql)
+    sql = re.sub(r"\bCURRENT_TIMESTAMP\(\)", "CURRENT_TIMESTAMP", sql)
+    sql = _FROM_VALUES.sub(lambda m: f"FROM (VALUES {m.group(1)})", sql)
+
+    merge = _MERGE.match(sql)
+    if merge:
+        table, key = merge["table"], merge["key"]
+        upsert = (
+            f"INSERT INTO {table} ({merge['cols']}) SELECT {merge['vals']} FROM ({merge['source']}) s WHERE true "
+            f"ON CONFLICT({key}) "
+        )
+        if merge["set"]:
+            def _sides(expr: str) -> str:
+                return re.sub(r"\bt\.", f"{table}.", re.sub(r"\bs\.", "excluded.", expr))
+
+            upsert += f"DO UPDATE SET {_sides(merge['set'])} WHERE {_sides(merge['cond'])}"
+        else:
+            upsert += "DO NOTHING"
+        sql = upsert
+    return sql
+
+
+class LocalSnowflakeCursor:
+    def __init__(self, conn: "LocalSnowflakeConnection"):
+        self._conn = conn
+        self._cur = conn.db.cursor()
+
+    def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> "LocalSnowflakeCursor":
+        copy = _LOCAL_COPY.match(" ".join(sql.split()))
+        translated = None if copy else translate(sql)
+        if self._conn.latency_ms:
+            time.sleep(self._conn.latency_ms / 1000.0)
+        with self._conn.lock:
+            self._conn.statements += 1
+        if copy:
+            self._copy_from_stage(copy)
+        else:
+            self._cur.execute(translated, list(params or ()))
+        return self
+
+    def _copy_from_stage(self, copy: re.Match) -> None:
+        """
+        COPY INTO from a LocalFileStage directory: each NDJSON line of the staged file (gunzipped when
+        COMPRESSION = GZIP) goes into a temp table, the COPY's select runs over it with $1:a:b paths
+        read by json_extract, and PURGE = TRUE removes the file afterwards.
+        A malformed line fails the whole statement, like ON_ERROR = ABORT_STATEMENT.
+        """
+        path = os.path.join(copy["directory"], copy["file"])
+        opener = gzip.open if copy["compression"].upper() == "GZIP" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            lines = [(line,) for line in f if line.strip()]
+
+        select = _STAGE_PATH.sub(
+            lambda m: f"json_extract(_LINE, '$.{m.group(1)[1:].replace(':', '.')}')", copy["select"]
+        )
+        self._cur.execute("CREATE TEMP TABLE IF NOT EXISTS _STAGE_LINES (_LINE TEXT)")
+        self._cur.execute("DELETE FROM _STAGE_LINES")
+        self._cur.executemany("INSERT INTO _STAGE_LINES (_LINE) VALUES (?)", lines)
+        self._cur.execute(
+            f"INSERT INTO {_FQN.sub('', copy['table'])} ({copy['cols']}) "
+            f"SELECT {_CAST.sub('', select)} FROM _STAGE_LINES"
+        )
+        self._cur.execute("DELETE FROM _STAGE_LINES")
+        if copy["purge"]:
+            os.remove(path)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    @property
+    def rowcount(self) -> int:
+        return self._cur.rowcount
+
+
+class LocalSnowflakeConnection:
+    """
+    DB-API connection that runs the loaders' Snowflake SQL on SQLite (see translate()).
+
+    `latency_ms` is added to every statement to stand in for the warehouse round trip, and
+    `statements` counts executed statements, so batching changes show up without Snowflake.
+    A COPY INTO from a file:// stage counts as one statement.
+    """
+
+    def __init__(self, path: str, latency_ms: float = 0.0):
+        # autocommit unless the loader sends BEGIN; commit()/rollback() then close that transaction
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=30)
+        self.latency_ms = latency_ms
+        self.lock = threading.Lock()
+        self.statements = 0
+        for ddl in _DDL:
+            self.db.execute(ddl)
+
+    def cursor(self) -> LocalSnowflakeCursor:
+        return LocalSnowflakeCursor(self)
+
+    def commit(self) -> None:
+        if self.db.in_transaction:
+            self.db.execute("COMMIT")
+
+    def rollback(self) -> None:
+        if self.db.in_transaction:
+            self.db.execute("ROLLBACK")
+
+    def close(self) -> None:
+        self.db.close()
+
+
+class LocalSnowflake:
+    """
+    SQLite-file stand-in for the bronze schema, shared by every connection it opens.
+    Install it with use_local_snowflake(); get_pool() callers then load into it.
+    """
+
+    def __init__(self, path: Optional[str] = None, latency_ms: float = 0.0):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="local_snowflake_", suffix=".db")
+            os.close(fd)
+        self.path = path
+        self.latency_ms = latency_ms
+        self._connections: list[LocalSnowflakeConnection] = []
+        self._lock = threading.Lock()
+
+    def connect(self) -> LocalSnowflakeConnection:
+        conn = LocalSnowflakeConnection(self.path, latency_ms=self.latency_ms)
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @property
+    def statements(self) -> int:
+        with self._lock:
+            return sum(c.statements for c in self._connections)
+
+    def query(self, sql: str, params: Optional[Sequence[Any]] = None) -> list[tuple]:
+        db = sqlite3.connect(self.path)
+        try:
+            return db.execute(translate(sql), list(params or ())).fetchall()
+        finally:
+            db.close()
+
+
+def use_local_snowflake(local: Optional[LocalSnowflake] = None, size: int = 2) -> LocalSnowflake:
+    """
+    Route get_pool() to a SnowflakeSessionPool over a LocalSnowflake (a new one unless given).
+    """
+    local = local or LocalSnowflake()
+    with snowflake_pool._pool_lock:
+        if snowflake_pool._pool is not None:
+            snowflake_pool._pool.close()
+        snowflake_pool._pool = SnowflakeSessionPool(connect=local.connect, size=size)
+    return local
@@ -0,0 +1,119 @@
+from typing import Any, Optional
+
+from .bronze_keys import manifest_key_for, parse_key
+from .bronze_snowflake_loader import MatchFile, upsert_match_files_batch
+from .bronze_stage_loader import copy_match_files
+from .config import (
+    BRONZE_LOAD_BATCH_SIZE,
+    BRONZE_LOAD_MODE,
+    LOADER_FETCH_WORKERS,
+    LOADER_MAX_INFLIGHT,
+    LOADER_PAYLOAD_MODE,
+)
+from .logger import get_logger
+from .minio_reader import get_json_object, get_object_text
+from .prefetch import prefetch_ordered
+
+logger = get_logger("match_file_loader")
+
+
+def load_keys(
+    data_keys: list[str],
+    manifest_keys: set[str],
+    manifest_endpoint: str,
+    load_state_endpoint: str,
+    pool: Any,
+    mode: str = BRONZE_LOAD_MODE,
+    stage: Optional[Any] = None,
+) -> tuple[int, int, list[str]]:
+    """
+    Load bronze matches files (and their manifests) into RAW_MATCHES / RAW_MANIFESTS and mark them in
+    LOAD_STATE, BRONZE_LOAD_BATCH_SIZE files per transaction, over one pooled session.
+
+    - mode=copy: raw bytes are streamed into staged NDJSON and loaded with COPY INTO through `stage`
+      (default: BRONZE_COPY_STAGE)
+    - mode=batch: files are prefetched on LOADER_FETCH_WORKERS threads (at most
+      LOADER_MAX_INFLIGHT ahead) and written with set-based INSERTs; a file that fails to fetch is left
+      out of its batch
+
+    `mode` defaults to BRONZE_LOAD_MODE. Returns (data_files_loaded, manifests_loaded, failed_keys).
+    Failed keys are never marked in LOAD_STATE, so the next run retries them.
+    """
+    loaded_data = 0
+    loaded_manifests = 0
+    failed_keys: list[str] = []
+    batch: list[MatchFile] = []
+
+    with pool.connection() as conn:
+        if mode == "copy":
+            # Bulk path: stream raw bytes into staged NDJSON and COPY INTO, one transaction per batch
+            for start in range(0, len(data_keys), BRONZE_LOAD_BATCH_SIZE):
+                chunk = data_keys[start:start + BRONZE_LOAD_BATCH_SIZE]
+                logger.info(f"[{start + len(chunk)}/{len(data_keys)}] Copying {len(chunk)} data files")
+                data_n, manifest_n = copy_match_files(
+                    chunk,
+                    manifest_keys,
+                    manifest_endpoint=manifest_endpoint,
+                    load_state_endpoint=load_state_endpoint,
+                    conn=conn,
+                    stage=stage,
+                )
+                loaded_data += data_n
+                loaded_manifests += manifest_n
+            return loaded_data, loaded_manifests, failed_keys
+
+        def _fetch_pair(data_key: str):
+            # Runs on a prefetch thread: download + decode the data file and its manifest
+            # Passthrough skips the json.loads / json.dumps round trip: the text goes straight to PARSE_JSON
+            if LOADER_PAYLOAD_MODE == "passthrough":
+                payload = get_object_text(data_key)
+            else:
+                payload = get_json_object(data_key)
+            manifest_key = manifest_key_for(data_key)
+            manifest = get_json_object(manifest_key) if manifest_key in manifest_keys else None
+            return payload, manifest
+
+        fetched_files = prefetch_ordered(
+            data_keys,
+            _fetch_pair,
+            workers=LOADER_FETCH_WORKERS,
+            max_inflight=LOADER_MAX_INFLIGHT,
+        )
+        for i, (data_key, fetched, error) in enumerate(fetched_files, start=1):
+            if error is not None:
+                # Not added to the batch, so it is never marked in LOAD_STATE and is retried next run
+                logger.error(f"[{i}/{len(data_keys)}] Failed to fetch data_key={data_key}: {error}")
+                failed_keys.append(data_key)
+            else:
+                payload, manifest = fetched
+                run_id, dt, comp, date_from, date_to = parse_key(data_key)
+                logger.info(f"[{i}/{len(data_keys)}] Fetched data_key={data_key}")
+                if manifest is None:
+                    logger.warning(f"Manifest missing for {data_key} (expected {manifest_key_for(data_key)})")
+
+                batch.append(MatchFile(
+                    file_key=data_key,
+                    competition_code=comp,
+                    date_from=date_from,
+                    date_to=date_to,
+                    run_id=run_id,
+                    dt=dt,
+                    payload=payload,
+                    manifest_key=manifest_key_for(data_key) if manifest is not None else None,
+                    manifest=manifest,
+                ))
+
+            # Upsert RAW_MATCHES + RAW_MANIFESTS and mark LOAD_STATE for the whole batch at once.
+            # A failed batch rolls back, so LOAD_STATE never runs ahead of the data.
+            if batch and (len(batch) >= BRONZE_LOAD_BATCH_SIZE or i == len(data_keys)):
+                upsert_match_files_batch(
+                    batch,
+                    manifest_endpoint=manifest_endpoint,
+                    load_state_endpoint=load_state_endpoint,
+                    conn=conn,
+                )
+                loaded_data += len(batch)
+                loaded_manifests += sum(1 for f in batch if f.manifest is not None)
+                batch = []
+
+    return loaded_data, loaded_manifests, failed_keys
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from .bronze_writer import put_bronze_json
+from .logger import get_logger
+from .minio_reader import get_json_object_if_exists
+
+logger = get_logger("match_index")
+
+# Compact {match_id: lastUpdated} index per competition, kept beside the bronze data
+INDEX_PREFIX = "_state/match_index"
+SILVER_MATCHES_LATEST_FQN = "FOOTBALL_DB.SILVER.MATCHES_LATEST"
+
+
+def _index_key(competition: str) -> str:
+    return f"{INDEX_PREFIX}/competition={competition}.json"
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _seed_from_silver(competition: str) -> dict[str, str]:
+    """
+    Build the index from SILVER.matches_latest (used once, when no index exists yet).
+    """
+    from .snowflake_pool import borrow_connection
+
+    with borrow_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT MATCH_ID, LAST_UPDATED
+            FROM {SILVER_MATCHES_LATEST_FQN}
+            WHERE COMPETITION_CODE = %s AND LAST_UPDATED IS NOT NULL
+            """,
+            (competition,),
+        )
+        rows = cur.fetchall()
+
+    index = {
+        str(match_id): last_updated.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for match_id, last_updated in rows
+    }
+    logger.info(f"Seeded match index for competition={competition} from silver: {len(index)} matches")
+    return index
+
+
+def load_match_index(competition: str, seed: str = "none") -> dict[str, str]:
+    """
+    Returns the stored index, or a seeded one on first use.
+    seed="silver" seeds from SILVER.matches_latest; seed="none" starts empty, so the first
+    delta contains every match in the window and seeds the index from bronze.
+    """
+    index = get_json_object_if_exists(_index_key(competition))
+    if index is not None:
+        return index
+    if seed == "silver":
+        return _seed_from_silver(competition)
+    return {}
+
+
+def save_match_index(competition: str, index: dict[str, str]) -> None:
+    put_bronze_json(_index_key(competition), index)
+
+
+def extract_changed_matches(payload: Any, index: dict[str, str]) -> list[dict]:
+    """
+    Matches that are new or whose lastUpdated advanced past the index. Updates `index` in place.
+    Matches without lastUpdated are always treated as changed.
+    """
+    changed = []
+    for match in payload.get("matches", []):
+        match_id = str(match.get("id"))
+        last_updated = match.get("lastUpdated")
+        seen = _parse_ts(index.get(match_id))
+        current = _parse_ts(last_updated)
+
+        if seen is None or current is None or current > seen:
+            changed.append(match)
+            if last_updated:
+                index[match_id] = last_updated
+    return changed
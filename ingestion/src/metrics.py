@@ -0,0 +1,251 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+
+from .config import METRICS_HTTP_HOST, METRICS_HTTP_PORT, METRICS_TEXTFILE
+from .logger import get_logger
+
+logger = get_logger("metrics")
+
+PREFIX = "football_pipeline"
+
+# Latency buckets (seconds): from a local MinIO GET up to a rate-limited API call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_HELP = {
+    "stage_seconds": "Wall time of one instrumented call, by pipeline stage",
+    "stage_bytes": "Bytes moved by a pipeline stage",
+    "api_requests": "HTTP responses from football-data.org, by status code",
+    "api_retries": "Retried API attempts, by reason (429, 5xx, error)",
+    "api_rate_limit_sleep_seconds": "Seconds paused after 429 responses (Retry-After / backoff)",
+    "api_limiter_wait_seconds": "Seconds spent waiting on the client-side token bucket",
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self, n_buckets: int):
+        self.counts = [0] * n_buckets
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+
+class Metrics:
+    """
+    Process-wide counters and latency histograms for the ingestion and loader stages.
+
+    - inc(name, value, **labels): monotonically increasing counter
+    - observe(name, seconds, **labels) / timer(stage): histogram
+    - render(): OpenMetrics text (Prometheus can scrape it, or read the textfile)
+    - summary(): compact per-stage dict for the entrypoints' final JSON line
+
+    Thread-safe; asyncio callers use it from the event loop thread like any other caller.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram(len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist.counts[i] += 1
+            hist.count += 1
+            hist.sum += value
+            hist.max = max(hist.max, value)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        Time a block into stage_seconds{stage=...}; failed calls are recorded too.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - started, stage=stage)
+
+    def add_bytes(self, stage: str, n: int) -> None:
+        self.inc("stage_bytes", float(n), stage=stage)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """
+        OpenMetrics text exposition of everything recorded so far.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+
+        lines: list[str] = []
+        seen: set[str] = set()
+
+        for (name, labels), hist in histograms:
+            family = f"{PREFIX}_{name}"
+            if family not in seen:
+                seen.add(family)
+                lines.append(f"# TYPE {family} histogram")
+                lines.append(f"# HELP {family} {_HELP.get(name, name)}")
+                lines.append(f"# UNIT {family} seconds")
+            for bound, count in zip(self.buckets, hist.counts):
+                lines.append(f"{family}_bucket{_format_labels(labels, ('le', repr(bound)))} {count}")
+            lines.append(f"{family}_bucket{_format_labels(labels, ('le', '+Inf'))} {hist.count}")
+            lines.append(f"{family}_count{_format_labels(labels)} {hist.count}")
+            lines.append(f"{family}_sum{_format_labels(labels)} {hist.sum:.6f}")
+
+        for (name, labels), value in counters:
+            family = f"{PREFIX}_{name}"
+            if family not in seen:
+                seen.add(family)
+                lines.append(f"# TYPE {family} counter")
+                lines.append(f"# HELP {family} {_HELP.get(name, name)}")
+            lines.append(f"{family}_total{_format_labels(labels)} {value:g}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        """
+        {"stages": {stage: {calls, seconds, max_seconds, bytes}}, "api": {...}} for run metrics tables.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+
+        stages: dict[str, dict] = {}
+        for (name, labels), hist in histograms.items():
+            if name != "stage_seconds":
+                continue
+            stage = dict(labels)["stage"]
+            stages[stage] = {
+                "calls": hist.count,
+                "seconds": round(hist.sum, 3),
+                "max_seconds": round(hist.max, 3),
+                "bytes": 0,
+            }
+        for (name, labels), value in counters.items():
+            if name == "stage_bytes":
+                stage = dict(labels)["stage"]
+                stages.setdefault(stage, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0})
+                stages[stage]["bytes"] = int(value)
+
+        def _total(name: str) -> float:
+            return sum(v for (n, _), v in counters.items() if n == name)
+
+        return {
+            "stages": stages,
+            "api": {
+                "requests": int(_total("api_requests")),
+                "retries": int(_total("api_retries")),
+                "rate_limit_sleep_seconds": round(_total("api_rate_limit_sleep_seconds"), 3),
+                "limiter_wait_seconds": round(_total("api_limiter_wait_seconds"), 3),
+            },
+        }
+
+
+METRICS = Metrics()
+
+
+def write_textfile(path: str, registry: Metrics = METRICS) -> None:
+    """
+    Write the exposition atomically (node_exporter textfile-collector style).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        return
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port: int, host: str = METRICS_HTTP_HOST, registry: Metrics = METRICS) -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics on <host>:<port> from a daemon thread (port 0 = pick a free one).
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            server = ThreadingHTTPServer((host, port), _Handler)
+            server.daemon_threads = True
+            server.registry = registry
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+            _server = server
+        return _server
+
+
+def start_metrics() -> None:
+    """
+    Entry-point hook: start the /metrics endpoint when METRICS_HTTP_PORT is set.
+    """
+    if METRICS_HTTP_PORT:
+        serve_metrics(METRICS_HTTP_PORT)
+
+
+def export_metrics() -> dict:
+    """
+    Entry-point hook: write METRICS_TEXTFILE (if set) and return the summary for the final JSON line.
+    """
+    if METRICS_TEXTFILE:
+        write_textfile(METRICS_TEXTFILE)
+        logger.info(f"Wrote metrics to {METRICS_TEXTFILE}")
+    return METRICS.summary()
@@ -1,16 +1,27 @@
+import threading
+
 import boto3
 from botocore.client import Config
-from .config import MINIO_ENDPOINT, MINIO_ACCESS_KEY, MINIO_SECRET_KEY, MINIO_REGION
+from .config import MINIO_ENDPOINT, MINIO_ACCESS_KEY, MINIO_SECRET_KEY, MINIO_REGION, MINIO_MAX_POOL_CONNECTIONS
+
+_client = None
+_client_lock = threading.Lock()
 
 def get_s3_client():
     """
-    Create an S3-compatible client for MinIO.
+    Return a shared S3-compatible client for MinIO.
+    boto3 clients are thread-safe once created, so one client (and its HTTP connection pool)
+    is reused by every caller and prefetch thread instead of being rebuilt per request.
     """
-    return boto3.client(
-        "s3",
-        endpoint_url=MINIO_ENDPOINT,
-        aws_access_key_id=MINIO_ACCESS_KEY,
-        aws_secret_access_key=MINIO_SECRET_KEY,
-        region_name=MINIO_REGION,
-        config=Config(signature_version="s3v4"),
-    )
\ No newline at end of file
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = boto3.client(
+                "s3",
+                endpoint_url=MINIO_ENDPOINT,
+                aws_access_key_id=MINIO_ACCESS_KEY,
+                aws_secret_access_key=MINIO_SECRET_KEY,
+                region_name=MINIO_REGION,
+                config=Config(signature_version="s3v4", max_pool_connections=MINIO_MAX_POOL_CONNECTIONS),
+            )
+        return _client
@@ -1,38 +1,203 @@
 import json
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Iterable, Iterator, Optional
 
+from botocore.exceptions import ClientError
+
+from .bronze_formats import (
+    decode_bytes,
+    decode_parquet,
+    flatten_match,
+    iter_decoded_chunks,
+    open_decoded,
+    typed_match_row,
+)
+from .bronze_keys import file_meta, parse_key
 from .config import MINIO_BRONZE_BUCKET
+from .json_stream import iter_array_items
+from .metrics import METRICS
 from .minio_client import get_s3_client
 
-def list_objects(prefix: str) -> list[str]:
+def iter_objects(prefix: str, start_after: Optional[str] = None) -> Iterator[str]:
     """
-    List object keys under a prefix in the bronze bucket.
+    Lazily yield object keys under a prefix in the bronze bucket, in key order.
+    `start_after` skips every key <= it on the server side (S3 StartAfter).
     """
     s3 = get_s3_client()
-    keys: list[str] = []
     token: Optional[str] = None
 
     while True:
         kwargs = {"Bucket": MINIO_BRONZE_BUCKET, "Prefix": prefix}
         if token:
             kwargs["ContinuationToken"] = token
+        elif start_after:
+            kwargs["StartAfter"] = start_after
 
         resp = s3.list_objects_v2(**kwargs)
         for item in resp.get("Contents", []):
-            keys.append(item["Key"])
+            yield item["Key"]
+
+        if resp.get("IsTruncated"):
+            token = resp.get("NextContinuationToken")
+        else:
+            break
+
+def list_objects(prefix: str) -> list[str]:
+    """
+    List object keys under a prefix in the bronze bucket.
+    """
+    return list(iter_objects(prefix))
+
+def list_partition_values(prefix: str, name: str) -> list[str]:
+    """
+    Values of the next Hive-style partition level under a prefix, using one delimiter listing.
+    Example: list_partition_values("endpoint=matches/", "competition") -> ["BL1", "PL", ...]
+    """
+    s3 = get_s3_client()
+    values: list[str] = []
+    token: Optional[str] = None
+
+    while True:
+        kwargs = {"Bucket": MINIO_BRONZE_BUCKET, "Prefix": prefix, "Delimiter": "/"}
+        if token:
+            kwargs["ContinuationToken"] = token
+
+        resp = s3.list_objects_v2(**kwargs)
+        for item in resp.get("CommonPrefixes", []):
+            part = item["Prefix"][len(prefix):].rstrip("/")
+            if part.startswith(f"{name}="):
+                values.append(part[len(name) + 1:])
 
         if resp.get("IsTruncated"):
             token = resp.get("NextContinuationToken")
         else:
             break
 
-    return keys
+    return values
+
+def _iter_competition(
+    prefix: str,
+    date_from_min: Optional[str],
+    date_from_max: Optional[str],
+    dt_from: Optional[str],
+    dt_to: Optional[str],
+) -> Iterator[str]:
+    # Keys sort by dateFrom inside a competition, so the dateFrom bounds become StartAfter + an early stop
+    start_after = f"{prefix}dateFrom={date_from_min}" if date_from_min else None
+    for key in iter_objects(prefix, start_after=start_after):
+        _, dt, _, date_from, _ = parse_key(key)
+        if date_from_max and date_from and date_from > date_from_max:
+            break
+        if dt_from and (dt or "") < dt_from:
+            continue
+        if dt_to and (dt or "") > dt_to:
+            continue
+        yield key
+
+def iter_partitioned_keys(
+    prefix: str,
+    competitions: Optional[Iterable[str]] = None,
+    date_from_min: Optional[str] = None,
+    date_from_max: Optional[str] = None,
+    dt_from: Optional[str] = None,
+    dt_to: Optional[str] = None,
+    workers: int = 4,
+) -> Iterator[str]:
+    """
+    Yield keys under an endpoint prefix laid out as competition=/dateFrom=/dateTo=/dt=/run_id=.
+
+    - competitions: list only these competition= partitions (default: every one, found with a delimiter listing)
+    - date_from_min / date_from_max: pushed down as StartAfter and an early stop per competition
+    - dt_from / dt_to: dt= sits below dateFrom, so it is filtered while the keys stream
+    - competitions are listed in parallel on `workers` threads; keys are yielded per competition
+      as each listing finishes (sorted within a competition)
+    """
+    codes = list(competitions) if competitions is not None else list_partition_values(prefix, "competition")
+    if not codes:
+        return
+
+    def _list(code: str) -> list[str]:
+        return list(_iter_competition(f"{prefix}competition={code}/", date_from_min, date_from_max, dt_from, dt_to))
+
+    if workers <= 1 or len(codes) == 1:
+        for code in codes:
+            yield from _list(code)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(codes))) as pool:
+        for future in as_completed([pool.submit(_list, code) for code in codes]):
+            yield from future.result()
+
+def _get_bytes(key: str) -> bytes:
+    """
+    Whole stored object (still compressed, if it is), timed and counted as minio_get.
+    """
+    s3 = get_s3_client()
+    with METRICS.timer("minio_get"):
+        data = s3.get_object(Bucket=MINIO_BRONZE_BUCKET, Key=key)["Body"].read()
+    METRICS.add_bytes("minio_get", len(data))
+    return data
 
 def get_json_object(key: str) -> Any:
     """
-    Download an object from MinIO and parse JSON.
+    Download an object from MinIO and parse JSON (plain, gzip or zstd; detected from the bytes).
+    """
+    return json.loads(decode_bytes(_get_bytes(key)))
+
+def get_object_text(key: str) -> str:
+    """
+    Download an object as raw JSON text without parsing it (passthrough for loaders that only
+    forward the document to the warehouse).
+    """
+    return decode_bytes(_get_bytes(key)).decode("utf-8")
+
+def iter_json_array(key: str, array_key: str = "matches") -> Iterator[Any]:
+    """
+    Stream the elements of a top-level array (payload["matches"] by default) straight from the
+    S3 body, one element at a time, instead of loading the whole document.
+    """
+    s3 = get_s3_client()
+    resp = s3.get_object(Bucket=MINIO_BRONZE_BUCKET, Key=key)
+    yield from iter_array_items(open_decoded(resp["Body"]), array_key)
+
+def read_match_rows(key: str) -> list[dict]:
+    """
+    v_matches-shaped rows for one bronze matches object in any format: a .parquet rendition
+    is read as-is, a JSON payload (plain / gzip / zstd) is streamed and flattened.
+    """
+    if key.endswith(".parquet"):
+        return decode_parquet(_get_bytes(key))
+
+    meta = file_meta(key)
+    return [typed_match_row(flatten_match(m, meta)) for m in iter_json_array(key)]
+
+def get_json_object_if_exists(key: str) -> Optional[Any]:
+    """
+    Like get_json_object, but returns None when the key does not exist.
+    """
+    try:
+        return get_json_object(key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return None
+        raise
+
+def stream_object_to(key: str, out, chunk_size: int = 1024 * 1024, single_line: bool = False) -> int:
+    """
+    Copy an object's JSON bytes into a writable binary file object without parsing it
+    (gzip / zstd objects are decompressed on the fly).
+    With single_line=True, CR/LF bytes are turned into spaces so a JSON document fits on one
+    NDJSON line (valid JSON never has raw newlines inside strings, so the value is unchanged).
+    Returns the number of bytes written.
     """
     s3 = get_s3_client()
     resp = s3.get_object(Bucket=MINIO_BRONZE_BUCKET, Key=key)
-    raw = resp["Body"].read().decode("utf-8")
-    return json.loads(raw)
\ No newline at end of file
+    written = 0
+    with METRICS.timer("minio_stream"):
+        for chunk in iter_decoded_chunks(resp["Body"].iter_chunks(chunk_size)):
+            if single_line:
+                chunk = chunk.replace(b"\r", b" ").replace(b"\n", b" ")
+            out.write(chunk)
+            written += len(chunk)
+    METRICS.add_bytes("minio_stream", written)
+    return written
@@ -0,0 +1,181 @@
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .logger import get_logger
+
+logger = get_logger("mock_football_api")
+
+
+def _synthetic_matches(code: str, date_from: str, date_to: str, matches_per_day: int = 2) -> dict:
+    """
+    Deterministic football-data.org-shaped /competitions/{code}/matches payload for a date window.
+    """
+    start, end = date.fromisoformat(date_from), date.fromisoformat(date_to)
+    matches = []
+    day = start
+    while day <= end:
+        for n in range(matches_per_day):
+            match_id = zlib.crc32(f"{code}|{day.isoformat()}|{n}".encode("utf-8")) % 10_000_000
+            home_id, away_id = 100 + (2 * n) % 20, 101 + (2 * n) % 20
+            finished = day < datetime.now(timezone.utc).date()
+            home_goals, away_goals = (match_id % 4, match_id % 3) if finished else (None, None)
+            winner = None
+            if finished:
+                winner = "HOME_TEAM" if home_goals > away_goals else "AWAY_TEAM" if away_goals > home_goals else "DRAW"
+            matches.append({
+                "id": match_id,
+                "utcDate": f"{day.isoformat()}T15:00:00Z",
+                "status": "FINISHED" if finished else "TIMED",
+                "matchday": (day - date(day.year, 1, 1)).days // 7 + 1,
+                "stage": "REGULAR_SEASON",
+                "group": None,
+                "lastUpdated": f"{day.isoformat()}T18:00:00Z",
+                "competition": {"id": 2021, "code": code, "name": f"Competition {code}", "type": "LEAGUE"},
+                "season": {"id": 1000 + day.year, "startDate": f"{day.year}-01-01", "endDate": f"{day.year}-12-31", "currentMatchday": 1},
+                "homeTeam": {"id": home_id, "name": f"Team {home_id}", "shortName": f"T{home_id}", "tla": f"T{home_id % 100:02d}", "crest": ""},
+                "awayTeam": {"id": away_id, "name": f"Team {away_id}", "shortName": f"T{away_id}", "tla": f"T{away_id % 100:02d}", "crest": ""},
+                "score": {
+                    "winner": winner,
+                    "duration": "REGULAR",
+                    "fullTime": {"home": home_goals, "away": away_goals},
+                    "halfTime": {"home": None if home_goals is None else home_goals // 2, "away": None if away_goals is None else away_goals // 2},
+                },
+            })
+        day += timedelta(days=1)
+
+    return {
+        "filters": {"dateFrom": date_from, "dateTo": date_to},
+        "resultSet": {"count": len(matches)},
+        "competition": {"code": code},
+        "matches": matches,
+    }
+
+
+class MockFootballAPI(ThreadingHTTPServer):
+    """
+    Local stand-in for api.football-data.org with configurable latency, quota, 5xx rate and payload density.
+    Sends the same quota headers as the real API (X-Requests-Available-Minute / X-RequestCounter-Reset).
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency_ms: int = 0,
+        requests_per_minute: int = 10,
+        error_rate: float = 0.0,
+        matches_per_day: int = 2,
+    ):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency_ms = latency_ms
+        self.requests_per_minute = requests_per_minute
+        self.error_rate = error_rate
+        self.matches_per_day = matches_per_day
+        self.request_log: deque = deque()
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.rate_limited = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def take_quota(self) -> tuple[bool, int, int]:
+        """
+        Sliding one-minute window. Returns (allowed, available_after, seconds_until_reset).
+        """
+        with self.lock:
+            now = time.monotonic()
+            while self.request_log and now - self.request_log[0] >= 60:
+                self.request_log.popleft()
+            reset = int(60 - (now - self.request_log[0])) + 1 if self.request_log else 60
+            if len(self.request_log) >= self.requests_per_minute:
+                self.rate_limited += 1
+                return False, 0, reset
+            self.request_log.append(now)
+            self.calls += 1
+            return True, self.requests_per_minute - len(self.request_log), reset
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockFootballAPI
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status: int, body: dict, headers: dict) -> None:
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for k, v in headers.items():
+            self.send_header(k, str(v))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000.0)
+
+        allowed, available, reset = self.server.take_quota()
+        quota_headers = {"X-Requests-Available-Minute": available, "X-RequestCounter-Reset": reset}
+        if not allowed:
+            self._send(429, {"message": "You reached your request limit."}, {**quota_headers, "Retry-After": reset})
+            return
+
+        if self.server.error_rate and random.random() < self.server.error_rate:
+            self._send(503, {"message": "Service unavailable"}, quota_headers)
+            return
+
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        # /v4/competitions/{code}/matches or /competitions/{code}/matches
+        if len(parts) >= 3 and parts[-3] == "competitions" and parts[-1] == "matches":
+            today = datetime.now(timezone.utc).date().isoformat()
+            body = _synthetic_matches(
+                parts[-2], query.get("dateFrom", today), query.get("dateTo", today), self.server.matches_per_day
+            )
+            self._send(200, body, quota_headers)
+        elif parts and parts[-1] == "competitions":
+            self._send(200, {"count": 1, "competitions": [{"id": 2021, "code": "PL", "name": "Premier League"}]}, quota_headers)
+        else:
+            self._send(404, {"message": "Not found"}, quota_headers)
+
+
+def start_mock_server(**kwargs) -> MockFootballAPI:
+    """
+    Start a MockFootballAPI on a background thread; call .shutdown() when done.
+    """
+    server = MockFootballAPI(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the football-data.org API")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--requests-per-minute", type=int, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--matches-per-day", type=int, default=2)
+    args = parser.parse_args()
+
+    server = MockFootballAPI(args.port, args.latency_ms, args.requests_per_minute, args.error_rate, args.matches_per_day)
+    logger.info(f"Mock football-data API on {server.base_url} (set FOOTBALL_DATA_BASE_URL to use it)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+
+def prefetch_ordered(
+    keys: Iterable[str],
+    fetch: Callable[[str], Any],
+    workers: int,
+    max_inflight: int,
+) -> Iterator[tuple[str, Any, Optional[BaseException]]]:
+    """
+    Bounded producer/consumer: run fetch(key) on a thread pool and yield (key, result, error) in input order.
+
+    - at most `max_inflight` results are fetched ahead of the consumer (memory backpressure)
+    - a failing fetch is yielded with its exception instead of stopping the pipeline,
+      so the consumer decides what to skip (and never marks it as loaded)
+    """
+    if workers < 1 or max_inflight < 1:
+        raise RuntimeError("prefetch workers and max_inflight must be >= 1")
+
+    keys_iter = iter(keys)
+    pending: deque = deque()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+
+    def _submit_next() -> None:
+        key = next(keys_iter, None)
+        if key is not None:
+            pending.append((key, executor.submit(fetch, key)))
+
+    try:
+        for _ in range(max_inflight):
+            _submit_next()
+
+        while pending:
+            key, future = pending.popleft()
+            try:
+                result, error = future.result(), None
+            except Exception as e:
+                result, error = None, e
+
+            # Refill before handing the result over so fetches overlap with the consumer's writes
+            _submit_next()
+            yield key, result, error
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from typing import Any, Optional
+
+from .config import FOOTBALL_DATA_REQUESTS_PER_MINUTE
+from .logger import get_logger
+
+logger = get_logger("rate_limiter")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every API caller in the process.
+
+    - refills at `rate_per_minute` tokens per minute, holding at most `burst` tokens
+    - acquire() blocks until a token is available, so calls are spaced *before* a 429
+    - update_from_headers() syncs with football-data.org's quota headers
+      (X-Requests-Available-Minute / X-RequestCounter-Reset)
+    - pause() stops every caller, e.g. after a 429 with Retry-After
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        if rate_per_minute <= 0:
+            raise RuntimeError("FOOTBALL_DATA_REQUESTS_PER_MINUTE must be > 0")
+
+        self.rate_per_sec = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(rate_per_minute)))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_sec)
+        self._updated_at = now
+
+    def _try_take(self) -> float:
+        """
+        Take a token if one is free and return 0.0, otherwise return how long to wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._paused_until and self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return max(self._paused_until - now, (1 - self._tokens) / self.rate_per_sec, 0.001)
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping as needed. Returns the seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            wait_s = self._try_take()
+            if not wait_s:
+                return waited
+            time.sleep(wait_s)
+            waited += wait_s
+
+    async def acquire_async(self) -> float:
+        """
+        asyncio flavour of acquire(); shares the same bucket with threaded callers.
+        """
+        waited = 0.0
+        while True:
+            wait_s = self._try_take()
+            if not wait_s:
+                return waited
+            await asyncio.sleep(wait_s)
+            waited += wait_s
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def update_from_headers(self, headers: Any) -> None:
+        available = headers.get("X-Requests-Available-Minute")
+        reset = headers.get("X-RequestCounter-Reset")
+        if available is None or not str(available).isdigit():
+            return
+
+        available = int(available)
+        with self._lock:
+            self._refill(time.monotonic())
+            # Trust the server if it has seen fewer requests left than we think
+            self._tokens = min(self._tokens, float(available))
+
+        if available == 0 and reset is not None and str(reset).isdigit():
+            logger.info(f"API quota exhausted; pausing requests for {reset}s")
+            self.pause(int(reset))
+
+
+_limiter: Optional[TokenBucket] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """
+    Process-wide limiter tuned to the football-data.org plan (FOOTBALL_DATA_REQUESTS_PER_MINUTE).
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = TokenBucket(FOOTBALL_DATA_REQUESTS_PER_MINUTE)
+        return _limiter
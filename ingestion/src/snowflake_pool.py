@@ -0,0 +1,194 @@
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from queue import Empty, LifoQueue
+from typing import Any, Callable, Iterator, Optional
+
+from dotenv import load_dotenv
+
+from .logger import get_logger
+
+# Load repo-root .env from inside ingestion/src/
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
+
+logger = get_logger("snowflake_pool")
+
+SNOWFLAKE_POOL_SIZE = int(os.getenv("SNOWFLAKE_POOL_SIZE", "2"))
+# Recycle sessions well before Snowflake's session/token expiry (4h by default)
+SNOWFLAKE_POOL_MAX_AGE_SEC = int(os.getenv("SNOWFLAKE_POOL_MAX_AGE_SEC", "3600"))
+# Only ping a connection that has sat idle for longer than this
+SNOWFLAKE_POOL_PING_AFTER_SEC = int(os.getenv("SNOWFLAKE_POOL_PING_AFTER_SEC", "60"))
+SNOWFLAKE_POOL_ACQUIRE_TIMEOUT_SEC = int(os.getenv("SNOWFLAKE_POOL_ACQUIRE_TIMEOUT_SEC", "300"))
+
+
+class SnowflakeSessionPool:
+    """
+    Thread-safe pool of long-lived Snowflake connections.
+
+    - connections are opened lazily, up to `size`
+    - idle connections are health-checked (SELECT 1) before reuse
+    - connections older than `max_age_sec` are closed and reopened
+    - `connect` can be any DB-API 2.0 factory (e.g. sqlite3) for local testing
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        size: int = SNOWFLAKE_POOL_SIZE,
+        max_age_sec: int = SNOWFLAKE_POOL_MAX_AGE_SEC,
+        ping_after_sec: int = SNOWFLAKE_POOL_PING_AFTER_SEC,
+        acquire_timeout_sec: int = SNOWFLAKE_POOL_ACQUIRE_TIMEOUT_SEC,
+        health_check_sql: str = "SELECT 1",
+    ):
+        if size < 1:
+            raise RuntimeError("SNOWFLAKE_POOL_SIZE must be >= 1")
+
+        self._connect = connect
+        self.size = size
+        self.max_age_sec = max_age_sec
+        self.ping_after_sec = ping_after_sec
+        self.acquire_timeout_sec = acquire_timeout_sec
+        self.health_check_sql = health_check_sql
+
+        # Items are (conn, created_at, released_at); LIFO keeps hot sessions in use
+        self._idle: LifoQueue = LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _is_healthy(self, conn: Any, created_at: float, released_at: float) -> bool:
+        now = time.monotonic()
+        if self.max_age_sec and now - created_at > self.max_age_sec:
+            logger.info("Recycling Snowflake connection past max age")
+            return False
+
+        if now - released_at < self.ping_after_sec:
+            return True
+
+        try:
+            cur = conn.cursor()
+            cur.execute(self.health_check_sql)
+            cur.fetchone()
+            return True
+        except Exception as e:
+            logger.warning(f"Snowflake connection failed health check: {e}")
+            return False
+
+    def _discard(self, conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._opened -= 1
+
+    def _open(self) -> tuple[Any, float]:
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+        logger.info(f"Opened Snowflake connection ({self._opened}/{self.size})")
+        return conn, time.monotonic()
+
+    def acquire(self) -> tuple[Any, float]:
+        """
+        Borrow a connection. Returns (conn, created_at); hand both back to release().
+        """
+        if self._closed:
+            raise RuntimeError("Snowflake pool is closed")
+
+        deadline = time.monotonic() + self.acquire_timeout_sec
+
+        while True:
+            try:
+                conn, created_at, released_at = self._idle.get_nowait()
+            except Empty:
+                with self._lock:
+                    can_open = self._opened < self.size
+                    if can_open:
+                        self._opened += 1
+                if can_open:
+                    return self._open()
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(
+                        f"Timed out after {self.acquire_timeout_sec}s waiting for a Snowflake connection"
+                    )
+                try:
+                    conn, created_at, released_at = self._idle.get(timeout=remaining)
+                except Empty:
+                    continue
+
+            if self._is_healthy(conn, created_at, released_at):
+                return conn, created_at
+            self._discard(conn)
+
+    def release(self, conn: Any, created_at: float) -> None:
+        if self._closed:
+            self._discard(conn)
+            return
+        self._idle.put((conn, created_at, time.monotonic()))
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Context manager that borrows a connection and always returns it to the pool.
+        Uncommitted work is rolled back if the block raises.
+        """
+        conn, created_at = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                # A connection that cannot roll back is not safe to reuse
+                self._discard(conn)
+            else:
+                self.release(conn, created_at)
+            raise
+        self.release(conn, created_at)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn, _, _ = self._idle.get_nowait()
+            except Empty:
+                break
+            self._discard(conn)
+
+
+_pool: Optional[SnowflakeSessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> SnowflakeSessionPool:
+    """
+    Process-wide pool backed by get_snowflake_conn(), closed at interpreter exit.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from .snowflake_client import get_snowflake_conn
+
+            _pool = SnowflakeSessionPool(connect=get_snowflake_conn)
+            atexit.register(_pool.close)
+        return _pool
+
+
+@contextmanager
+def borrow_connection(conn: Optional[Any] = None) -> Iterator[Any]:
+    """
+    Yield `conn` unchanged if the caller already holds one, otherwise borrow from the pool.
+    """
+    if conn is not None:
+        yield conn
+        return
+    with get_pool().connection() as pooled:
+        yield pooled